@@ -0,0 +1,411 @@
+import json
+import os
+import warnings
+
+import pytest
+from selenium import webdriver
+from selenium.webdriver.support.events import EventFiringWebDriver
+
+from support.accounts import AccountAllocator, current_worker_id
+from support.browser_pool import BrowserPool
+from support.chrome_profiles import PROFILES, chrome_options
+from support.environment import load_environment
+from support.events import ListenerChain
+from support.fake_shop import FakeShop
+from support.impact import ImpactIndex, ImpactListener, ImpactRecorder, changed_route_patterns
+from support.nav_timing import NavigationTimingListener, NavigationTimings
+from support.pages import Pages
+from support.responsive import DEVICES_FILE
+from support.seeding import SeedCleanupWarning, Seeder
+from support.sessions import SessionCache
+from support.visual import VisualListener, VisualRegression
+from support.waits import WaitRecorder, Waiter
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--env",
+        default=None,
+        help="Environment profile from environments.json, e.g. production or local (env: LAZYLIZARD_ENV)",
+    )
+    parser.addoption(
+        "--base-url",
+        default=None,
+        help="Override the profile's base URL (env: LAZYLIZARD_BASE_URL)",
+    )
+    parser.addoption(
+        "--browser-pool-size",
+        type=int,
+        default=int(os.environ.get("BROWSER_POOL_SIZE", "1")),
+        help="Number of warm Chrome instances shared by the Selenium tests (env: BROWSER_POOL_SIZE)",
+    )
+    parser.addoption(
+        "--chrome-profile",
+        choices=PROFILES,
+        default=os.environ.get("CHROME_PROFILE", "default"),
+        help="Chrome launch profile: default, or fast (headless, no images/extensions, eager loads) "
+        "(env: CHROME_PROFILE)",
+    )
+    parser.addoption(
+        "--wait-poll",
+        type=float,
+        default=0.25,
+        help="Seconds between polls in the shared wait helpers",
+    )
+    parser.addoption(
+        "--wait-report",
+        default=None,
+        help="Write every recorded wait and per-selector timing stats to this JSON file",
+    )
+    parser.addoption(
+        "--nav-timings",
+        default=os.environ.get("NAV_TIMINGS_DIR"),
+        help="Capture Navigation Timing / paint / LCP / CLS for every page the tests load "
+        "and write nav_timings.json and .csv to this directory (env: NAV_TIMINGS_DIR)",
+    )
+    parser.addoption(
+        "--accounts-file",
+        default=os.environ.get("LAZYLIZARD_ACCOUNTS"),
+        help="JSON file with one buyer/seller/admin account and product per parallel worker "
+        "(env: LAZYLIZARD_ACCOUNTS), see accounts.example.json",
+    )
+    parser.addoption(
+        "--devices",
+        default=os.environ.get("DEVICES"),
+        help="Comma-separated devices from devices.json for the responsiveness test, default all (env: DEVICES)",
+    )
+    parser.addoption("--devices-file", default=DEVICES_FILE, help="Device matrix and pages for the responsiveness test")
+    parser.addoption(
+        "--visual",
+        action="store_true",
+        help="Screenshot every page the tests load and compare it to the stored baseline (needs numpy and Pillow)",
+    )
+    parser.addoption(
+        "--update-baselines",
+        action="store_true",
+        help="Like --visual, but replace the stored baselines with this run's screenshots",
+    )
+    parser.addoption(
+        "--visual-baselines",
+        default=os.environ.get("VISUAL_BASELINES", os.path.join(ROOT, "visual_baselines")),
+        help="Directory of baseline screenshots and their hash index (env: VISUAL_BASELINES)",
+    )
+    parser.addoption(
+        "--visual-output",
+        default=os.path.join(ROOT, ".visual_output"),
+        help="Where screenshots and diff images of failed comparisons are written",
+    )
+    parser.addoption(
+        "--visual-threshold",
+        type=float,
+        default=0.1,
+        help="Per-pixel colour distance (0-1) below which a pixel counts as unchanged",
+    )
+    parser.addoption(
+        "--visual-max-diff",
+        type=float,
+        default=0.0,
+        help="Fraction of changed pixels a screenshot may have and still match its baseline, "
+        "e.g. 0.001 for pages with dynamic content",
+    )
+    parser.addoption(
+        "--record-impact",
+        action="store_true",
+        help="Record the routes and selectors every test touches into the impact index",
+    )
+    parser.addoption(
+        "--impact-index",
+        default=os.environ.get("TEST_IMPACT_INDEX", os.path.join(ROOT, ".test_impact.json")),
+        help="Test impact index written by --record-impact (env: TEST_IMPACT_INDEX)",
+    )
+    parser.addoption(
+        "--changed-routes",
+        default=os.environ.get("CHANGED_ROUTES"),
+        help="Comma-separated changed routes or templates, e.g. checkout,/en/seller/*; only tests the "
+        "impact index links to them run, plus tests it has no record of (env: CHANGED_ROUTES)",
+    )
+    parser.addoption(
+        "--changed-selectors",
+        default=os.environ.get("CHANGED_SELECTORS"),
+        help="Comma-separated changed selectors or class names, e.g. cart-item; selects like --changed-routes",
+    )
+    parser.addoption(
+        "--impact-map",
+        default=None,
+        help="JSON file mapping template globs to the routes they render, for --changed-routes",
+    )
+    parser.addoption("--crawl-depth", type=int, default=2, help="Link levels the site crawler follows")
+    parser.addoption("--crawl-max-pages", type=int, default=50, help="Page budget for the site crawler")
+    parser.addoption(
+        "--link-cache",
+        default=os.environ.get("LINK_CACHE", ".link_cache.json"),
+        help="On-disk cache of checked URLs (env: LINK_CACHE)",
+    )
+    parser.addoption(
+        "--link-cache-ttl",
+        type=int,
+        default=24 * 3600,
+        help="Seconds a cached URL check is trusted before it is revalidated",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "chrome_profile(name): run the test in this Chrome launch profile regardless of --chrome-profile"
+    )
+    # Parallel runs: pip install pytest-xdist; pytest -n auto --accounts-file accounts.json
+    # Tests in one file share an account's cart, so whole files go to one worker.
+    if getattr(config.option, "numprocesses", None) and config.option.dist == "load":
+        config.option.dist = "loadfile"
+    config._wait_recorder = WaitRecorder()
+    config._nav_timings = NavigationTimings()
+    config._visual = None
+    config._impact_index = None
+    selecting = config.getoption("--changed-routes") or config.getoption("--changed-selectors")
+    if config.getoption("--record-impact") or selecting:
+        config._impact_index = ImpactIndex(config.getoption("--impact-index"))
+    if config.getoption("--visual") or config.getoption("--update-baselines"):
+        try:
+            config._visual = VisualRegression(
+                config.getoption("--visual-baselines"),
+                config.getoption("--visual-output"),
+                update=config.getoption("--update-baselines"),
+                threshold=config.getoption("--visual-threshold"),
+                max_diff=config.getoption("--visual-max-diff"),
+            )
+        except RuntimeError as e:
+            raise pytest.UsageError(str(e))
+
+
+# Changed routes/selectors given: keep only the tests the impact index links to them,
+# and every test it has no record of. A change the index can't place runs everything.
+def pytest_collection_modifyitems(config, items):
+    routes = config.getoption("--changed-routes")
+    selectors = config.getoption("--changed-selectors")
+    if not (routes or selectors):
+        return
+    template_map = None
+    if config.getoption("--impact-map"):
+        with open(config.getoption("--impact-map")) as f:
+            template_map = json.load(f)
+    env = load_environment(config.getoption("--env"), config.getoption("--base-url"))
+    index = config._impact_index
+    items_changed = [r.strip() for r in (routes or "").split(",") if r.strip()]
+    patterns, unmapped = changed_route_patterns(items_changed, env, template_map)
+    fragments = [s.strip() for s in (selectors or "").split(",") if s.strip()]
+
+    unplaced = unmapped + index.unknown(patterns, fragments)
+    if unplaced:
+        config._impact_selection = {"full_suite": unplaced}
+        return
+
+    selected, deselected, unknown = [], [], 0
+    for item in items:
+        affected = index.affected(item.nodeid, patterns, fragments)
+        if affected is False:
+            deselected.append(item)
+        else:
+            selected.append(item)
+            unknown += affected is None
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+    config._impact_selection = {"kept": len(selected), "unknown": unknown, "deselected": len(deselected)}
+
+
+# The target environment; stand-in profiles get their own in-process fake shop
+@pytest.fixture(scope="session")
+def env(request):
+    base_url = request.config.getoption("--base-url")
+    env = load_environment(request.config.getoption("--env"), base_url)
+    if env.stand_in and not (base_url or os.environ.get("LAZYLIZARD_BASE_URL")):
+        shop = FakeShop().start()
+        request.addfinalizer(shop.stop)
+        env.base_url = shop.base_url
+    return env
+
+
+# Warm browsers for the whole session, one pool per Chrome launch profile.
+# size only applies when the profile's pool is first created.
+@pytest.fixture(scope="session")
+def browser_pools(request, env):
+    pools = {}
+    request.config._browser_pools = pools
+
+    def get(profile, size=None):
+        if profile not in pools:
+            def launch():
+                driver = webdriver.Chrome(options=chrome_options(profile, env.base_url))
+                driver.set_page_load_timeout(env.timeouts["page_load"])
+                return driver
+
+            pools[profile] = BrowserPool(size=size or request.config.getoption("--browser-pool-size"), factory=launch)
+        return pools[profile]
+
+    yield get
+    for pool in pools.values():
+        pool.close()
+
+
+# Lease a browser for a single test; it is reset and returned to the pool afterwards
+@pytest.fixture
+def driver(request, browser_pools, impact):
+    marker = request.node.get_closest_marker("chrome_profile")
+    profile = marker.args[0] if marker else request.config.getoption("--chrome-profile")
+    pool = browser_pools(profile)
+    raw_driver = pool.acquire()
+    driver = raw_driver
+    listeners = []
+    if request.config.getoption("--nav-timings"):
+        listeners.append(NavigationTimingListener(request.config._nav_timings, test=request.node.nodeid))
+    visual = request.config._visual
+    if visual:
+        listeners.append(VisualListener(visual, profile, test=request.node.nodeid))
+    if impact is not None:
+        listeners.append(ImpactListener(impact))
+    if listeners:
+        driver = EventFiringWebDriver(raw_driver, listeners[0] if len(listeners) == 1 else ListenerChain(*listeners))
+    yield driver
+    pool.release(raw_driver)
+    failures = visual.failures(request.node.nodeid) if visual else []
+    if failures:
+        pytest.fail("Visual regression:\n" + "\n".join(r.describe() for r in failures), pytrace=False)
+
+
+# Routes and selectors the test touches, when recording the impact index; None otherwise
+@pytest.fixture
+def impact(request):
+    if not request.config.getoption("--record-impact"):
+        yield None
+        return
+    recorder = ImpactRecorder()
+    yield recorder
+    request.config._impact_index.record(request.node.nodeid, recorder)
+
+
+# Explicit waits against the environment's timeout budget, e.g. wait.visible((By.NAME, "password"))
+@pytest.fixture
+def wait(request, driver, env):
+    return Waiter(
+        driver,
+        env.timeouts,
+        poll_frequency=request.config.getoption("--wait-poll"),
+        recorder=request.config._wait_recorder,
+        test=request.node.nodeid,
+    )
+
+
+# This worker's own test accounts and product
+@pytest.fixture(scope="session")
+def accounts(request, env):
+    path = request.config.getoption("--accounts-file")
+    allocator = AccountAllocator.from_file(path) if path else AccountAllocator.from_credentials(env.credentials)
+    try:
+        return allocator.allocate(current_worker_id())
+    except ValueError as e:
+        pytest.fail(str(e), pytrace=False)
+
+
+# Role-keyed login cache: one UI login per role per session (per worker)
+@pytest.fixture(scope="session")
+def session_cache(request, env, accounts):
+    cache = SessionCache(env, credentials=accounts.credentials, recorder=request.config._wait_recorder)
+    request.config._session_cache = cache
+    return cache
+
+
+# Usage: login_as("buyer") leaves the leased driver logged in on the role's landing page
+@pytest.fixture
+def login_as(driver, session_cache, env, impact):
+    def login(role):
+        # Every authenticated test depends on the login page, even when a cached session skips it
+        if impact is not None:
+            impact.route(env.path("login"))
+        return session_cache.login(driver, role)
+    return login
+
+
+# Test data over HTTP, e.g. seed.cart("buyer", accounts.product_id); undone after the test
+@pytest.fixture
+def seed(env, session_cache, impact):
+    seeder = Seeder(env, session_cache, impact=impact)
+    yield seeder
+    # Leftover seed data skews later tests, so a failed undo must not go unnoticed
+    for error in seeder.cleanup():
+        warnings.warn(f"Seed cleanup failed: {error}", SeedCleanupWarning)
+
+
+# Page objects for the leased driver, e.g. pages.cart.open().item_count()
+@pytest.fixture
+def pages(driver, env, wait, impact):
+    return Pages(driver, env, wait, impact)
+
+
+def pytest_sessionfinish(session):
+    if session.config._visual:
+        session.config._visual.save()
+    if session.config.getoption("--record-impact"):
+        session.config._impact_index.save()
+    directory = session.config.getoption("--nav-timings")
+    timings = session.config._nav_timings
+    if directory and timings.records:
+        # Workers write their own files so parallel runs don't overwrite each other
+        worker = current_worker_id()
+        timings.write(directory, suffix="" if worker == "master" else f"_{worker}")
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    for profile, pool in getattr(config, "_browser_pools", {}).items():
+        if pool.leases:
+            terminalreporter.write_line(
+                f"Browser pool ({profile}): {pool.launches} Chrome launch(es) served {pool.leases} test(s), "
+                f"{pool.launch_seconds:.1f}s spent launching, ~{pool.saved_seconds():.1f}s saved by reuse"
+            )
+    cache = getattr(config, "_session_cache", None)
+    if cache is not None and cache.ui_logins:
+        terminalreporter.write_line(
+            f"Session cache: {cache.ui_logins} UI login(s) for "
+            f"{cache.ui_logins + cache.restores} authenticated test(s)"
+        )
+    selection = getattr(config, "_impact_selection", None)
+    if selection and "full_suite" in selection:
+        terminalreporter.write_line(
+            "Test impact: running the full suite, no recorded test is tied to "
+            f"{', '.join(selection['full_suite'])} (map templates with --impact-map, re-record with --record-impact)"
+        )
+    elif selection:
+        terminalreporter.write_line(
+            f"Test impact: {selection['kept']} test(s) affected by the change "
+            f"({selection['unknown']} not in the index), {selection['deselected']} deselected"
+        )
+    visual = config._visual
+    if visual and visual.results:
+        counts = visual.counts()
+        terminalreporter.write_line(
+            f"Visual regression: {len(visual.results)} screenshot(s): {counts['unchanged']} identical, "
+            f"{counts['passed']} within tolerance, "
+            f"{counts['changed'] + counts['size-changed']} changed, {counts['new'] + counts['updated']} baseline(s) written"
+        )
+        if counts["changed"] or counts["size-changed"]:
+            terminalreporter.write_line(f"Screenshots and diffs of changed pages are in {visual.output_dir}")
+    recorder = config._wait_recorder
+    if recorder.records:
+        terminalreporter.write_sep("-", "slowest waits")
+        for line in recorder.report_lines():
+            terminalreporter.write_line(line)
+        path = config.getoption("--wait-report")
+        if path:
+            recorder.write(path)
+            terminalreporter.write_line(f"Wait report written to {path}")
+    timings = config._nav_timings
+    if timings.records:
+        terminalreporter.write_sep("-", "page timings (median ms)")
+        terminalreporter.write_line(f"{'TTFB':>8} {'DCL':>8} {'FCP':>8} {'LCP':>8} {'CLS':>6} {'n':>4}  route")
+        for row in timings.by_route():
+            cells = [f"{row[m]:>8.0f}" if row[m] is not None else f"{'-':>8}"
+                     for m in ("ttfb", "dom_content_loaded", "first_contentful_paint", "largest_contentful_paint")]
+            terminalreporter.write_line(
+                f"{' '.join(cells)} {row['cumulative_layout_shift']:>6.3f} {row['samples']:>4}  {row['route']}"
+            )
@@ -1,107 +1,80 @@
 import pytest
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
-# Setup WebDriver for Chrome
-@pytest.fixture
-def driver():
-    driver = webdriver.Chrome()
-    yield driver
-    driver.quit()
-
 # Test Admin Login and Dashboard Access
-def test_admin_login(driver):
+def test_admin_login(pages):
     print("Starting test: Admin login and dashboard access")
-    driver.get("https://lazylizard.click/en/")
+    login_page = pages.login.open("")
 
     try:
-        # Wait for the password field
-        WebDriverWait(driver, 20).until(EC.visibility_of_element_located((By.NAME, "password")))
-
-        # Enter admin credentials
-        password_field = driver.find_element(By.NAME, "password")
-        password_field.send_keys("admin_password")
-
-        login_button = driver.find_element(By.NAME, "login")
-        login_button.click()
+        # Enter admin credentials once the password field is visible
+        login_page.login(password="admin_password", timeout="page_load")
 
         # Verify successful login by checking for "Admin Dashboard"
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, "//h1[contains(text(),'Admin Dashboard')]")))
+        pages.admin.wait_for("heading")
 
-        assert "Admin Dashboard" in driver.page_source
+        pages.admin.expect("Admin Dashboard")
         print("Admin login successful, dashboard accessible.")
 
     except TimeoutException:
         print("TimeoutException: Admin login failed.")
 
 # Test Product Moderation (Approve/Reject Products)
-def test_product_moderation(driver):
+def test_product_moderation(pages, login_as):
     print("Starting test: Product moderation")
 
-    # Log in as Admin
-    test_admin_login(driver)
+    # Log in as Admin (cached session)
+    login_as("admin")
+    admin = pages.admin
 
     try:
         # Navigate to Product Moderation Page
-        moderation_tab = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.LINK_TEXT, "Product Moderation"))
-        )
-        moderation_tab.click()
+        admin.click("product_moderation_link", until="clickable")
 
         # Wait for product list to load
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, "product-list")))
+        admin.wait_for("product_list")
 
         # Approve a product
-        approve_button = driver.find_element(By.NAME, "approve_product")
-        approve_button.click()
-        assert "Product approved" in driver.page_source
+        admin.click("approve_product")
+        admin.expect("Product approved")
         print("Product approved successfully.")
 
         # Reject a product
-        reject_button = driver.find_element(By.NAME, "reject_product")
-        reject_button.click()
-        assert "Product rejected" in driver.page_source
+        admin.click("reject_product")
+        admin.expect("Product rejected")
         print("Product rejected successfully.")
 
     except TimeoutException:
         print("TimeoutException: Product moderation test failed.")
 
 # Test Admin User Management (Ban/Unban, Role Change)
-def test_admin_user_management(driver):
+def test_admin_user_management(pages, login_as):
     print("Starting test: Admin user management")
 
-    # Log in as Admin
-    test_admin_login(driver)
+    # Log in as Admin (cached session)
+    login_as("admin")
+    admin = pages.admin
 
     try:
         # Navigate to User Management Page
-        user_management_tab = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.LINK_TEXT, "User Management"))
-        )
-        user_management_tab.click()
+        admin.click("user_management_link", until="clickable")
 
         # Wait for user list to load
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, "user-list")))
+        admin.wait_for("user_list")
 
         # Ban a user
-        ban_button = driver.find_element(By.NAME, "ban_user")
-        ban_button.click()
-        assert "User banned" in driver.page_source
+        admin.click("ban_user")
+        admin.expect("User banned")
         print("User banned successfully.")
 
         # Unban a user
-        unban_button = driver.find_element(By.NAME, "unban_user")
-        unban_button.click()
-        assert "User unbanned" in driver.page_source
+        admin.click("unban_user")
+        admin.expect("User unbanned")
         print("User unbanned successfully.")
 
         # Change user role
-        change_role_button = driver.find_element(By.NAME, "change_role")
-        change_role_button.click()
-        assert "User role updated" in driver.page_source
+        admin.click("change_role")
+        admin.expect("User role updated")
         print("User role changed successfully.")
 
     except TimeoutException:
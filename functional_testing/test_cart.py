@@ -1,112 +1,86 @@
-import pytest
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
-# Setup WebDriver and testing on Chrome
-@pytest.fixture
-def driver():
-    driver = webdriver.Chrome()
-    yield driver
-    driver.quit()
-
 # Test 1: Add items to the cart and verify they appear correctly
-def test_add_items_to_cart(driver):
+def test_add_items_to_cart(pages):
     print("Starting test: Add items to the cart and verify they appear correctly")
 
     # Open the product page
-    driver.get("http://lazylizard.click/en/")
+    product_page = pages.product.open("")
 
     try:
-        # Wait for products to be loaded and available for selection
-        WebDriverWait(driver, 20).until(EC.presence_of_all_elements_located((By.CLASS_NAME, "product-item")))
-
-        # Select the first product
-        first_product = driver.find_element(By.CLASS_NAME, "product-item")
-        first_product.click()
+        # Wait for products to be loaded and select the first one
+        product_page.open_first_product(timeout="page_load")
 
-        # Wait for product page to load
-        WebDriverWait(driver, 20).until(EC.visibility_of_element_located((By.NAME, "add-to-cart")))
-
-        # Click "Add to Cart"
-        add_to_cart_button = driver.find_element(By.NAME, "add-to-cart")
-        add_to_cart_button.click()
+        # Click "Add to Cart" once the product page has loaded
+        product_page.add_to_cart("add_to_cart_button", timeout="page_load")
 
         # Verify item is added to cart
-        cart_icon = driver.find_element(By.CLASS_NAME, "cart-icon")
-        cart_icon.click()
+        product_page.click("cart_icon")
 
         # Wait for cart to load
-        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.CLASS_NAME, "cart-items")))
+        cart_page = pages.cart
+        cart_page.wait_for("cart_items", timeout="page_load")
 
-        cart_items = driver.find_elements(By.CLASS_NAME, "cart-item")
-        assert len(cart_items) > 0, "Cart is empty, item was not added."
+        assert cart_page.item_count() > 0, "Cart is empty, item was not added."
 
         print("Item successfully added to the cart.")
-    
+
     except TimeoutException:
         print("TimeoutException: Element not found in time")
 
 # Test 2: Increase/Decrease item quantity and ensure price updates
-def test_update_item_quantity(driver):
+def test_update_item_quantity(pages):
     print("Starting test: Increase/Decrease item quantity and ensure price updates")
 
     # Open cart page
-    driver.get("http://lazylizard.click/en/cards/cart")
+    cart_page = pages.cart.open()
 
     try:
         # Wait for cart to load
-        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.CLASS_NAME, "cart-items")))
-
-        # Find quantity input for the first cart item
-        quantity_input = driver.find_element(By.NAME, "quantity")
-        
-        # Increase item quantity
-        quantity_input.clear()
-        quantity_input.send_keys("2")
-        
+        cart_page.wait_for("cart_items", timeout="page_load")
+
+        # Increase item quantity for the first cart item
+        cart_page.set_quantity(2)
+
         # Verify price updates (assuming the price is displayed in a class named 'item-price')
-        item_price = driver.find_element(By.CLASS_NAME, "item-price").text
-        total_price = driver.find_element(By.CLASS_NAME, "total-price").text
-        
+        prices = cart_page.read("item_price", "total_price")
+        item_price = prices["item_price"]["texts"][0]
+        total_price = prices["total_price"]["texts"][0]
+
         assert float(total_price) == float(item_price) * 2, "Price did not update correctly when quantity increased."
 
         print("Quantity updated and price is correct.")
 
         # Decrease item quantity back to 1
-        quantity_input.clear()
-        quantity_input.send_keys("1")
+        cart_page.set_quantity(1)
 
         # Verify price updates again
-        total_price = driver.find_element(By.CLASS_NAME, "total-price").text
+        total_price = cart_page.text("total_price")
         assert float(total_price) == float(item_price), "Price did not update correctly when quantity decreased."
-    
+
     except TimeoutException:
         print("TimeoutException: Element not found in time")
 
 # Test 3: Remove item from the cart and confirm it's deleted
-def test_remove_item_from_cart(driver):
+def test_remove_item_from_cart(pages, wait):
     print("Starting test: Remove item from the cart and confirm it's deleted")
 
     # Open cart page
-    driver.get("http://lazylizard.click/en/cards/cart")
+    cart_page = pages.cart.open()
 
     try:
         # Wait for cart to load
-        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.CLASS_NAME, "cart-items")))
+        cart_page.wait_for("cart_items", timeout="page_load")
 
         # Find and click the "Remove" button for the first cart item
-        remove_button = driver.find_element(By.CLASS_NAME, "remove-item")
-        remove_button.click()
+        remove_button = cart_page.find("remove_item")
+        cart_page.click("remove_item")
 
         # Wait for cart to update
-        WebDriverWait(driver, 20).until(EC.invisibility_of_element(remove_button))
+        wait.invisible(remove_button, "class name=remove-item", timeout="page_load")
 
         # Verify the cart is empty
-        cart_items = driver.find_elements(By.CLASS_NAME, "cart-item")
-        assert len(cart_items) == 0, "Item was not removed from the cart."
+        assert cart_page.item_count() == 0, "Item was not removed from the cart."
 
         print("Item successfully removed from the cart.")
 
@@ -114,28 +88,26 @@ def test_remove_item_from_cart(driver):
         print("TimeoutException: Element not found in time")
 
 # Test 4: Attempt checkout with an empty cart and check for errors
-def test_checkout_with_empty_cart(driver):
+def test_checkout_with_empty_cart(pages):
     print("Starting test: Attempt checkout with an empty cart and check for errors")
 
     # Open cart page
-    driver.get("http://lazylizard.click/en/cards/cart")
+    cart_page = pages.cart.open()
 
     try:
         # Wait for cart to load
-        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.CLASS_NAME, "cart-items")))
+        cart_page.wait_for("cart_items", timeout="page_load")
 
         # Ensure the cart is empty
-        cart_items = driver.find_elements(By.CLASS_NAME, "cart-item")
-        assert len(cart_items) == 0, "Cart is not empty."
+        assert cart_page.item_count() == 0, "Cart is not empty."
 
         # Try to checkout
-        checkout_button = driver.find_element(By.NAME, "checkout")
-        checkout_button.click()
+        cart_page.click("checkout")
 
         # Wait for error message (assuming error message is in a class named 'error-message')
-        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.CLASS_NAME, "error-message")))
+        cart_page.wait_for("error_message", timeout="page_load")
 
-        error_message = driver.find_element(By.CLASS_NAME, "error-message").text
+        error_message = cart_page.text("error_message")
         assert "Your cart is empty" in error_message, "Error message for empty cart not shown."
 
         print("Correct error displayed for empty cart during checkout.")
@@ -1,199 +1,109 @@
 import pytest
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
-# Setup WebDriver for Chrome
-@pytest.fixture
-def driver():
-    driver = webdriver.Chrome()
-    yield driver
-    driver.quit()
-
 # Test: Add items to the cart and verify they appear correctly
-def test_add_items_to_cart(driver):
+def test_add_items_to_cart(pages, login_as, accounts):
     print("Starting test: Add items to cart and verify")
 
-    # Log in as a buyer
-    driver.get("https://lazylizard.click/en/login")
+    # Log in as a buyer (cached session)
+    login_as("buyer")
     try:
-        WebDriverWait(driver, 20).until(EC.visibility_of_element_located((By.NAME, "username")))
-        username_field = driver.find_element(By.NAME, "username")
-        username_field.send_keys("buyer_username")
-
-        password_field = driver.find_element(By.NAME, "password")
-        password_field.send_keys("buyer_password")
-
-        login_button = driver.find_element(By.NAME, "login")
-        login_button.click()
-
-        # Navigate to a product page
-        driver.get("https://lazylizard.click/en/product/1") 
-
-        # Add the product to the cart
-        add_to_cart_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.NAME, "add_to_cart"))
-        )
-        add_to_cart_button.click()
+        # Navigate to a product page and add the product to the cart
+        pages.product.open_product(accounts.product_id).add_to_cart()
 
         # Go to the cart page and verify the item appears
-        cart_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.LINK_TEXT, "Cart"))
-        )
-        cart_button.click()
+        cart_page = pages.cart
+        cart_page.click("cart_link", until="clickable")
 
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, "cart-item")))
+        cart_page.wait_for("cart_item")
 
         # Verify the cart contains the item
-        cart_items = driver.find_elements(By.CLASS_NAME, "cart-item")
-        assert len(cart_items) > 0
+        assert cart_page.item_count() > 0
         print("Item successfully added to cart.")
 
     except TimeoutException:
         print("TimeoutException: Add item to cart test failed.")
 
 # Test: Increase/decrease item quantity and ensure price updates accordingly
-def test_update_item_quantity(driver):
+def test_update_item_quantity(pages, login_as, seed, accounts):
     print("Starting test: Update item quantity and verify price update")
 
-    # Log in and go to cart
-    driver.get("https://lazylizard.click/en/login")
+    # Seed the cart over HTTP, then log in (cached session) and open it directly
+    seed.cart("buyer", accounts.product_id)
+    login_as("buyer")
     try:
-        WebDriverWait(driver, 20).until(EC.visibility_of_element_located((By.NAME, "username")))
-        username_field = driver.find_element(By.NAME, "username")
-        username_field.send_keys("buyer_username")
-
-        password_field = driver.find_element(By.NAME, "password")
-        password_field.send_keys("buyer_password")
-
-        login_button = driver.find_element(By.NAME, "login")
-        login_button.click()
-
-        # Add an item to the cart
-        driver.get("https://lazylizard.click/en/product/1")
-        add_to_cart_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.NAME, "add_to_cart"))
-        )
-        add_to_cart_button.click()
-
-        # Go to the cart page
-        cart_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.LINK_TEXT, "Cart"))
-        )
-        cart_button.click()
+        cart_page = pages.cart.open()
 
         # Wait for the cart items to load
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, "cart-item")))
+        cart_page.wait_for("cart_item")
 
         # Increase item quantity
-        increase_quantity_button = driver.find_element(By.NAME, "increase_quantity")
-        increase_quantity_button.click()
+        cart_page.click("increase_quantity")
 
         # Verify price has updated
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, "cart-total")))
-        total_price = driver.find_element(By.CLASS_NAME, "cart-total")
-        assert "Total Price" in total_price.text
+        cart_page.wait_for("cart_total")
+        assert "Total Price" in cart_page.text("cart_total")
         print("Item quantity updated and price verified.")
 
         # Decrease item quantity
-        decrease_quantity_button = driver.find_element(By.NAME, "decrease_quantity")
-        decrease_quantity_button.click()
+        cart_page.click("decrease_quantity")
 
         # Verify price has updated again
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, "cart-total")))
-        total_price = driver.find_element(By.CLASS_NAME, "cart-total")
-        assert "Total Price" in total_price.text
+        cart_page.wait_for("cart_total")
+        assert "Total Price" in cart_page.text("cart_total")
         print("Item quantity decreased and price verified.")
 
     except TimeoutException:
         print("TimeoutException: Quantity update test failed.")
 
 # Test: Remove an item from the cart and confirm it's deleted
-def test_remove_item_from_cart(driver):
+def test_remove_item_from_cart(pages, login_as, seed, accounts):
     print("Starting test: Remove item from cart and confirm deletion")
 
-    # Log in and go to cart
-    driver.get("https://lazylizard.click/en/login")
+    # Seed the cart over HTTP, then log in (cached session) and open it directly
+    seed.empty_cart("buyer")
+    seed.cart("buyer", accounts.product_id)
+    login_as("buyer")
     try:
-        WebDriverWait(driver, 20).until(EC.visibility_of_element_located((By.NAME, "username")))
-        username_field = driver.find_element(By.NAME, "username")
-        username_field.send_keys("buyer_username")
-
-        password_field = driver.find_element(By.NAME, "password")
-        password_field.send_keys("buyer_password")
-
-        login_button = driver.find_element(By.NAME, "login")
-        login_button.click()
-
-        # Add an item to the cart
-        driver.get("https://lazylizard.click/en/product/1")
-        add_to_cart_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.NAME, "add_to_cart"))
-        )
-        add_to_cart_button.click()
-
-        # Go to the cart page
-        cart_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.LINK_TEXT, "Cart"))
-        )
-        cart_button.click()
+        cart_page = pages.cart.open()
 
         # Wait for the cart items to load
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, "cart-item")))
+        cart_page.wait_for("cart_item")
 
         # Remove the item from the cart
-        remove_button = driver.find_element(By.NAME, "remove_item")
-        remove_button.click()
+        cart_page.click("remove_item_button")
 
         # Verify the cart is empty
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, "empty-cart-message")))
+        cart_page.wait_for("empty_cart_message")
 
-        empty_cart_message = driver.find_element(By.CLASS_NAME, "empty-cart-message")
-        assert "Your cart is empty" in empty_cart_message.text
+        assert "Your cart is empty" in cart_page.text("empty_cart_message")
         print("Item successfully removed from cart.")
 
     except TimeoutException:
         print("TimeoutException: Remove item from cart test failed.")
 
 # Test: Attempt checkout with an empty cart and check for errors
-def test_checkout_empty_cart(driver):
+def test_checkout_empty_cart(pages, login_as, seed):
     print("Starting test: Checkout with empty cart and verify error")
 
-    # Log in without adding any items to the cart
-    driver.get("https://lazylizard.click/en/login")
+    # Empty whatever earlier tests left in the cart over HTTP, then log in (cached session)
+    seed.empty_cart("buyer")
+    login_as("buyer")
     try:
-        WebDriverWait(driver, 20).until(EC.visibility_of_element_located((By.NAME, "username")))
-        username_field = driver.find_element(By.NAME, "username")
-        username_field.send_keys("buyer_username")
-
-        password_field = driver.find_element(By.NAME, "password")
-        password_field.send_keys("buyer_password")
-
-        login_button = driver.find_element(By.NAME, "login")
-        login_button.click()
-
         # Go to the cart page (empty cart)
-        cart_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.LINK_TEXT, "Cart"))
-        )
-        cart_button.click()
+        cart_page = pages.cart.open()
 
         # Wait for the cart to load
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, "cart-empty-message")))
+        cart_page.wait_for("cart_empty_message")
 
         # Attempt to checkout with an empty cart
-        checkout_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.LINK_TEXT, "Checkout"))
-        )
-        checkout_button.click()
+        checkout_page = pages.checkout
+        cart_page.click("checkout_link", until="clickable")
 
         # Verify error message appears
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, "cart-empty-error")))
+        checkout_page.wait_for("cart_empty_error")
 
-        error_message = driver.find_element(By.CLASS_NAME, "cart-empty-error")
-        assert "Your cart is empty" in error_message.text
+        assert "Your cart is empty" in checkout_page.text("cart_empty_error")
         print("Error verified: Cannot checkout with empty cart.")
 
     except TimeoutException:
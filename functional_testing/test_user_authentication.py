@@ -1,108 +1,67 @@
 import pytest
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
-# Setup WebDriver and testing on Chrome
-@pytest.fixture
-def driver():
-    driver = webdriver.Chrome()
-    yield driver
-    driver.quit()
-
-def test_login_with_valid_credentials(driver):
+def test_login_with_valid_credentials(pages):
     print("Starting test: Login with valid credentials (valid password)")
 
     # Open login page
     print("Opening login page...")
-    driver.get("https://lazylizard.click/en/login")
+    login_page = pages.login.open()
 
     try:
         print(f"Attempting login with valid credentials...")
 
-        # Wait for the password field to be visible before interacting
-        WebDriverWait(driver, 20).until(EC.visibility_of_element_located((By.NAME, "password")))
-
-        # Find and fill the password field
-        password_field = driver.find_element(By.NAME, "password")
-        
-        password_field.send_keys("valid_password")
-        # Click the login button
-        login_button = driver.find_element(By.NAME, "login")
-        login_button.click()
+        # Fill the password field once it is visible and click the login button
+        login_page.login(password="valid_password", timeout="page_load")
 
         # Verify successful login
         print("Verifying successful login...")
-        assert "Dashboard" in driver.title
-        assert "Profile" in driver.page_source
+        login_page.expect("Profile", title="Dashboard")
 
         # Check session persistence (refresh the page)
-        driver.refresh()
-        assert "Profile" in driver.page_source
+        login_page.refresh().expect("Profile")
         print("Login successful with valid credentials")
 
     except TimeoutException:
         print("TimeoutException: Element not found in time")
 
-def test_login_with_invalid_credentials(driver):
+def test_login_with_invalid_credentials(pages):
 
     # Open login page
-    driver.get("https://lazylizard.click/en/")
+    login_page = pages.login.open("")
 
     try:
-        # Wait for the password field to be visible before interacting
-        WebDriverWait(driver, 20).until(EC.visibility_of_element_located((By.NAME, "password")))
-
-        # Find and fill the password field with an invalid password
-        password_field = driver.find_element(By.NAME, "password")
-        
-        password_field.send_keys("invalid_password") 
-
-        # Click the login button
-        login_button = driver.find_element(By.NAME, "login")
-        login_button.click()
+        # Fill the password field with an invalid password and click the login button
+        login_page.login(password="invalid_password", timeout="page_load")
 
         # Verify error handling for invalid login
-        assert "Invalid credentials" in driver.page_source 
+        login_page.expect("Invalid credentials")
 
     except TimeoutException:
         print("TimeoutException: Element not found in time")
 
-def test_logout(driver):
+def test_logout(pages):
     print("Starting test: Logout functionality")
 
     # Open login page
-    driver.get("https://lazylizard.click/en/")
+    login_page = pages.login.open("")
 
     # Log in with valid credentials
     try:
-        # Wait for the password field to be visible before interacting
-        WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.NAME, "password")))
-
-        password_field = driver.find_element(By.NAME, "password")
-        
         # Fill the password field and click the login button
-        password_field.send_keys("valid_password") 
-        login_button = driver.find_element(By.NAME, "login")
-        login_button.click()
+        login_page.login(password="valid_password")
 
         # Verify successful login
-        assert "Dashboard" in driver.title
-        assert "Profile" in driver.page_source
+        login_page.expect("Profile", title="Dashboard")
 
         # Logout
-        logout_button = driver.find_element(By.NAME, "logout")
-        logout_button.click()
+        login_page.click("logout")
 
         # Verify redirection to login page after logout
-        assert "Login" in driver.title
-        
+        login_page.expect(title="Login")
+
     except TimeoutException:
         print("TimeoutException: Element not found in time")
 
 if __name__ == "__main__":
     pytest.main()
-
-
@@ -0,0 +1,106 @@
+# Compares Chrome launch profiles by running a Selenium suite once per profile
+# and reporting per-test wall time and the peak RSS of all Chrome processes.
+#
+# python performance_testing/bench_chrome_profiles.py --env local functional_testing
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Samples the summed RSS of the Chrome/chromedriver processes under pid
+class RssSampler(threading.Thread):
+    def __init__(self, pid, interval=0.2):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.is_set():
+            try:
+                children = psutil.Process(self.pid).children(recursive=True)
+            except psutil.NoSuchProcess:
+                break
+            rss = 0
+            for child in children:
+                try:
+                    if "chrome" in child.name().lower():
+                        rss += child.memory_info().rss
+                except psutil.Error:
+                    pass
+            self.peak = max(self.peak, rss)
+            self._done.wait(self.interval)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def run_suite(profile, suite, extra_args):
+    with tempfile.TemporaryDirectory() as tmp:
+        junit = os.path.join(tmp, "junit.xml")
+        cmd = [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", suite,
+               f"--chrome-profile={profile}", f"--junitxml={junit}", *extra_args]
+        started = time.perf_counter()
+        proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        sampler = RssSampler(proc.pid) if psutil else None
+        if sampler:
+            sampler.start()
+        proc.wait()
+        wall = time.perf_counter() - started
+        if sampler:
+            sampler.stop()
+
+        times = [float(case.get("time", 0)) for case in ET.parse(junit).getroot().iter("testcase")]
+    return {
+        "profile": profile,
+        "tests": len(times),
+        "wall": wall,
+        "mean": statistics.mean(times) if times else 0.0,
+        "median": statistics.median(times) if times else 0.0,
+        "peak_rss_mb": sampler.peak / 2**20 if sampler else None,
+        "exit_code": proc.returncode,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Chrome launch profiles on a Selenium suite")
+    parser.add_argument("suite", nargs="?", default="functional_testing")
+    parser.add_argument("--profiles", default="default,fast")
+    parser.add_argument("--env", default=None, help="Environment profile passed to pytest")
+    args, extra = parser.parse_known_args(argv)
+    if args.env:
+        extra.append(f"--env={args.env}")
+    if psutil is None:
+        print("psutil is not installed; peak RSS will not be measured (pip install psutil)")
+
+    results = [run_suite(profile, args.suite, extra) for profile in args.profiles.split(",")]
+
+    print(f"{'profile':<10} {'tests':>5} {'suite s':>9} {'mean/test s':>12} {'median/test s':>14} {'peak RSS MB':>12}")
+    for r in results:
+        rss = f"{r['peak_rss_mb']:.0f}" if r["peak_rss_mb"] is not None else "n/a"
+        print(f"{r['profile']:<10} {r['tests']:>5} {r['wall']:>9.1f} {r['mean']:>12.2f} {r['median']:>14.2f} {rss:>12}")
+        if r["exit_code"]:
+            print(f"  warning: pytest exited with {r['exit_code']} under the {r['profile']} profile")
+    baseline = results[0]
+    for r in results[1:]:
+        if baseline["mean"]:
+            print(f"{r['profile']} vs {baseline['profile']}: {r['mean'] / baseline['mean']:.2f}x mean time per test")
+
+
+if __name__ == "__main__":
+    main()
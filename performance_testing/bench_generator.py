@@ -0,0 +1,97 @@
+# Measures how many requests per CPU-second a single Locust process can
+# generate with each user class, against the local stand-in shop, to size
+# load generator fleets.
+#
+# python performance_testing/bench_generator.py --users 50 --run-time 20
+import argparse
+import csv
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+LOCUSTFILES = {
+    "Shopper": os.path.join(HERE, "performance.py"),
+    "FastShopper": os.path.join(HERE, "fast_performance.py"),
+}
+
+
+def children_cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_locust(user_class, host, users, run_time, pacing):
+    with tempfile.TemporaryDirectory() as tmp:
+        prefix = os.path.join(tmp, "bench")
+        cmd = [
+            sys.executable, "-m", "locust", "-f", LOCUSTFILES[user_class], user_class,
+            "--headless", "--host", host, "-u", str(users), "-r", str(users),
+            "-t", f"{run_time}s", "--csv", prefix, "--loglevel", "WARNING",
+            # Benchmark runs stay out of the result store, HDR logs and SLO report,
+            # and don't hold the metrics port a real run may be using
+            "--results-db", "", "--hdr-log", "", "--slo-file", "", "--metrics-port", "0",
+        ]
+        env = dict(os.environ, SHOPPER_PACING=pacing)
+        cpu_before = children_cpu_seconds()
+        started = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        wall = time.perf_counter() - started
+        cpu = children_cpu_seconds() - cpu_before
+
+        with open(f"{prefix}_stats.csv", newline="") as f:
+            aggregated = next(row for row in csv.DictReader(f) if row["Name"] == "Aggregated")
+    requests = int(aggregated["Request Count"])
+    return {
+        "user_class": user_class,
+        "requests": requests,
+        "failures": int(aggregated["Failure Count"]),
+        "rps": float(aggregated["Requests/s"]),
+        "cpu": cpu,
+        "rps_per_core": requests / cpu if cpu else 0.0,
+        "wall": wall,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Locust generator throughput per core")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--run-time", type=int, default=20, help="Seconds per user class")
+    parser.add_argument("--classes", default="Shopper,FastShopper")
+    parser.add_argument("--pacing", default="none", help="SHOPPER_PACING for the run (default: no think time)")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--host", default=None, help="Target an already running server instead of the stand-in")
+    args = parser.parse_args(argv)
+
+    shop = None
+    host = args.host
+    if host is None:
+        host = f"http://127.0.0.1:{args.port}"
+        shop = subprocess.Popen(
+            [sys.executable, "-m", "support.fake_shop", "--port", str(args.port)], cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        shop.stdout.readline()  # wait for the "listening" line
+
+    try:
+        results = [run_locust(c, host, args.users, args.run_time, args.pacing) for c in args.classes.split(",")]
+    finally:
+        if shop:
+            shop.terminate()
+            shop.wait()
+
+    # Requests per generator CPU-second is the same as sustainable RPS per fully used core
+    print(f"{'user class':<12} {'requests':>9} {'failures':>9} {'RPS':>8} {'CPU s':>7} {'RPS/core':>9}")
+    for r in results:
+        print(
+            f"{r['user_class']:<12} {r['requests']:>9} {r['failures']:>9} {r['rps']:>8.0f} "
+            f"{r['cpu']:>7.1f} {r['rps_per_core']:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
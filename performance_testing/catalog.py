@@ -0,0 +1,47 @@
+import csv
+import itertools
+import os
+import random
+
+CATALOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.csv")
+
+# Most shoppers buy one of an item; a few stock up
+QUANTITY_WEIGHTS = {1: 70, 2: 18, 3: 7, 4: 3, 5: 2}
+
+
+# Product catalog for the load test. Rows are listed from most to least
+# popular; unless a row has an explicit weight, popularity follows a Zipf
+# law (weight = 1 / rank ** zipf_s), which gives the long-tail cache profile
+# of real traffic instead of one hot product.
+class Catalog:
+    def __init__(self, products, zipf_s=1.1):
+        self.products = products
+        weights = [float(p.get("weight") or 1 / rank ** zipf_s) for rank, p in enumerate(products, start=1)]
+        self._cum_weights = list(itertools.accumulate(weights))
+        self._quantities = list(QUANTITY_WEIGHTS)
+        self._quantity_weights = list(itertools.accumulate(QUANTITY_WEIGHTS.values()))
+
+    @classmethod
+    def load(cls, path=CATALOG_FILE, zipf_s=1.1):
+        with open(path, newline="") as f:
+            products = [
+                {
+                    "id": int(row["product_id"]),
+                    "category": row["category"],
+                    "search_term": row["search_term"],
+                    "max_quantity": int(row.get("max_quantity") or 5),
+                    "weight": row.get("weight"),
+                }
+                for row in csv.DictReader(f)
+            ]
+        return cls(products, zipf_s)
+
+    def pick_product(self, rng=random):
+        return rng.choices(self.products, cum_weights=self._cum_weights)[0]
+
+    def pick_quantity(self, product, rng=random):
+        quantity = rng.choices(self._quantities, cum_weights=self._quantity_weights)[0]
+        return min(quantity, product["max_quantity"])
+
+    def pick_search_term(self, rng=random):
+        return self.pick_product(rng)["search_term"]
@@ -0,0 +1,28 @@
+import os
+import sys
+
+from locust import FastHttpUser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from journeys import ENV, ShopperBehaviour, pacing_from_env  # noqa: E402
+import slo  # noqa: E402,F401  registers --slo-file and the end-of-run SLO gate
+import metrics  # noqa: E402,F401  HDR latency histograms, OpenMetrics endpoint and histogram logs
+import results  # noqa: E402,F401  records every run in the result store
+
+
+# Same journeys as Shopper, on the geventhttpclient-based client, which
+# needs a fraction of the CPU per request. Keep-alive connections are reused
+# per user; FAST_CONCURRENCY sets how many each user may hold open.
+class FastShopper(FastHttpUser):
+    host = ENV.base_url
+    wait_time = pacing_from_env()
+    tasks = [ShopperBehaviour]
+    concurrency = int(os.environ.get("FAST_CONCURRENCY", "1"))
+    connection_timeout = float(os.environ.get("FAST_CONNECTION_TIMEOUT", "10"))
+    network_timeout = float(os.environ.get("FAST_NETWORK_TIMEOUT", "30"))
+    max_retries = 0
+
+    def on_start(self):
+        self.cart = {}
+
+# SHOPPER_PACING=constant-throughput:2 locust -f performance_testing/fast_performance.py
@@ -0,0 +1,230 @@
+# HDR-style latency histogram: log-linear buckets with a fixed relative
+# precision, so memory stays constant however many values are recorded and
+# high percentiles are exact to within that precision. Values are integers
+# (we record microseconds).
+#
+# Same bucket layout as HdrHistogram: each power-of-two range is split into
+# sub_bucket_half_count linear sub-buckets. encode() produces HdrHistogram's
+# V2 compressed format, so .hlog files can be read by the standard tools
+# (HistogramLogAnalyzer, HistogramLogProcessor, the hdrhistogram package).
+import base64
+import math
+import struct
+import time
+import zlib
+from array import array
+
+ENCODING_COOKIE = 0x1C849303 | 0x10
+COMPRESSED_ENCODING_COOKIE = 0x1C849304 | 0x10
+
+
+def _zigzag_leb128(value):
+    value = (value << 1) ^ (value >> 63)
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return out
+
+
+def _read_zigzag_leb128(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80 or shift >= 63:
+            break
+    return (value >> 1) ^ -(value & 1), offset
+
+
+class HdrHistogram:
+    def __init__(self, lowest=1, highest=3_600_000_000, significant_digits=3):
+        self.lowest = lowest
+        self.highest = highest
+        self.significant_digits = significant_digits
+
+        largest_single_unit = 2 * 10**significant_digits
+        self.unit_magnitude = int(math.floor(math.log2(lowest)))
+        self.sub_bucket_count_magnitude = int(math.ceil(math.log2(largest_single_unit)))
+        self.sub_bucket_half_count_magnitude = self.sub_bucket_count_magnitude - 1
+        self.sub_bucket_count = 1 << self.sub_bucket_count_magnitude
+        self.sub_bucket_half_count = self.sub_bucket_count // 2
+        self.sub_bucket_mask = (self.sub_bucket_count - 1) << self.unit_magnitude
+
+        smallest_untrackable = self.sub_bucket_count << self.unit_magnitude
+        self.bucket_count = 1
+        while smallest_untrackable <= highest:
+            smallest_untrackable <<= 1
+            self.bucket_count += 1
+
+        self.counts = array("q", bytes(8 * (self.bucket_count + 1) * self.sub_bucket_half_count))
+        self.total_count = 0
+        self.min_value = None
+        self.max_value = 0
+        self.total = 0
+
+    def _index(self, value):
+        bucket = (value | self.sub_bucket_mask).bit_length() - self.unit_magnitude - self.sub_bucket_count_magnitude
+        sub_bucket = value >> (bucket + self.unit_magnitude)
+        return ((bucket + 1) << self.sub_bucket_half_count_magnitude) + sub_bucket - self.sub_bucket_half_count
+
+    def _value_at(self, index):
+        bucket = (index >> self.sub_bucket_half_count_magnitude) - 1
+        sub_bucket = (index & (self.sub_bucket_half_count - 1)) + self.sub_bucket_half_count
+        if bucket < 0:
+            sub_bucket -= self.sub_bucket_half_count
+            bucket = 0
+        return sub_bucket << (bucket + self.unit_magnitude), 1 << (bucket + self.unit_magnitude)
+
+    def record(self, value, count=1):
+        value = min(max(int(value), self.lowest), self.highest)
+        self.counts[self._index(value)] += count
+        self.total_count += count
+        self.total += value * count
+        self.max_value = max(self.max_value, value)
+        self.min_value = value if self.min_value is None else min(self.min_value, value)
+
+    # Highest value equivalent (within precision) to the given percentile (0-100)
+    def value_at_percentile(self, percentile):
+        if not self.total_count:
+            return 0
+        target = max(1, int(math.ceil(percentile / 100 * self.total_count)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count:
+                seen += count
+                if seen >= target:
+                    start, size = self._value_at(index)
+                    return min(start + size - 1, self.max_value)
+        return self.max_value
+
+    # value_at_percentile for several percentiles in one pass over the counts
+    def values_at_percentiles(self, percentiles):
+        targets = sorted((max(1, int(math.ceil(p / 100 * self.total_count))), p) for p in percentiles)
+        values = dict.fromkeys(percentiles, 0)
+        seen = 0
+        pending = iter(targets)
+        target = next(pending, None)
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            seen += count
+            while target is not None and seen >= target[0]:
+                start, size = self._value_at(index)
+                values[target[1]] = min(start + size - 1, self.max_value)
+                target = next(pending, None)
+            if target is None:
+                break
+        return values
+
+    def mean(self):
+        return self.total / self.total_count if self.total_count else 0
+
+    # (lowest value in the bucket, count) for every non-empty bucket
+    def buckets(self):
+        for index, count in enumerate(self.counts):
+            if count:
+                yield self._value_at(index)[0], count
+
+    def add(self, other):
+        if (other.lowest, other.highest, other.significant_digits) != (self.lowest, self.highest, self.significant_digits):
+            raise ValueError("Can only add histograms with the same range and precision")
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total_count += other.total_count
+        self.total += other.total
+        self.max_value = max(self.max_value, other.max_value)
+        if other.min_value is not None:
+            self.min_value = other.min_value if self.min_value is None else min(self.min_value, other.min_value)
+
+    # Non-empty (index, count) pairs, for shipping between processes
+    def sparse(self):
+        return [(index, count) for index, count in enumerate(self.counts) if count]
+
+    def add_sparse(self, pairs, max_value=None):
+        for index, count in pairs:
+            self.counts[index] += count
+            value = self._value_at(index)[0]
+            self.total_count += count
+            self.total += value * count
+            self.min_value = value if self.min_value is None else min(self.min_value, value)
+            self.max_value = max(self.max_value, value)
+        if max_value is not None:
+            self.max_value = max(self.max_value, max_value)
+
+    # V2 compressed encoding, base64 as used in histogram logs
+    def encode(self):
+        payload = bytearray()
+        zeros = 0
+        last = max((i for i, c in enumerate(self.counts) if c), default=-1)
+        for count in self.counts[:last + 1]:
+            if not count:
+                zeros += 1
+                continue
+            if zeros:
+                payload += _zigzag_leb128(-zeros if zeros > 1 else 0)
+                zeros = 0
+            payload += _zigzag_leb128(count)
+        header = struct.pack(
+            ">iiiiqqd", ENCODING_COOKIE, len(payload), 0, self.significant_digits, self.lowest, self.highest, 1.0
+        )
+        compressed = zlib.compress(bytes(header + payload))
+        return base64.b64encode(struct.pack(">ii", COMPRESSED_ENCODING_COOKIE, len(compressed)) + compressed).decode()
+
+    @classmethod
+    def decode(cls, encoded):
+        data = base64.b64decode(encoded)
+        cookie, length = struct.unpack(">ii", data[:8])
+        if cookie != COMPRESSED_ENCODING_COOKIE:
+            raise ValueError("Not a V2 compressed histogram")
+        raw = zlib.decompress(data[8:8 + length])
+        _, payload_length, _, digits, lowest, highest, _ = struct.unpack(">iiiiqqd", raw[:40])
+        histogram = cls(lowest, highest, digits)
+        pairs = []
+        index, offset, end = 0, 40, 40 + payload_length
+        while offset < end:
+            count, offset = _read_zigzag_leb128(raw, offset)
+            if count < 0:
+                index += -count
+            else:
+                if count:
+                    pairs.append((index, count))
+                index += 1
+        histogram.add_sparse(pairs)
+        return histogram
+
+    def reset(self):
+        self.counts = array("q", bytes(8 * len(self.counts)))
+        self.total_count = 0
+        self.min_value = None
+        self.max_value = 0
+        self.total = 0
+
+
+# Writes interval histograms in the HdrHistogram log format (.hlog), one
+# tagged line per histogram. Max values are written in milliseconds.
+class HistogramLogWriter:
+    def __init__(self, path, start_time=None):
+        self.start_time = start_time or time.time()
+        self.file = open(path, "w")
+        self.file.write("#[Histogram log format version 1.3]\n")
+        self.file.write(f"#[StartTime: {self.start_time:.3f} (seconds since epoch), {time.ctime(self.start_time)}]\n")
+        self.file.write('"StartTimestamp","Interval_Length","Interval_Max","Interval_Compressed_Histogram"\n')
+
+    def write(self, histogram, start, end, tag=None):
+        prefix = f"Tag={tag.replace(' ', '_').replace(',', ';')}," if tag else ""
+        self.file.write(
+            f"{prefix}{start - self.start_time:.3f},{end - start:.3f},{histogram.max_value / 1000:.3f},"
+            f"{histogram.encode()}\n"
+        )
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,156 @@
+import os
+import sys
+import time
+
+from locust import User, between, events, task
+from locust.stats import StatsError
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.events import EventFiringWebDriver
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from journeys import BUYERS, CATALOG, ENV  # noqa: E402
+import metrics  # noqa: E402  HDR latency histograms, OpenMetrics endpoint and histogram logs
+import results  # noqa: E402,F401  records every run in the result store
+from support.chrome_profiles import chrome_options  # noqa: E402
+from support.nav_timing import NavigationTimingListener  # noqa: E402
+from support.sessions import SessionCache  # noqa: E402
+from support.waits import Waiter  # noqa: E402
+
+# Browser users for hybrid runs: a few headless Chromes replay the functional
+# flows (add to cart, checkout, order history) while the HTTP users generate
+# the bulk load. Every page a browser loads reports its Navigation Timing
+# metrics as Locust requests (type ttfb/fcp/lcp/dcl/load, named by route), and
+# every flow reports its duration as type "flow", so page-level experience
+# shows up in the same stats, charts and result store as the backend load.
+# They are logged straight into their own stats entries rather than fired as
+# request events: the Aggregated row (stats.total) stays HTTP-only, so its
+# RPS and percentiles, the knee tracker and the CSV totals still describe the
+# backend alone.
+#
+# LAZYLIZARD_ENV=local locust -f performance_testing/performance.py,performance_testing/hybrid.py \
+#     --headless -u 52 -r 10 --browser-users 2 -t 10m
+
+# Locust request type -> Navigation Timing field
+PAGE_METRICS = {
+    "ttfb": "ttfb",
+    "fcp": "first_contentful_paint",
+    "lcp": "largest_contentful_paint",
+    "dcl": "dom_content_loaded",
+    "load": "load",
+}
+
+
+@events.init_command_line_parser.add_listener
+def _(parser):
+    parser.add_argument("--browser-users", type=int, default=int(os.environ.get("BROWSER_USERS", "2")),
+                        help="Headless browser users, out of the total user count")
+
+
+# Records a browser measurement in its stats entry, its errors and the HDR
+# histograms, leaving stats.total alone. Workers ship the entries to the master
+# with their regular stats reports.
+def log_browser_metric(environment, request_type, name, response_time, response_length=0, exception=None):
+    stats = environment.stats
+    stats.get(name, request_type).log(response_time, response_length)
+    if exception is not None:
+        stats.get(name, request_type).log_error(exception)
+        key = StatsError.create_key(request_type, name, exception)
+        if key not in stats.errors:
+            stats.errors[key] = StatsError(request_type, name, exception)
+        stats.errors[key].occurred()
+    metrics.METRICS.record(f"{request_type} {name}", response_time, exception is not None)
+
+
+@events.init.add_listener
+def _(environment, **kwargs):
+    if environment.parsed_options is not None:
+        BrowserShopper.fixed_count = environment.parsed_options.browser_users
+
+
+# Takes the place of NavigationTimings for the listener: each captured page
+# becomes one stats entry sample per metric
+class LocustPageTimings:
+    def __init__(self, environment):
+        self.environment = environment
+
+    def add(self, record):
+        for request_type, field in PAGE_METRICS.items():
+            if record.get(field) is None:
+                continue
+            log_browser_metric(
+                self.environment, request_type, record["route"], record[field], record.get("transfer_size") or 0
+            )
+
+
+class BrowserShopper(User):
+    fixed_count = 2
+    wait_time = between(5, 15)
+
+    def on_start(self):
+        self.driver = None
+        raw = webdriver.Chrome(options=chrome_options("headless", ENV.base_url))
+        # A browser that fails to log in must not outlive this user
+        try:
+            raw.set_page_load_timeout(ENV.timeouts["page_load"])
+            driver = EventFiringWebDriver(raw, NavigationTimingListener(LocustPageTimings(self.environment)))
+            self.wait = Waiter(driver, ENV.timeouts)
+            SessionCache(ENV, credentials={"buyer": BUYERS.next()}).login(driver, "buyer")
+        except Exception:
+            raw.quit()
+            raise
+        self.driver = driver
+
+    def on_stop(self):
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+
+    # Runs one flow and reports its total time, failing it on any WebDriver error
+    def flow(self, name, steps):
+        started = time.perf_counter()
+        exception = None
+        try:
+            steps()
+        except WebDriverException as e:
+            exception = e
+        log_browser_metric(
+            self.environment, "flow", name, (time.perf_counter() - started) * 1000, exception=exception
+        )
+
+    @task(3)
+    def add_to_cart(self):
+        # As functional_testing/test_cart.py: home page, first product, add it, open the cart
+        def steps():
+            self.driver.get(ENV.url())
+            self.wait.all_present((By.CLASS_NAME, "product-item"), timeout="page_load")
+            self.driver.find_element(By.CLASS_NAME, "product-item").click()
+            self.wait.clickable((By.NAME, "add-to-cart"), timeout="page_load").click()
+            self.driver.find_element(By.CLASS_NAME, "cart-icon").click()
+            self.wait.present((By.CLASS_NAME, "cart-items"), timeout="page_load")
+
+        self.flow("add to cart", steps)
+
+    @task(2)
+    def checkout(self):
+        # As functional_testing/test_checkout.py, then placing the order
+        def steps():
+            product = CATALOG.pick_product()
+            self.driver.get(ENV.url(f"product/{product['id']}"))
+            self.wait.clickable((By.NAME, "add_to_cart")).click()
+            self.wait.clickable((By.LINK_TEXT, "Checkout")).click()
+            self.wait.clickable((By.NAME, "place_order"), timeout="page_load").click()
+            self.wait.present((By.CLASS_NAME, "order-list"), timeout="page_load")
+
+        self.flow("checkout", steps)
+
+    @task(1)
+    def order_history(self):
+        # As functional_testing/test_order_management.py for buyers
+        def steps():
+            self.driver.get(ENV.url("dashboard"))
+            self.wait.clickable((By.LINK_TEXT, "Order History")).click()
+            self.wait.present((By.CLASS_NAME, "order-list"))
+
+        self.flow("order history", steps)
@@ -0,0 +1,133 @@
+import json
+import os
+import random
+import threading
+from urllib.parse import urlencode
+
+from locust import SequentialTaskSet, TaskSet, between, constant, constant_throughput, task
+
+from catalog import Catalog
+from support.environment import load_environment
+
+ENV = load_environment()
+CATALOG = Catalog.load()
+
+
+# Buyer accounts handed out round-robin to simulated users. LOCUST_ACCOUNTS may
+# point at a JSON file in the accounts.example.json format; otherwise every
+# user signs in with the environment's buyer account.
+class BuyerAccounts:
+    def __init__(self):
+        path = os.environ.get("LOCUST_ACCOUNTS")
+        if path:
+            with open(path) as f:
+                self.accounts = [(a["username"], a["password"]) for a in json.load(f)["buyer"]]
+        else:
+            self.accounts = [ENV.credentials["buyer"]]
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def next(self):
+        with self._lock:
+            account = self.accounts[self._next % len(self.accounts)]
+            self._next += 1
+        return account
+
+
+BUYERS = BuyerAccounts()
+
+
+# Think time between tasks, from SHOPPER_PACING:
+#   between:MIN:MAX             random think time (the default, between:1:5)
+#   constant-throughput:RATE    each user runs RATE tasks per second whatever the response times
+#   none                        no think time at all
+def pacing_from_env(default="between:1:5"):
+    kind, *args = os.environ.get("SHOPPER_PACING", default).split(":")
+    if kind == "between":
+        return between(float(args[0]), float(args[1]))
+    if kind == "constant-throughput":
+        return constant_throughput(float(args[0]))
+    if kind == "none":
+        return constant(0)
+    raise ValueError(f"Unknown SHOPPER_PACING {kind!r}; use between:MIN:MAX, constant-throughput:RATE or none")
+
+
+# A journey runs its tasks in order and then hands control back to the user,
+# which picks the next journey. Per-user state (the cart) lives on self.user.
+class Journey(SequentialTaskSet):
+    def view_product(self, product=None):
+        product = product or CATALOG.pick_product()
+        self.client.get(ENV.path(f"product/{product['id']}"), name=ENV.path("product/[id]"))
+        return product
+
+    def add_to_cart(self, product):
+        quantity = CATALOG.pick_quantity(product)
+        response = self.client.post(ENV.path("cart/add"), json={"product_id": product["id"], "quantity": quantity})
+        if response.ok:
+            self.user.cart[product["id"]] = self.user.cart.get(product["id"], 0) + quantity
+
+
+class BrowseJourney(Journey):
+    @task
+    def browse_products(self):
+        query = urlencode({"page": random.randint(1, 5)})
+        self.client.get(f"{ENV.path('products')}?{query}", name=ENV.path("products"))
+
+    @task
+    def view_a_few_products(self):
+        for _ in range(random.randint(1, 3)):
+            self.view_product()
+        self.interrupt()
+
+
+class SearchJourney(Journey):
+    @task
+    def search(self):
+        query = urlencode({"q": CATALOG.pick_search_term()})
+        self.client.get(f"{ENV.path('products')}?{query}", name=ENV.path("products?q=[term]"))
+
+    @task
+    def view_result(self):
+        product = self.view_product()
+        if random.random() < 0.3:
+            self.add_to_cart(product)
+        self.interrupt()
+
+
+class PurchaseJourney(Journey):
+    @task
+    def fill_cart(self):
+        for _ in range(random.randint(1, 4)):
+            self.add_to_cart(self.view_product())
+
+    @task
+    def view_cart(self):
+        self.client.get(ENV.path("cart"))
+
+    @task
+    def checkout(self):
+        self.client.get(ENV.path("checkout"))
+        if self.user.cart:
+            self.client.post(ENV.path("checkout"), data={"place_order": ""})
+            self.user.cart.clear()
+
+    @task
+    def view_order_history(self):
+        self.client.get(ENV.path("orders"))
+        self.interrupt()
+
+
+class OrderHistoryJourney(Journey):
+    @task
+    def view_order_history(self):
+        self.client.get(ENV.path("orders"))
+        self.interrupt()
+
+
+# Weighted mix of journeys, starting from a logged-in session
+class ShopperBehaviour(TaskSet):
+    tasks = {BrowseJourney: 4, SearchJourney: 3, PurchaseJourney: 2, OrderHistoryJourney: 1}
+
+    def on_start(self):
+        username, password = BUYERS.next()
+        self.client.post(ENV.path("login"), data={"username": username, "password": password, "login": ""})
@@ -0,0 +1,135 @@
+# Runs a distributed Locust test: one master plus one worker per core on this
+# machine, and optionally workers on other hosts over ssh. Waits for the run to
+# finish, prints the aggregated stats from the master's CSV and stops every
+# process it started.
+#
+# python performance_testing/launcher.py -u 500 -r 50 -t 10m
+# python performance_testing/launcher.py -f fast_performance.py --remote loadgen1:8 --remote loadgen2:8 \
+#     --master-host 10.0.0.5 -u 5000 -r 200 -t 30m
+#
+# Anything after "--" is passed to the master, e.g. "-- --host https://staging.lazylizard.click".
+import argparse
+import csv
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+
+def parse_remote(spec):
+    host, _, count = spec.partition(":")
+    return host, int(count or 1)
+
+
+def locust_cmd(*args):
+    return [sys.executable, "-m", "locust", *args]
+
+
+def start(cmd, **kwargs):
+    # Own process group so Ctrl+C goes through the launcher, not straight to every child
+    return subprocess.Popen(cmd, cwd=HERE, start_new_session=True, **kwargs)
+
+
+def stop(procs, grace=10):
+    for proc in procs:
+        if proc.poll() is None:
+            proc.send_signal(signal.SIGINT)
+    deadline = time.monotonic() + grace
+    for proc in procs:
+        try:
+            proc.wait(max(0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.wait()
+
+
+def read_aggregated(prefix):
+    path = f"{prefix}_stats.csv"
+    if not os.path.exists(path):
+        return None
+    with open(path, newline="") as f:
+        return next((row for row in csv.DictReader(f) if row["Name"] == "Aggregated"), None)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    extra = []
+    if "--" in argv:
+        extra = argv[argv.index("--") + 1:]
+        argv = argv[:argv.index("--")]
+
+    parser = argparse.ArgumentParser(description="Run Locust distributed over every core")
+    parser.add_argument("-f", "--locustfile", default="performance.py", help="Relative to performance_testing/")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Local workers (default: one per core)")
+    parser.add_argument(
+        "--remote", action="append", default=[], metavar="HOST[:N]",
+        help="Start N workers on HOST over ssh (repeatable)",
+    )
+    parser.add_argument("--remote-dir", default="Script_test", help="Checkout of this repo on the remote hosts")
+    parser.add_argument("--remote-python", default="python3")
+    parser.add_argument("--master-host", help="Address remote workers use to reach this machine")
+    parser.add_argument("--master-port", type=int, default=5557)
+    parser.add_argument("-u", "--users", type=int, default=100)
+    parser.add_argument("-r", "--spawn-rate", type=float, default=10)
+    parser.add_argument("-t", "--run-time", default="5m")
+    parser.add_argument("--csv", default=os.path.join(HERE, "results", "run"), help="CSV prefix for the master's stats")
+    parser.add_argument("--worker-wait", type=int, default=60, help="Seconds to wait for all workers to connect")
+    args = parser.parse_args(argv)
+
+    remotes = [parse_remote(spec) for spec in args.remote]
+    expected = args.workers + sum(count for _, count in remotes)
+    if expected < 1:
+        parser.error("need at least one worker")
+    if remotes and not args.master_host:
+        parser.error("--remote needs --master-host")
+    os.makedirs(os.path.dirname(os.path.abspath(args.csv)), exist_ok=True)
+
+    master = start(locust_cmd(
+        "-f", args.locustfile, "--master", "--headless",
+        "--master-bind-port", str(args.master_port),
+        "--expect-workers", str(expected), "--expect-workers-max-wait", str(args.worker_wait),
+        "-u", str(args.users), "-r", str(args.spawn_rate), "-t", args.run_time,
+        "--csv", os.path.abspath(args.csv), *extra,
+    ))
+    procs = [master]
+    worker_args = ["-f", args.locustfile, "--worker", "--master-port", str(args.master_port)]
+    for _ in range(args.workers):
+        procs.append(start(locust_cmd(*worker_args, "--master-host", "127.0.0.1")))
+    for host, count in remotes:
+        remote = " ".join(
+            shlex.quote(a) for a in [args.remote_python, "-m", "locust", *worker_args, "--master-host", args.master_host]
+        )
+        for _ in range(count):
+            # -tt so the remote worker dies with the ssh session
+            procs.append(start(["ssh", "-tt", host, f"cd {shlex.quote(args.remote_dir)}/performance_testing && {remote}"],
+                               stdin=subprocess.DEVNULL))
+    print(f"Started master and {expected} workers ({args.workers} local, {expected - args.workers} remote)")
+
+    interrupted = False
+    try:
+        while master.poll() is None:
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        interrupted = True
+        print("Interrupted, stopping the test")
+    finally:
+        # The master tells its workers to quit; anything still running after that is stopped here
+        stop(procs)
+
+    row = read_aggregated(os.path.abspath(args.csv))
+    if row:
+        print(
+            f"Aggregated: {row['Request Count']} requests, {row['Failure Count']} failures, "
+            f"{float(row['Requests/s']):.1f} req/s, median {row['50%']} ms, p95 {row['95%']} ms, p99 {row['99%']} ms"
+        )
+        print(f"Stats written to {os.path.abspath(args.csv)}_stats.csv")
+    return 130 if interrupted else master.returncode
+
+
+if __name__ == "__main__":
+    sys.exit(main())
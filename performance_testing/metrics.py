@@ -0,0 +1,190 @@
+# Per-endpoint latency histograms (hdr.py) for every request of a run, in
+# fixed memory however long it lasts:
+# - served as OpenMetrics on http://127.0.0.1:<--metrics-port>/metrics while
+#   the run is going (master or standalone runner only),
+# - written every --hdr-interval seconds to an HdrHistogram log (--hdr-log),
+#   one compressed interval histogram per endpoint,
+# - summarised with exact p50..p99.99 when Locust quits.
+#
+# Workers ship their interval histograms to the master with each stats report.
+# Imported by the locustfiles.
+import os
+import time
+
+import gevent
+from gevent.pywsgi import WSGIServer
+from locust import events
+from locust.runners import WorkerRunner
+
+from hdr import HdrHistogram, HistogramLogWriter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+QUANTILES = (50, 90, 95, 99, 99.9, 99.99)
+
+
+def labels(key):
+    method, _, name = key.partition(" ")
+    name = name.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",name="{name}"'
+
+
+class HdrMetrics:
+    def __init__(self):
+        self.interval = {}
+        self.cumulative = {}
+        self.failures = {}
+        self.failure_totals = {}
+        self.interval_started = time.time()
+
+    def histogram(self, histograms, key):
+        if key not in histograms:
+            histograms[key] = HdrHistogram()
+        return histograms[key]
+
+    def record(self, key, response_time_ms, failed):
+        self.histogram(self.interval, key).record(response_time_ms * 1000)
+        if failed:
+            self.failures[key] = self.failures.get(key, 0) + 1
+
+    # Sent from workers to the master
+    def take_interval(self):
+        data = {
+            "histograms": {key: (h.sparse(), h.max_value) for key, h in self.interval.items() if h.total_count},
+            "failures": self.failures,
+        }
+        self.interval = {}
+        self.failures = {}
+        return data
+
+    def add_interval(self, data):
+        for key, (pairs, max_value) in data["histograms"].items():
+            self.histogram(self.interval, key).add_sparse(pairs, max_value)
+        for key, count in data["failures"].items():
+            self.failures[key] = self.failures.get(key, 0) + count
+
+    # Moves the current interval into the totals, logging it first
+    def roll(self, log=None):
+        now = time.time()
+        for key, histogram in self.interval.items():
+            if not histogram.total_count:
+                continue
+            if log:
+                log.write(histogram, self.interval_started, now, tag=key)
+            self.histogram(self.cumulative, key).add(histogram)
+            histogram.reset()
+        for key, count in self.failures.items():
+            self.failure_totals[key] = self.failure_totals.get(key, 0) + count
+        self.failures = {}
+        self.interval_started = now
+
+    def openmetrics(self):
+        lines = [
+            "# TYPE locust_request_latency_seconds summary",
+            "# UNIT locust_request_latency_seconds seconds",
+            "# HELP locust_request_latency_seconds Response time per endpoint, from HDR histograms",
+        ]
+        for key, histogram in sorted(self.cumulative.items()):
+            for quantile, value in histogram.values_at_percentiles(QUANTILES).items():
+                lines.append(f'locust_request_latency_seconds{{{labels(key)},quantile="{quantile / 100:g}"}} {value / 1e6}')
+            lines.append(f"locust_request_latency_seconds_sum{{{labels(key)}}} {histogram.total / 1e6}")
+            lines.append(f"locust_request_latency_seconds_count{{{labels(key)}}} {histogram.total_count}")
+        lines += [
+            "# TYPE locust_request_latency_max_seconds gauge",
+            "# HELP locust_request_latency_max_seconds Slowest response per endpoint",
+        ]
+        for key, histogram in sorted(self.cumulative.items()):
+            lines.append(f"locust_request_latency_max_seconds{{{labels(key)}}} {histogram.max_value / 1e6}")
+        lines += ["# TYPE locust_request_failures counter", "# HELP locust_request_failures Failed requests per endpoint"]
+        for key, count in sorted(self.failure_totals.items()):
+            lines.append(f"locust_request_failures_total{{{labels(key)}}} {count}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def report_lines(self):
+        header = " ".join(f"{'p' + format(q, 'g'):>9}" for q in QUANTILES)
+        lines = [f"{'endpoint':<32} {'count':>8} {header} {'max':>9}  (ms)"]
+        for key, histogram in sorted(self.cumulative.items()):
+            values = histogram.values_at_percentiles(QUANTILES)
+            cells = " ".join(f"{values[q] / 1000:>9.1f}" for q in QUANTILES)
+            lines.append(f"{key:<32} {histogram.total_count:>8} {cells} {histogram.max_value / 1000:>9.1f}")
+        return lines
+
+
+METRICS = HdrMetrics()
+
+
+@events.init_command_line_parser.add_listener
+def _(parser):
+    parser.add_argument("--metrics-port", type=int, default=int(os.environ.get("METRICS_PORT", "9646")),
+                        help="Serve OpenMetrics on this port while running (0: off)")
+    parser.add_argument("--hdr-log", default=os.path.join(HERE, "results", time.strftime("hdr-%Y%m%d-%H%M%S.hlog")),
+                        help="HdrHistogram interval log ('' to not write one)")
+    parser.add_argument("--hdr-interval", type=float, default=5, help="Seconds per logged interval")
+
+
+@events.request.add_listener
+def _(request_type, name, response_time, exception=None, **kwargs):
+    METRICS.record(f"{request_type} {name}", response_time, exception is not None)
+
+
+@events.report_to_master.add_listener
+def _(client_id, data):
+    data["hdr"] = METRICS.take_interval()
+
+
+@events.worker_report.add_listener
+def _(client_id, data):
+    if "hdr" in data:
+        METRICS.add_interval(data["hdr"])
+
+
+@events.init.add_listener
+def _(environment, **kwargs):
+    options = environment.parsed_options
+    if options is None or isinstance(environment.runner, WorkerRunner):
+        return
+    log = None
+    if options.hdr_log:
+        os.makedirs(os.path.dirname(os.path.abspath(options.hdr_log)), exist_ok=True)
+        log = HistogramLogWriter(options.hdr_log)
+    METRICS.interval_started = log.start_time if log else time.time()
+
+    def roll_periodically():
+        while True:
+            gevent.sleep(options.hdr_interval)
+            METRICS.roll(log)
+
+    roller = gevent.spawn(roll_periodically)
+
+    if options.metrics_port:
+        def app(env, start_response):
+            if env["PATH_INFO"] != "/metrics":
+                start_response("404 Not Found", [("Content-Type", "text/plain")])
+                return [b"not found\n"]
+            body = METRICS.openmetrics().encode()
+            start_response("200 OK", [("Content-Type", "application/openmetrics-text; version=1.0.0; charset=utf-8")])
+            return [body]
+
+        try:
+            server = WSGIServer(("127.0.0.1", options.metrics_port), app, log=None)
+            server.start()
+            print(f"OpenMetrics on http://127.0.0.1:{options.metrics_port}/metrics")
+        except OSError as e:
+            print(f"Could not serve metrics on port {options.metrics_port}: {e}")
+            server = None
+    else:
+        server = None
+
+    @environment.events.quitting.add_listener
+    def _(environment, **kw):
+        roller.kill()
+        # A master still gets the workers' last reports before quitting
+        METRICS.roll(log)
+        if server:
+            server.stop(timeout=1)
+        if log:
+            log.close()
+        if METRICS.cumulative:
+            print("\n".join(METRICS.report_lines()))
+            if log:
+                print(f"HDR interval log: {options.hdr_log}")
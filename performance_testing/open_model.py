@@ -0,0 +1,190 @@
+import os
+import random
+import sys
+import time
+from urllib.parse import urlencode
+
+import gevent
+from gevent.pool import Pool
+from locust import FastHttpUser, constant, events, task
+from locust.runners import WorkerRunner
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from hdr import HdrHistogram  # noqa: E402
+from journeys import BUYERS, CATALOG, ENV  # noqa: E402
+import metrics  # noqa: E402,F401  HDR latency histograms, OpenMetrics endpoint and histogram logs
+import results  # noqa: E402,F401  records every run in the result store
+
+# Open-model shopper: each user issues requests on a fixed schedule of
+# --arrival-rate requests per second, whether or not earlier responses have
+# come back, so a slow server does not slow the load down. Each request's
+# latency is measured from when it was scheduled to be sent, not from when
+# it actually went out (no coordinated omission), and that is the time
+# Locust's stats see. Corrected and service times are also kept in HDR
+# histograms, shipped from workers to the master with their stats reports,
+# and printed at the end.
+#
+# LAZYLIZARD_ENV=local locust -f performance_testing/open_model.py --headless -u 20 --arrival-rate 5 -t 5m
+# (total arrival rate = users x --arrival-rate; load_profiles.json's arrival-rate shape sizes users the same way)
+# The open-model mix has no order placement, so gate it with its own SLO file: -f open_model.py,slo.py --slo-file ...
+
+
+# Both histograms per "METHOD name", in microseconds
+class LatencyRecorder:
+    def __init__(self):
+        self.corrected = {}
+        self.service = {}
+
+    def histograms(self, key):
+        if key not in self.corrected:
+            self.corrected[key] = HdrHistogram()
+            self.service[key] = HdrHistogram()
+        return self.corrected[key], self.service[key]
+
+    def record(self, key, corrected_us, service_us):
+        corrected, service = self.histograms(key)
+        corrected.record(corrected_us)
+        service.record(service_us)
+
+    # Sent from workers to the master: everything recorded since the last report
+    def take(self):
+        data = {
+            key: [(h.sparse(), h.max_value) for h in (self.corrected[key], self.service[key])]
+            for key in self.corrected
+        }
+        self.corrected = {}
+        self.service = {}
+        return data
+
+    def add(self, data):
+        for key, pairs in data.items():
+            for histogram, (sparse, max_value) in zip(self.histograms(key), pairs):
+                histogram.add_sparse(sparse, max_value)
+
+    def report_lines(self):
+        lines = [f"{'endpoint':<32} {'count':>7} {'p50':>15} {'p99':>15} {'p99.9':>15} {'max':>15}  (ms, intended/service)"]
+        for key in sorted(self.corrected):
+            corrected, service = self.corrected[key], self.service[key]
+            cells = [
+                f"{corrected.value_at_percentile(p) / 1000:>7.1f}/{service.value_at_percentile(p) / 1000:<7.1f}"
+                for p in (50, 99, 99.9, 100)
+            ]
+            lines.append(f"{key:<32} {corrected.total_count:>7} {' '.join(cells)}")
+        return lines
+
+
+RECORDER = LatencyRecorder()
+
+
+# Stands in for the request event on the open-model users' client: requests
+# sent with context["intended_at"] get their response time measured from then
+class IntendedTimeRequestEvent:
+    def __init__(self, request_event, recorder):
+        self.request_event = request_event
+        self.recorder = recorder
+
+    def fire(self, **meta):
+        intended_at = meta.get("context", {}).get("intended_at")
+        if intended_at is not None:
+            service_ms = meta["response_time"]
+            meta["response_time"] = (time.perf_counter() - intended_at) * 1000
+            self.recorder.record(
+                f"{meta['request_type']} {meta['name']}", meta["response_time"] * 1000, service_ms * 1000
+            )
+        self.request_event.fire(**meta)
+
+
+def view_product():
+    product = CATALOG.pick_product()
+    return ENV.path(f"product/{product['id']}"), ENV.path("product/[id]"), "GET", None
+
+
+def browse():
+    return f"{ENV.path('products')}?{urlencode({'page': random.randint(1, 5)})}", ENV.path("products"), "GET", None
+
+
+def search():
+    query = urlencode({"q": CATALOG.pick_search_term()})
+    return f"{ENV.path('products')}?{query}", ENV.path("products?q=[term]"), "GET", None
+
+
+def add_to_cart():
+    product = CATALOG.pick_product()
+    body = {"product_id": product["id"], "quantity": CATALOG.pick_quantity(product)}
+    return ENV.path("cart/add"), ENV.path("cart/add"), "POST", body
+
+
+def page(route):
+    return lambda: (ENV.path(route), ENV.path(route), "GET", None)
+
+
+# Request mix per arrival, roughly that of the closed-model journeys
+ARRIVALS = {view_product: 10, browse: 3, search: 3, add_to_cart: 3, page("cart"): 2, page("checkout"): 1, page("orders"): 2}
+
+
+@events.init_command_line_parser.add_listener
+def _(parser):
+    parser.add_argument("--arrival-rate", type=float, default=float(os.environ.get("ARRIVAL_RATE", "1")),
+                        help="Requests per second scheduled by each open-model user")
+    parser.add_argument("--arrivals", choices=["constant", "poisson"], default="poisson",
+                        help="Even spacing, or exponential gaps with the same mean")
+    parser.add_argument("--max-in-flight", type=int, default=100, help="Outstanding requests per open-model user")
+
+
+class OpenModelShopper(FastHttpUser):
+    host = ENV.base_url
+    wait_time = constant(0)
+    max_retries = 0
+
+    def __init__(self, environment):
+        options = environment.parsed_options
+        self.rate = options.arrival_rate
+        self.poisson = options.arrivals == "poisson"
+        self.concurrency = options.max_in_flight
+        super().__init__(environment)
+        # Keep the session FastHttpUser built (host, TLS, redirects, headers); only its event changes
+        self.client.request_event = IntendedTimeRequestEvent(self.client.request_event, RECORDER)
+        self.in_flight = Pool(options.max_in_flight)
+        self.actions, self.weights = zip(*ARRIVALS.items())
+
+    def on_start(self):
+        username, password = BUYERS.next()
+        self.client.post(ENV.path("login"), data={"username": username, "password": password, "login": ""})
+
+    def on_stop(self):
+        self.in_flight.kill()
+
+    def send(self, intended_at):
+        url, name, method, body = random.choices(self.actions, self.weights)[0]()
+        self.client.request(method, url, name=name, json=body, context={"intended_at": intended_at})
+
+    @task
+    def schedule(self):
+        intended_at = time.perf_counter()
+        while True:
+            # Never wait on responses here; if every slot is busy, spawn blocks,
+            # but the latency is still counted from intended_at
+            self.in_flight.spawn(self.send, intended_at)
+            intended_at += random.expovariate(self.rate) if self.poisson else 1 / self.rate
+            delay = intended_at - time.perf_counter()
+            if delay > 0:
+                gevent.sleep(delay)
+
+
+@events.report_to_master.add_listener
+def _(client_id, data):
+    data["open_model"] = RECORDER.take()
+
+
+@events.worker_report.add_listener
+def _(client_id, data):
+    if "open_model" in data:
+        RECORDER.add(data["open_model"])
+
+
+@events.quitting.add_listener
+def _(environment, **kwargs):
+    # The master (or a standalone runner) prints what every worker sent
+    if not RECORDER.corrected or isinstance(environment.runner, WorkerRunner):
+        return
+    print("\n".join(RECORDER.report_lines()))
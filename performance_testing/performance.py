@@ -1,22 +1,25 @@
-from locust import HttpUser, task, between
+import os
+import sys
 
-class Shopper(HttpUser):
-    wait_time = between(1, 5)
+from locust import HttpUser
 
-    @task(1)
-    def browse_products(self):
-        self.client.get("/en/products")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from journeys import ENV, ShopperBehaviour, pacing_from_env  # noqa: E402
+import slo  # noqa: E402,F401  registers --slo-file and the end-of-run SLO gate
+import metrics  # noqa: E402,F401  HDR latency histograms, OpenMetrics endpoint and histogram logs
+import results  # noqa: E402,F401  records every run in the result store
 
-    @task(2)
-    def add_to_cart(self):
-        self.client.post("/en/cart/add", json={"product_id": 1, "quantity": 1})
 
-    @task(1)
-    def view_cart(self):
-        self.client.get("/en/cart")
+# Logged-in shopper running browse, search, purchase and order-history journeys.
+# Products and quantities come from catalog.csv with Zipf-like popularity.
+class Shopper(HttpUser):
+    host = ENV.base_url
+    wait_time = pacing_from_env()
+    tasks = [ShopperBehaviour]
 
-    @task(1)
-    def checkout(self):
-        self.client.get("/en/checkout")
+    def on_start(self):
+        self.cart = {}
 
-# locust -f locustfile.py --host=https://lazylizard.click
+# LAZYLIZARD_ENV=production locust -f performance_testing/performance.py
+# Distributed over every core: python performance_testing/launcher.py -u 500 -r 50 -t 10m
+# Load shapes (load_profiles.json): locust -f performance_testing/performance.py,performance_testing/shapes.py --headless --load-profile spike
@@ -0,0 +1,244 @@
+# Keeps the history of Locust runs in SQLite: every run stores its
+# per-endpoint throughput, percentiles and full response time histogram.
+# The compare command tests a run against a named baseline with a
+# Mann-Whitney U test on those histograms.
+#
+# Runs are recorded automatically by the locustfiles (see --results-db, --run-label).
+#
+# python performance_testing/results.py list
+# python performance_testing/results.py baseline release-1.4 12
+# python performance_testing/results.py compare --baseline release-1.4        (latest run)
+# python performance_testing/results.py compare 15 --baseline release-1.4 --alpha 0.01
+import argparse
+import math
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+
+from locust import events
+from locust.runners import WorkerRunner
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB = os.environ.get("PERF_RESULTS_DB", os.path.join(HERE, "results", "results.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started REAL, finished REAL, label TEXT, locustfile TEXT, host TEXT, users INTEGER, git_commit TEXT
+);
+CREATE TABLE IF NOT EXISTS endpoints (
+    run_id INTEGER REFERENCES runs(id), method TEXT, name TEXT,
+    requests INTEGER, failures INTEGER, rps REAL, avg_ms REAL, p50_ms INTEGER, p95_ms INTEGER, p99_ms INTEGER,
+    max_ms REAL,
+    PRIMARY KEY (run_id, method, name)
+);
+CREATE TABLE IF NOT EXISTS histograms (
+    run_id INTEGER REFERENCES runs(id), method TEXT, name TEXT, ms INTEGER, count INTEGER
+);
+CREATE INDEX IF NOT EXISTS histograms_endpoint ON histograms (run_id, method, name);
+CREATE TABLE IF NOT EXISTS baselines (
+    name TEXT PRIMARY KEY, run_id INTEGER REFERENCES runs(id)
+);
+"""
+
+
+def connect(path=DEFAULT_DB):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    db = sqlite3.connect(path)
+    db.executescript(SCHEMA)
+    return db
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_run(db, stats, started, label=None, locustfile=None, host=None, users=None):
+    with db:
+        run_id = db.execute(
+            "INSERT INTO runs (started, finished, label, locustfile, host, users, git_commit) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (started, time.time(), label, locustfile, host, users, git_commit()),
+        ).lastrowid
+        for (name, method), entry in stats.entries.items():
+            if not entry.num_requests:
+                continue
+            db.execute(
+                "INSERT INTO endpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id, method, name, entry.num_requests, entry.num_failures, entry.total_rps,
+                    entry.avg_response_time, entry.get_response_time_percentile(0.5),
+                    entry.get_response_time_percentile(0.95), entry.get_response_time_percentile(0.99),
+                    entry.max_response_time,
+                ),
+            )
+            db.executemany(
+                "INSERT INTO histograms VALUES (?, ?, ?, ?, ?)",
+                [(run_id, method, name, ms, count) for ms, count in entry.response_times.items()],
+            )
+    return run_id
+
+
+def histogram(db, run_id, method, name):
+    rows = db.execute("SELECT ms, count FROM histograms WHERE run_id = ? AND method = ? AND name = ?", (run_id, method, name))
+    return dict(rows)
+
+
+# Mann-Whitney U on two histograms ({ms: count}), with the normal
+# approximation and tie correction. Returns (probability that a sample of
+# `a` is slower than one of `b`, two-sided p-value).
+def mann_whitney(a, b):
+    n1, n2 = sum(a.values()), sum(b.values())
+    n = n1 + n2
+    if not n1 or not n2:
+        return None, None
+    rank_sum_a = 0.0
+    ties = 0.0
+    seen = 0
+    for ms in sorted(set(a) | set(b)):
+        count = a.get(ms, 0) + b.get(ms, 0)
+        mid_rank = seen + (count + 1) / 2
+        rank_sum_a += a.get(ms, 0) * mid_rank
+        ties += count**3 - count
+        seen += count
+    u = rank_sum_a - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1))) if n > 1 else 0
+    if variance <= 0:
+        return u / (n1 * n2), 1.0
+    z = (u - n1 * n2 / 2) / math.sqrt(variance)
+    return u / (n1 * n2), math.erfc(abs(z) / math.sqrt(2))
+
+
+def compare(db, run_id, baseline_id, alpha=0.01, threshold=0.10, min_ms=5):
+    rows = []
+    for method, name, requests, failures, p50, p95, p99 in db.execute(
+        "SELECT method, name, requests, failures, p50_ms, p95_ms, p99_ms FROM endpoints WHERE run_id = ? ORDER BY name",
+        (run_id,),
+    ).fetchall():
+        base = db.execute(
+            "SELECT requests, failures, p50_ms, p95_ms, p99_ms FROM endpoints WHERE run_id = ? AND method = ? AND name = ?",
+            (baseline_id, method, name),
+        ).fetchone()
+        if base is None:
+            rows.append({"endpoint": f"{method} {name}", "verdict": "new", "p95": p95})
+            continue
+        ours, theirs = histogram(db, run_id, method, name), histogram(db, baseline_id, method, name)
+        slower, p_value = mann_whitney(ours, theirs)
+        delta = (p95 - base[3]) / base[3] if base[3] else 0.0
+        verdict = "same"
+        if p_value is not None and p_value < alpha:
+            # Significant shift; only call it a regression when it also matters at p95
+            change = p95 - base[3]
+            if slower > 0.5 and delta > threshold and change >= min_ms:
+                verdict = "REGRESSED"
+            elif slower < 0.5 and delta < -threshold and -change >= min_ms:
+                verdict = "improved"
+        rows.append({
+            "endpoint": f"{method} {name}", "verdict": verdict, "p50": p50, "p95": p95, "p99": p99,
+            "base_p50": base[2], "base_p95": base[3], "base_p99": base[4], "delta": delta, "p_value": p_value,
+            "error_rate": failures / requests, "base_error_rate": base[1] / base[0],
+        })
+    return rows
+
+
+def print_table(rows):
+    print(f"{'endpoint':<32} {'p50':^11} {'p95':^11} {'p99':^11} {'Δp95':>7} {'p-value':>8} {'errors':^13}  verdict")
+    for r in rows:
+        if r["verdict"] == "new":
+            print(f"{r['endpoint']:<32} {'':>11} {r['p95']:>11} {'':>11} {'':>7} {'':>8} {'':>13}  new")
+            continue
+        p_value = "-" if r["p_value"] is None else f"{r['p_value']:.3g}"
+        print(
+            f"{r['endpoint']:<32} {r['base_p50']:>5}→{r['p50']:<5} {r['base_p95']:>5}→{r['p95']:<5} "
+            f"{r['base_p99']:>5}→{r['p99']:<5} {r['delta']:>+7.0%} {p_value:>8} "
+            f"{r['base_error_rate']:>6.1%}→{r['error_rate']:<6.1%}  {r['verdict']}"
+        )
+
+
+@events.init_command_line_parser.add_listener
+def _(parser):
+    parser.add_argument("--results-db", default=DEFAULT_DB, help="SQLite result store ('' to not record the run)")
+    parser.add_argument("--run-label", default=os.environ.get("PERF_RUN_LABEL"), help="Label stored with the run")
+
+
+@events.init.add_listener
+def _(environment, **kwargs):
+    options = environment.parsed_options
+    if options is None or not options.results_db or isinstance(environment.runner, WorkerRunner):
+        return
+    started = [time.time()]
+
+    @environment.events.test_start.add_listener
+    def _(**kw):
+        started[0] = time.time()
+
+    @environment.events.quitting.add_listener
+    def _(environment, **kw):
+        if not environment.stats.total.num_requests:
+            return
+        db = connect(options.results_db)
+        run_id = save_run(
+            db, environment.stats, started[0], label=options.run_label, locustfile=options.locustfile,
+            host=environment.host, users=options.num_users,
+        )
+        db.close()
+        print(f"Recorded run {run_id} in {options.results_db}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Locust result store")
+    parser.add_argument("--db", default=DEFAULT_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List recorded runs")
+    baseline = commands.add_parser("baseline", help="Name a run as a baseline")
+    baseline.add_argument("name")
+    baseline.add_argument("run_id", type=int)
+    diff = commands.add_parser("compare", help="Compare a run (default: latest) against a baseline")
+    diff.add_argument("run_id", type=int, nargs="?")
+    diff.add_argument("--baseline", required=True)
+    diff.add_argument("--alpha", type=float, default=0.01, help="Significance level")
+    diff.add_argument("--threshold", type=float, default=0.10, help="Minimum relative p95 change that counts")
+    diff.add_argument("--min-ms", type=int, default=5, help="Minimum absolute p95 change that counts")
+    args = parser.parse_args(argv)
+
+    db = connect(args.db)
+    if args.command == "list":
+        names = {}
+        for name, run_id in db.execute("SELECT name, run_id FROM baselines"):
+            names.setdefault(run_id, []).append(name)
+        for run_id, started, label, locustfile, users, commit, requests in db.execute(
+            "SELECT r.id, r.started, r.label, r.locustfile, r.users, r.git_commit, SUM(e.requests) "
+            "FROM runs r LEFT JOIN endpoints e ON e.run_id = r.id GROUP BY r.id ORDER BY r.id"
+        ):
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(started))
+            tags = f" [{', '.join(names[run_id])}]" if run_id in names else ""
+            print(f"{run_id:>4}  {when}  {commit or '-':<8} {users or '-':>5} users {requests or 0:>8} requests  "
+                  f"{locustfile or ''} {label or ''}{tags}")
+        return 0
+
+    if args.command == "baseline":
+        if db.execute("SELECT 1 FROM runs WHERE id = ?", (args.run_id,)).fetchone() is None:
+            parser.error(f"no run {args.run_id}")
+        with db:
+            db.execute("INSERT OR REPLACE INTO baselines VALUES (?, ?)", (args.name, args.run_id))
+        print(f"Baseline {args.name} is run {args.run_id}")
+        return 0
+
+    row = db.execute("SELECT run_id FROM baselines WHERE name = ?", (args.baseline,)).fetchone()
+    if row is None:
+        parser.error(f"no baseline named {args.baseline}")
+    run_id = args.run_id or db.execute("SELECT MAX(id) FROM runs").fetchone()[0]
+    print(f"Run {run_id} against baseline {args.baseline} (run {row[0]})")
+    rows = compare(db, run_id, row[0], args.alpha, args.threshold, args.min_ms)
+    print_table(rows)
+    return 1 if any(r["verdict"] == "REGRESSED" for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+# Load shapes for the Shopper runs, configured from load_profiles.json:
+#
+#   step          start_users, growing by step_users every step_seconds for `steps` steps
+#   spike         base_users, a spike to spike_users for spike_seconds, then back to base for recovery_seconds
+#   soak          ramp up to `users` over ramp_seconds and hold for hold_seconds
+#   arrival-rate  stages of {rate, seconds}: enough users to run `rate` tasks per second, each user
+#                 running per_user_rate tasks per second (pair with SHOPPER_PACING=constant-throughput:<per_user_rate>).
+#                 Pacing applies between tasks, i.e. journey steps, so a journey takes several of them.
+#
+# Every stage's p95 and error rate are reported when the run ends, and the first
+# stage crossing the "knee" thresholds is marked.
+#
+# locust -f performance_testing/performance.py,performance_testing/shapes.py --headless --load-profile step
+import json
+import math
+import os
+import time
+
+from locust import LoadTestShape, events
+
+from slo import Sample
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROFILES_FILE = os.path.join(HERE, "load_profiles.json")
+
+
+# A shape made of stages: (seconds, users, spawn rate)
+class StagedShape(LoadTestShape):
+    abstract = True
+
+    def __init__(self, stages=()):
+        super().__init__()
+        self.stages = list(stages)
+        self.stage_index = None
+
+    def on_stage(self, index, users):
+        pass
+
+    def tick(self):
+        elapsed = self.get_run_time()
+        for index, (seconds, users, spawn_rate) in enumerate(self.stages):
+            if elapsed < seconds:
+                if index != self.stage_index:
+                    self.stage_index = index
+                    self.on_stage(index, users)
+                return users, spawn_rate
+            elapsed -= seconds
+        return None
+
+
+# Stage lists per profile "shape"; ProfileShape below is the one shape class
+# Locust runs, and it plays whichever of these the profile names
+def step_stages(profile):
+    rate = profile.get("spawn_rate", profile["step_users"])
+    return [
+        (profile["step_seconds"], profile["start_users"] + step * profile["step_users"], rate)
+        for step in range(profile["steps"])
+    ]
+
+
+def spike_stages(profile):
+    rate = profile.get("spawn_rate", profile["spike_users"])
+    return [
+        (profile["warmup_seconds"], profile["base_users"], rate),
+        (profile["spike_seconds"], profile["spike_users"], rate),
+        (profile["recovery_seconds"], profile["base_users"], rate),
+    ]
+
+
+def soak_stages(profile):
+    ramp = max(profile["ramp_seconds"], 1)
+    return [(ramp, profile["users"], profile["users"] / ramp), (profile["hold_seconds"], profile["users"], 1)]
+
+
+def arrival_rate_stages(profile):
+    per_user = profile.get("per_user_rate", 1)
+    stages = []
+    for stage in profile["stages"]:
+        users = max(1, math.ceil(stage["rate"] / per_user))
+        stages.append((stage["seconds"], users, stage.get("spawn_rate", users)))
+    return stages
+
+
+SHAPES = {"step": step_stages, "spike": spike_stages, "soak": soak_stages, "arrival-rate": arrival_rate_stages}
+
+
+def load_profile(name, path=PROFILES_FILE):
+    with open(path) as f:
+        spec = json.load(f)
+    if name not in spec["profiles"]:
+        raise ValueError(f"Unknown load profile {name!r} in {path}; available: {', '.join(spec['profiles'])}")
+    profile = spec["profiles"][name]
+    return SHAPES[profile["shape"]](profile), spec.get("knee", {})
+
+
+# Collects p95, error rate and throughput per stage and finds the first
+# stage over the knee thresholds
+class KneeTracker:
+    def __init__(self, stats, thresholds):
+        self.stats = stats
+        self.thresholds = thresholds
+        self.stages = []
+        self.current = None
+
+    def sample(self):
+        return Sample.of_entry(self.stats.total, time.time())
+
+    def start_stage(self, users):
+        self.close_stage()
+        self.current = (users, self.sample())
+
+    def close_stage(self):
+        if self.current is None:
+            return
+        users, started = self.current
+        window = self.sample().minus(started)
+        self.current = None
+        if not window.requests:
+            return
+        self.stages.append({
+            "users": users,
+            "seconds": window.seconds,
+            "requests": window.requests,
+            "rps": window.actual("min_rps"),
+            "p95_ms": window.actual("p95_ms"),
+            "error_rate": window.actual("max_error_rate"),
+        })
+
+    # Index into self.stages of the first stage over a threshold; spike and soak
+    # profiles revisit the same user count, so the stage is identified by position
+    def knee(self):
+        for index, stage in enumerate(self.stages):
+            if stage["p95_ms"] > self.thresholds.get("p95_ms", math.inf):
+                return index, "p95_ms"
+            if stage["error_rate"] > self.thresholds.get("error_rate", math.inf):
+                return index, "error_rate"
+        return None, None
+
+    def report(self):
+        index, reason = self.knee()
+        return {
+            "thresholds": self.thresholds,
+            "stages": self.stages,
+            "knee_stage": index,
+            "knee_users": None if index is None else self.stages[index]["users"],
+            "knee_reason": reason,
+        }
+
+
+class ProfileShape(StagedShape):
+    def __init__(self):
+        super().__init__()
+        self.tracker = None
+
+    def tick(self):
+        if self.tracker is None:
+            environment = self.runner.environment
+            options = environment.parsed_options
+            self.stages, thresholds = load_profile(options.load_profile, options.load_profiles_file)
+            self.tracker = environment.knee_tracker = KneeTracker(environment.stats, thresholds)
+        return super().tick()
+
+    def on_stage(self, index, users):
+        self.tracker.start_stage(users)
+
+
+@events.init_command_line_parser.add_listener
+def _(parser):
+    parser.add_argument("--load-profile", default=os.environ.get("LOAD_PROFILE", "step"))
+    parser.add_argument("--load-profiles-file", default=PROFILES_FILE)
+    parser.add_argument("--shape-report", default=os.path.join(HERE, "results", "shape_report.json"))
+
+
+@events.quitting.add_listener
+def _(environment, **kwargs):
+    tracker = getattr(environment, "knee_tracker", None)
+    if tracker is None:
+        return
+    tracker.close_stage()
+    report = tracker.report()
+    path = environment.parsed_options.shape_report
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'users':>6} {'seconds':>8} {'req/s':>8} {'p95 ms':>7} {'errors':>7}")
+    for index, stage in enumerate(report["stages"]):
+        mark = f"  <- knee ({report['knee_reason']})" if index == report["knee_stage"] else ""
+        print(
+            f"{stage['users']:>6} {stage['seconds']:>8.0f} {stage['rps']:>8.1f} {stage['p95_ms']:>7} "
+            f"{stage['error_rate']:>7.1%}{mark}"
+        )
+    if report["knee_stage"] is None:
+        print("No knee point: every stage stayed within the thresholds")
@@ -0,0 +1,180 @@
+# Pass/fail gates for Locust runs. Limits per endpoint come from slo.json
+# (or --slo-file). They are checked on the whole run when Locust quits and,
+# with --slo-window, on every window of that many seconds while it runs.
+# Any breach makes locust exit with code 1; the verdict is written to
+# --slo-report as JSON.
+#
+# Imported by the locustfiles; only the master (or a standalone runner) checks.
+import json
+import os
+import time
+
+import gevent
+from locust import events
+from locust.runners import WorkerRunner
+from locust.stats import calculate_response_time_percentile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PERCENTILES = {"p50_ms": 0.50, "p95_ms": 0.95, "p99_ms": 0.99}
+
+
+def load_slos(path):
+    with open(path) as f:
+        spec = json.load(f)
+    slos = {}
+    for key, limits in spec["endpoints"].items():
+        method, _, name = key.partition(" ")
+        slos[(name, method)] = limits
+    return slos
+
+
+# One measurement of an endpoint: the request count, failure count and
+# response time histogram ({rounded ms: count}) over `seconds`
+class Sample:
+    def __init__(self, requests, failures, response_times, seconds):
+        self.requests = requests
+        self.failures = failures
+        self.response_times = response_times
+        self.seconds = seconds
+
+    @classmethod
+    def of_entry(cls, entry, seconds):
+        return cls(entry.num_requests, entry.num_failures, dict(entry.response_times), seconds)
+
+    def minus(self, earlier):
+        response_times = {
+            ms: count - earlier.response_times.get(ms, 0)
+            for ms, count in self.response_times.items()
+            if count > earlier.response_times.get(ms, 0)
+        }
+        return Sample(
+            self.requests - earlier.requests,
+            self.failures - earlier.failures,
+            response_times,
+            self.seconds - earlier.seconds,
+        )
+
+    def actual(self, metric):
+        if metric in PERCENTILES:
+            successes = sum(self.response_times.values())
+            return calculate_response_time_percentile(self.response_times, successes, PERCENTILES[metric])
+        if metric == "max_error_rate":
+            return self.failures / self.requests if self.requests else 0.0
+        if metric == "min_rps":
+            return self.requests / self.seconds if self.seconds > 0 else 0.0
+        raise ValueError(f"Unknown SLO metric {metric!r}")
+
+
+def check(limits, sample):
+    results = []
+    for metric, limit in limits.items():
+        if not sample.requests:
+            results.append({"metric": metric, "limit": limit, "actual": None, "passed": False})
+            continue
+        actual = sample.actual(metric)
+        passed = actual >= limit if metric.startswith("min_") else actual <= limit
+        results.append({"metric": metric, "limit": limit, "actual": actual, "passed": passed})
+    return results
+
+
+class SloMonitor:
+    def __init__(self, environment, slos, window):
+        self.environment = environment
+        self.slos = slos
+        self.window = window
+        self.started = time.time()
+        self.windows = []
+        self.watcher = None
+
+    # Runs on every test_start: a restarted test (web UI) replaces the watcher
+    # instead of adding a second one that would count every window twice
+    def start(self):
+        self.stop()
+        self.started = time.time()
+        if self.window > 0:
+            self.watcher = gevent.spawn(self.watch)
+
+    def stop(self):
+        if self.watcher is not None:
+            self.watcher.kill()
+            self.watcher = None
+
+    def sample(self, name, method):
+        entry = self.environment.stats.entries.get((name, method))
+        seconds = time.time() - self.started
+        if entry is None:
+            return Sample(0, 0, {}, seconds)
+        return Sample.of_entry(entry, seconds)
+
+    def watch(self):
+        previous = {key: self.sample(*key) for key in self.slos}
+        while True:
+            start = time.time() - self.started
+            gevent.sleep(self.window)
+            current = {key: self.sample(*key) for key in self.slos}
+            breaches = []
+            for key, limits in self.slos.items():
+                window = current[key].minus(previous[key])
+                if not window.requests:
+                    continue
+                # Throughput is only judged over the whole run; a quiet window is not a breach
+                windowed = {m: v for m, v in limits.items() if m != "min_rps"}
+                for result in check(windowed, window):
+                    if not result["passed"]:
+                        breaches.append({"endpoint": f"{key[1]} {key[0]}", **result})
+                        print(f"SLO breach in window: {key[1]} {key[0]} {result['metric']} "
+                              f"{result['actual']:.3g} (limit {result['limit']})")
+            self.windows.append({"start": start, "end": time.time() - self.started, "breaches": breaches})
+            previous = current
+
+    def report(self):
+        endpoints = []
+        for (name, method), limits in self.slos.items():
+            endpoints.append({"endpoint": f"{method} {name}", "checks": check(limits, self.sample(name, method))})
+        passed = all(c["passed"] for e in endpoints for c in e["checks"])
+        passed = passed and not any(w["breaches"] for w in self.windows)
+        return {"passed": passed, "duration": time.time() - self.started, "endpoints": endpoints, "windows": self.windows}
+
+
+@events.init_command_line_parser.add_listener
+def _(parser):
+    parser.add_argument(
+        "--slo-file", default=os.environ.get("SLO_FILE", os.path.join(HERE, "slo.json")),
+        help="Per-endpoint SLOs checked at the end of the run",
+    )
+    parser.add_argument("--slo-report", default=os.path.join(HERE, "results", "slo_report.json"))
+    parser.add_argument("--slo-window", type=float, default=0, help="Also check SLOs every N seconds (0: off)")
+
+
+@events.init.add_listener
+def _(environment, **kwargs):
+    options = environment.parsed_options
+    if options is None or not options.slo_file or isinstance(environment.runner, WorkerRunner):
+        return
+    monitor = SloMonitor(environment, load_slos(options.slo_file), options.slo_window)
+    environment.slo_monitor = monitor
+
+    @environment.events.test_start.add_listener
+    def _(**kw):
+        monitor.start()
+
+    @environment.events.test_stop.add_listener
+    def _(**kw):
+        monitor.stop()
+
+    @environment.events.quitting.add_listener
+    def _(environment, **kw):
+        monitor.stop()
+        report = monitor.report()
+        os.makedirs(os.path.dirname(os.path.abspath(options.slo_report)), exist_ok=True)
+        with open(options.slo_report, "w") as f:
+            json.dump(report, f, indent=2)
+
+        for endpoint in report["endpoints"]:
+            for c in endpoint["checks"]:
+                if not c["passed"]:
+                    actual = "no requests" if c["actual"] is None else f"{c['actual']:.3g}"
+                    print(f"SLO breach: {endpoint['endpoint']} {c['metric']} {actual} (limit {c['limit']})")
+        print(f"SLO verdict: {'PASS' if report['passed'] else 'FAIL'} (report: {options.slo_report})")
+        if not report["passed"]:
+            environment.process_exit_code = 1
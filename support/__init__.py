@@ -0,0 +1 @@
+# Shared helpers for the Selenium suites in functional_testing and ui_ux_testing
@@ -0,0 +1,58 @@
+import json
+import os
+import re
+
+# The slice of test accounts and data owned by one worker
+class WorkerAccounts:
+    def __init__(self, worker_id, credentials, product_id):
+        self.worker_id = worker_id
+        self.credentials = credentials
+        self.product_id = product_id
+
+
+# Hands every parallel worker its own buyer/seller/admin account and product,
+# so workers never share a cart or an order history.
+class AccountAllocator:
+    def __init__(self, accounts):
+        self.accounts = accounts
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def from_credentials(cls, credentials):
+        # A single account per role (the environment's own), enough for a serial run only
+        accounts = {role: [{"username": u, "password": p}] for role, (u, p) in credentials.items()}
+        accounts["products"] = [1]
+        return cls(accounts)
+
+    def allocate(self, worker_id):
+        index = worker_index(worker_id)
+        credentials = {}
+        for role in ("buyer", "seller", "admin"):
+            pool = self.accounts.get(role, [])
+            if index >= len(pool):
+                raise ValueError(
+                    f"Worker {worker_id} needs {role} account #{index + 1} but only "
+                    f"{len(pool)} are configured; add more to the accounts file"
+                )
+            credentials[role] = (pool[index]["username"], pool[index]["password"])
+        products = self.accounts.get("products", [1])
+        if index >= len(products):
+            raise ValueError(
+                f"Worker {worker_id} needs product #{index + 1} but only "
+                f"{len(products)} are configured; add more to the accounts file"
+            )
+        return WorkerAccounts(worker_id, credentials, products[index])
+
+
+# pytest-xdist names its workers gw0, gw1, ...; a serial run is "master"
+def current_worker_id():
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def worker_index(worker_id):
+    match = re.fullmatch(r"gw(\d+)", worker_id)
+    return int(match.group(1)) if match else 0
@@ -0,0 +1,118 @@
+import queue
+import threading
+import time
+
+from selenium import webdriver
+
+
+# Keeps warm Chrome instances around for the whole session and leases them
+# to tests, so the cold browser startup is only paid once per pool slot.
+class BrowserPool:
+    def __init__(self, size=1, factory=None):
+        if size < 1:
+            raise ValueError("Browser pool size must be at least 1")
+        self.size = size
+        self.factory = factory or webdriver.Chrome
+        self.launches = 0
+        self.launch_seconds = 0.0
+        self.leases = 0
+        self._idle = queue.LifoQueue()
+        self._all = []
+        self._window_sizes = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        # Reuse an idle browser first, launch a new one while under the size limit
+        deadline = None if timeout is None else time.monotonic() + timeout
+        driver = None
+        while driver is None:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self._launch_if_room()
+            if driver is None:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"No browser became free within {timeout}s")
+                # Poll so a slot freed by a discarded browser is noticed as well
+                try:
+                    driver = self._idle.get(timeout=0.5)
+                except queue.Empty:
+                    pass
+        with self._lock:
+            self.leases += 1
+        return driver
+
+    def release(self, driver):
+        try:
+            self.reset(driver)
+        except Exception:
+            # A browser that can't be reset is not safe to hand to the next test
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+
+    # Drop a leased browser that is in an unknown state instead of returning it
+    def discard(self, driver):
+        self._discard(driver)
+
+    def reset(self, driver):
+        # Storage is per origin, so clear it before leaving the current page
+        driver.delete_all_cookies()
+        if driver.current_url.startswith("http"):
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        driver.implicitly_wait(0)
+        driver.get("about:blank")
+        # Undo window resizes made by a test for the next lease
+        size = self._window_sizes.get(driver)
+        if size and driver.get_window_size() != size:
+            driver.set_window_size(size["width"], size["height"])
+
+    def saved_seconds(self):
+        # Launches avoided by reuse, priced at the average observed launch time
+        if not self.launches:
+            return 0.0
+        return (self.leases - self.launches) * self.launch_seconds / self.launches
+
+    def close(self):
+        with self._lock:
+            drivers, self._all = self._all, []
+            self._window_sizes.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def _launch_if_room(self):
+        with self._lock:
+            if len(self._all) >= self.size:
+                return None
+            # Reserve the slot before the slow launch so other threads can't overshoot
+            self._all.append(None)
+        started = time.perf_counter()
+        driver = None
+        try:
+            driver = self.factory()
+            size = driver.get_window_size()
+        except Exception:
+            with self._lock:
+                self._all.remove(None)
+            if driver is not None:
+                driver.quit()
+            raise
+        with self._lock:
+            self._all[self._all.index(None)] = driver
+            self._window_sizes[driver] = size
+            self.launches += 1
+            self.launch_seconds += time.perf_counter() - started
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+            self._window_sizes.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
@@ -0,0 +1,41 @@
+from urllib.parse import urlsplit
+
+from selenium import webdriver
+
+PROFILES = ("default", "fast", "headless")
+
+
+# Chrome options for a launch profile. "default" is plain webdriver.Chrome();
+# "fast" trims everything the functional suites don't look at; "headless"
+# renders pages like a real visitor (images, fonts, full load) without a
+# window, for browser users in load tests.
+def chrome_options(profile="default", base_url=None):
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown Chrome profile {profile!r}; choose one of {', '.join(PROFILES)}")
+    options = webdriver.ChromeOptions()
+    if profile == "default":
+        return options
+
+    options.add_argument("--headless=new")
+    options.add_argument("--window-size=1366,900")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--disable-component-update")
+    options.add_argument("--disable-default-apps")
+    options.add_argument("--disable-sync")
+    options.add_argument("--no-first-run")
+    options.add_argument("--mute-audio")
+    if profile == "headless":
+        return options
+
+    options.add_argument("--disable-remote-fonts")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if base_url:
+        # Third-party hosts (analytics, CDNs, ads) fail DNS instantly; the shop itself still resolves
+        host = urlsplit(base_url).hostname
+        options.add_argument(f"--host-resolver-rules=MAP * ~NOTFOUND , EXCLUDE {host}, EXCLUDE localhost")
+    # Return from get() at DOMContentLoaded instead of waiting for every subresource
+    options.page_load_strategy = "eager"
+    return options
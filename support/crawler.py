@@ -0,0 +1,114 @@
+from collections import deque
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+import requests
+
+from support.link_checker import LinkChecker, LinkReport, LinkResult
+
+
+class _LinkExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.links = []
+        self.base = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "base" and attrs.get("href") and self.base is None:
+            self.base = attrs["href"]
+        elif tag == "a" and attrs.get("href"):
+            self.links.append((attrs["href"], "link"))
+        elif tag == "img" and attrs.get("src"):
+            self.links.append((attrs["src"], "image"))
+
+
+class CrawlReport(LinkReport):
+    def __init__(self, results, pages):
+        super().__init__(results)
+        self.pages = pages
+
+    def as_dict(self):
+        report = super().as_dict()
+        report["pages"] = self.pages
+        return report
+
+    def summary(self):
+        return f"Crawled {len(self.pages)} page(s)\n" + super().summary()
+
+
+# Walks same-origin pages breadth-first from start_url and checks every link
+# and image it finds with a LinkChecker. With a LinkCache, pages that answer
+# 304 reuse the links recorded on the previous run instead of being re-parsed.
+# Links are resolved against the URL the page was actually served from (after
+# redirects, or its <base href>), which is cached alongside them.
+class SiteCrawler:
+    def __init__(self, start_url, max_depth=2, max_pages=50, checker=None, cache=None):
+        self.start_url = start_url
+        self.origin = urlsplit(start_url)[:2]
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.cache = cache
+        self.checker = checker or LinkChecker(cache=cache)
+
+    def crawl(self):
+        queue = deque([(self.start_url, 0)])
+        seen = {self.start_url}
+        pages = []
+        page_results = []
+        found = []
+
+        while queue and len(pages) < self.max_pages:
+            url, depth = queue.popleft()
+            result, links, base = self._fetch_page(url)
+            pages.append(url)
+            page_results.append(result)
+
+            for link, kind in links:
+                link = urljoin(base, link).split("#")[0]
+                found.append((link, kind))
+                if (
+                    kind == "link"
+                    and depth < self.max_depth
+                    and urlsplit(link)[:2] == self.origin
+                    and link not in seen
+                ):
+                    seen.add(link)
+                    queue.append((link, depth + 1))
+
+        # Pages were already fetched, only check what is left
+        crawled = set(pages)
+        report = self.checker.check((link, kind) for link, kind in found if link not in crawled)
+        if self.cache:
+            self.cache.save()
+        return CrawlReport(page_results + report.results, pages)
+
+    def _fetch_page(self, url):
+        entry = self.cache.get(url) if self.cache else None
+        # Entries from before the base URL was cached can't resolve their links; refetch those
+        if entry and "base" not in entry:
+            entry = None
+        if entry and "links" in entry and self.cache.is_fresh(entry):
+            return LinkResult(url, {"page"}, status=entry["status"], method="CACHED"), entry["links"], entry["base"]
+
+        headers = self.cache.conditional_headers(entry) if self.cache and entry and "links" in entry else {}
+        try:
+            response = self.checker.session.get(url, headers=headers, timeout=self.checker.timeout)
+        except requests.RequestException as e:
+            return LinkResult(url, {"page"}, error=str(e), method="GET"), [], url
+
+        if response.status_code == 304 and entry:
+            self.cache.touch(url)
+            return LinkResult(url, {"page"}, status=entry["status"], method="GET"), entry["links"], entry["base"]
+
+        links = []
+        base = response.url
+        if "html" in response.headers.get("Content-Type", ""):
+            parser = _LinkExtractor()
+            parser.feed(response.text)
+            links = parser.links
+            if parser.base:
+                base = urljoin(response.url, parser.base)
+        if self.cache:
+            self.cache.put(url, response.status_code, response.headers, links=links, base=base)
+        return LinkResult(url, {"page"}, status=response.status_code, method="GET"), links, base
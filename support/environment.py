@@ -0,0 +1,41 @@
+import json
+import os
+
+PROFILES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "environments.json")
+DEFAULT_PROFILE = "production"
+DEFAULT_TIMEOUTS = {"page_load": 30, "element": 10, "login": 20}
+
+
+# One target environment: where the shop lives and how to talk to it
+class Environment:
+    def __init__(self, name, base_url, locale="en", credentials=None, timeouts=None, stand_in=False):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.locale = locale
+        self.credentials = {role: tuple(pair) for role, pair in (credentials or {}).items()}
+        self.timeouts = dict(DEFAULT_TIMEOUTS, **(timeouts or {}))
+        # Profiles marked stand_in are served by support.fake_shop instead of a real host
+        self.stand_in = stand_in
+
+    def path(self, route=""):
+        # Locale-prefixed path, e.g. path("cart") -> "/en/cart"
+        return f"/{self.locale}/{route.lstrip('/')}"
+
+    def url(self, route=""):
+        return self.base_url + self.path(route)
+
+    def __repr__(self):
+        return f"Environment({self.name!r}, {self.base_url!r})"
+
+
+# Resolution order: explicit argument, LAZYLIZARD_ENV, then the production profile.
+# LAZYLIZARD_BASE_URL (or base_url) overrides the profile's host, e.g. for a regional edge.
+def load_environment(name=None, base_url=None, path=PROFILES_FILE):
+    name = name or os.environ.get("LAZYLIZARD_ENV") or DEFAULT_PROFILE
+    with open(path) as f:
+        profiles = json.load(f)
+    if name not in profiles:
+        raise ValueError(f"Unknown environment {name!r}; choose one of {', '.join(sorted(profiles))}")
+    profile = dict(profiles[name])
+    profile["base_url"] = base_url or os.environ.get("LAZYLIZARD_BASE_URL") or profile["base_url"]
+    return Environment(name, **profile)
@@ -0,0 +1,16 @@
+from selenium.webdriver.support.events import AbstractEventListener
+
+
+# EventFiringWebDriver takes a single listener; this fans the events the
+# suites use out to several (navigation timings, visual regression, ...)
+class ListenerChain(AbstractEventListener):
+    def __init__(self, *listeners):
+        self.listeners = listeners
+
+    def after_navigate_to(self, url, driver):
+        for listener in self.listeners:
+            listener.after_navigate_to(url, driver)
+
+    def after_click(self, element, driver):
+        for listener in self.listeners:
+            listener.after_click(element, driver)
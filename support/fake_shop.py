@@ -0,0 +1,807 @@
+# Local stand-in for the LazyLizard shop. It serves the routes and DOM hooks
+# the Selenium suites and the Locust Shopper use, so both can run without
+# touching production.
+#
+# In-process:  shop = FakeShop(latency_ms=50, error_rate=0.01).start(); ...; shop.stop()
+# Subprocess:  python -m support.fake_shop --port 8765 --latency-ms 50 --error-rate 0.01
+import argparse
+import base64
+import hashlib
+import html
+import itertools
+import json
+import random
+import re
+import secrets
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+ROLE_PASSWORDS = {
+    "buyer_password": "buyer",
+    "seller_password": "seller",
+    "admin_password": "admin",
+    "valid_password": "buyer",
+}
+
+CATEGORIES = ["Electronics", "Books", "Garden", "Toys", "Clothing"]
+
+# 1x1 green PNG
+FAVICON = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+)
+
+
+class ShopState:
+    def __init__(self, product_count=200):
+        self.lock = threading.RLock()
+        self.sessions = {}
+        self.carts = {}
+        self.orders = []
+        self.notifications = []
+        self.users = {}
+        self.order_ids = itertools.count(1)
+        self.product_ids = itertools.count(1)
+        self.products = {}
+        for product_id in range(1, product_count + 1):
+            self.add_product(
+                "seller_username",
+                f"Product {product_id}",
+                round(5 + (product_id * 7.31) % 95, 2),
+                f"Description of product {product_id}.",
+                CATEGORIES[product_id % len(CATEGORIES)],
+            )
+
+    def add_product(self, seller, name, price, description, category):
+        with self.lock:
+            product_id = next(self.product_ids)
+            self.products[product_id] = {
+                "id": product_id,
+                "seller": seller,
+                "name": name,
+                "price": price,
+                "description": description,
+                "category": category,
+                "status": "Pending",
+            }
+            return self.products[product_id]
+
+    def user(self, username, role):
+        with self.lock:
+            return self.users.setdefault(username, {"username": username, "role": role, "banned": False})
+
+    def place_order(self, username, items):
+        with self.lock:
+            order = {
+                "id": next(self.order_ids),
+                "buyer": username,
+                "items": dict(items),
+                "status": "Pending",
+            }
+            self.orders.append(order)
+            # Every seller sees new orders; the stand-in has no per-seller catalogs
+            self.notifications.append(f"New Order #{order['id']} from {username}")
+            return order
+
+
+class FakeShopHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeLazyLizard/1.0"
+    # Headers and body go out in separate writes; without this, keep-alive
+    # clients see an extra ~40ms from Nagle's algorithm and delayed ACKs
+    disable_nagle_algorithm = True
+
+    # Each route is (method, pattern, handler name)
+    ROUTES = [
+        ("GET", r"/", "redirect_home"),
+        ("GET", r"/favicon\.ico", "favicon"),
+        ("GET", r"/static/img/product-(\d+)\.svg", "product_image"),
+        ("GET", r"/en", "redirect_home"),
+        ("GET", r"/en/", "home"),
+        ("GET", r"/en/login", "login_page"),
+        ("POST", r"/en/?", "login"),
+        ("POST", r"/en/login", "login"),
+        ("POST", r"/en/logout", "logout"),
+        ("GET", r"/en/dashboard", "dashboard"),
+        ("GET", r"/en/profile", "dashboard"),
+        ("GET", r"/en/products", "products"),
+        ("GET", r"/en/product/(\d+)", "product"),
+        ("GET", r"/en/cart", "cart"),
+        ("POST", r"/en/cart/add", "cart_add"),
+        ("POST", r"/en/cart/update", "cart_update"),
+        ("POST", r"/en/cart/remove", "cart_remove"),
+        ("GET", r"/en/checkout", "checkout"),
+        ("POST", r"/en/checkout", "checkout_submit"),
+        ("GET", r"/en/orders", "order_history"),
+        ("POST", r"/en/orders", "order_place"),
+        ("GET", r"/en/seller/products", "seller_products"),
+        ("GET", r"/en/seller/products/new", "seller_product_form"),
+        ("POST", r"/en/seller/products/new", "seller_product_save"),
+        ("GET", r"/en/seller/products/(\d+)/edit", "seller_product_form"),
+        ("POST", r"/en/seller/products/(\d+)/edit", "seller_product_save"),
+        ("GET", r"/en/seller/products/(\d+)/delete", "seller_product_delete_confirm"),
+        ("POST", r"/en/seller/products/(\d+)/delete", "seller_product_delete"),
+        ("GET", r"/en/admin/products", "admin_products"),
+        ("POST", r"/en/admin/products/(\d+)", "admin_product_action"),
+        ("GET", r"/en/admin/users", "admin_users"),
+        ("POST", r"/en/admin/users/([\w-]+)", "admin_user_action"),
+        ("GET", r"/en/admin/orders", "admin_orders"),
+        ("POST", r"/en/admin/orders/(\d+)", "admin_order_action"),
+    ]
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_HEAD(self):
+        self._dispatch("GET", head=True)
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    # --- request plumbing ---
+
+    def _dispatch(self, method, head=False):
+        self.head_only = head
+        self.response_cookies = []
+        self.is_json = False
+        self.responded = False
+        # A request whose body was never read leaves it in the socket, in the way of the next request
+        self.body_pending = self.headers.get("Content-Length", "0") != "0"
+        try:
+            self._route(method)
+        except Exception as e:
+            # Bad input (?page=abc, a non-numeric product_id, malformed JSON) is the
+            # client's fault; anything else is ours. Either way the client gets a
+            # response instead of a dropped connection.
+            if self.responded:
+                # Headers are already out; all we can do is close the connection
+                self.close_connection = True
+                raise
+            status = 400 if isinstance(e, (ValueError, KeyError, TypeError)) else 500
+            if status == 500 or self.server.verbose:
+                traceback.print_exc()
+            message = f"{type(e).__name__}: {e}"
+            headers = {}
+            if self.body_pending:
+                self.close_connection = True
+                headers["Connection"] = "close"
+            if self._wants_json():
+                self._send(status, json.dumps({"error": message}), "application/json", headers)
+            else:
+                title = "Bad Request" if status == 400 else "Internal Server Error"
+                self._send(status, self._page(title, f"<h1>{title}</h1><p>{html.escape(message)}</p>"), headers=headers)
+
+    def _route(self, method):
+        url = urlsplit(self.path)
+        self.query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        self.form = self._read_form() if method == "POST" else {}
+
+        shop = self.server.shop
+        if shop.latency_ms or shop.jitter_ms:
+            time.sleep(max(0.0, shop.latency_ms + random.uniform(-shop.jitter_ms, shop.jitter_ms)) / 1000)
+        if shop.error_rate and random.random() < shop.error_rate:
+            return self._send(503, "Service Unavailable (injected)", "text/plain")
+
+        for route_method, pattern, name in self.ROUTES:
+            match = re.fullmatch(pattern, url.path)
+            if route_method == method and match:
+                return getattr(self, name)(*match.groups())
+        self._send(404, self._page("Not Found", "<h1>Page not found</h1>"))
+
+    def _read_form(self):
+        self.is_json = False
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode()
+        self.body_pending = False
+        if "json" in self.headers.get("Content-Type", ""):
+            self.is_json = True
+            return json.loads(body or "{}")
+        return {k: v[-1] for k, v in parse_qs(body, keep_blank_values=True).items()}
+
+    # JSON bodies get JSON answers, and so do form posts from clients that accept JSON
+    def _wants_json(self):
+        return self.is_json or "json" in self.headers.get("Accept", "")
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+        data = body.encode() if isinstance(body, str) else body
+        headers = dict(headers or {})
+        # Every GET is tagged by content, so link checks and crawls can revalidate with If-None-Match
+        if status == 200 and self.command in ("GET", "HEAD"):
+            etag = headers.setdefault("ETag", f'"{hashlib.sha1(data).hexdigest()[:16]}"')
+            if etag in self.headers.get("If-None-Match", ""):
+                status, data = 304, None
+        self.responded = True
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if data is not None:
+            self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        for cookie in self.response_cookies:
+            self.send_header("Set-Cookie", cookie)
+        self.end_headers()
+        if data and not self.head_only:
+            self.wfile.write(data)
+
+    def _redirect(self, location):
+        self._send(303, "", headers={"Location": location})
+
+    def _json(self, payload, status=200):
+        self._send(status, json.dumps(payload), "application/json")
+
+    def _session_id(self, create=False):
+        for part in self.headers.get("Cookie", "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "session" and value in self.server.state.sessions:
+                return value
+        if not create:
+            return None
+        session_id = secrets.token_hex(16)
+        self.server.state.sessions[session_id] = {"user": None}
+        self.response_cookies.append(f"session={session_id}; Path=/; HttpOnly; SameSite=Lax")
+        return session_id
+
+    def _user(self):
+        session_id = self._session_id()
+        if session_id is None:
+            return None
+        return self.server.state.sessions[session_id]["user"]
+
+    def _require(self, *roles):
+        user = self._user()
+        if user is None or (roles and user["role"] not in roles):
+            self._redirect("/en/login")
+            return None
+        return user
+
+    def _cart(self, create=False):
+        session_id = self._session_id(create=create)
+        if session_id is None:
+            return {}
+        return self.server.state.carts.setdefault(session_id, {})
+
+    # --- page rendering ---
+
+    def _page(self, title, body, flash=None):
+        user = self._user()
+        links = [
+            '<a href="/en/products">Product Listing</a>',
+            '<a class="cart-icon" href="/en/cart">Cart</a>',
+            '<a href="/en/checkout">Checkout</a>',
+            '<a href="/en/orders">Order History</a>',
+        ]
+        if user:
+            links.append('<a href="/en/dashboard">Dashboard</a>')
+            links.append('<a href="/en/profile">Profile</a>')
+            if user["role"] == "seller":
+                links.append('<a href="/en/seller/products">Product Management</a>')
+            if user["role"] == "admin":
+                links.append('<a href="/en/admin/products">Product Moderation</a>')
+                links.append('<a href="/en/admin/users">User Management</a>')
+                links.append('<a href="/en/admin/orders">Order Management</a>')
+            links.append(
+                '<form method="post" action="/en/logout" style="display:inline">'
+                '<button name="logout">Logout</button></form>'
+            )
+        flash_html = f'<p class="flash">{html.escape(flash)}</p>' if flash else ""
+        return (
+            "<!DOCTYPE html><html><head>"
+            f"<title>LazyLizard - {html.escape(title)}</title>"
+            '<meta name="viewport" content="width=device-width, initial-scale=1">'
+            "<style>body{font-family:sans-serif;margin:0 auto;max-width:960px;padding:8px}"
+            "nav a{margin-right:8px} img{max-width:100%}</style>"
+            f"</head><body><nav>{' '.join(links)}</nav>{flash_html}{body}</body></html>"
+        )
+
+    def _login_form(self, error=None):
+        error_html = f'<p class="error-message">Invalid credentials: {html.escape(error)}</p>' if error else ""
+        return (
+            f'{error_html}<form method="post" action="/en/login" class="login-form">'
+            '<input type="text" name="username" placeholder="Username">'
+            '<input type="password" name="password" placeholder="Password">'
+            '<button type="submit" name="login">Login</button></form>'
+        )
+
+    def _product_items(self, products):
+        # The whole .product-item is the link, so clicking it always opens the product
+        return "".join(
+            f'<div class="product-card"><a class="product-item" href="/en/product/{p["id"]}">'
+            f'<img src="/static/img/product-{p["id"]}.svg" alt="{html.escape(p["name"])}">'
+            f'{html.escape(p["name"])} <span class="price">{p["price"]:.2f}</span></a>'
+            '<form method="post" action="/en/orders" style="display:inline">'
+            f'<input type="hidden" name="product_id" value="{p["id"]}">'
+            '<button name="place_order">Order now</button></form></div>'
+            for p in products
+        )
+
+    # --- static ---
+
+    def redirect_home(self):
+        self._redirect("/en/")
+
+    def favicon(self):
+        # A real 200 document: the session cache opens this URL to set cookies on the
+        # shop's origin, and Chrome does not navigate at all on a 204
+        self._send(200, FAVICON, "image/png", {"Cache-Control": "max-age=86400"})
+
+    def product_image(self, product_id):
+        color = f"#{(int(product_id) * 2654435761) % 0xFFFFFF:06x}"
+        svg = f'<svg xmlns="http://www.w3.org/2000/svg" width="120" height="90"><rect width="120" height="90" fill="{color}"/></svg>'
+        self._send(200, svg, "image/svg+xml", {"Cache-Control": "max-age=3600", "ETag": f'"img-{product_id}"'})
+
+    # --- login ---
+
+    def home(self):
+        products = list(self.server.state.products.values())[:20]
+        body = "" if self._user() else self._login_form()
+        body += f'<h1>Welcome to LazyLizard</h1><div class="product-list">{self._product_items(products)}</div>'
+        # Relative on purpose: it only resolves against /en/, where / and /en redirect to
+        body += '<p><a class="all-products" href="products">All products</a></p>'
+        self._send(200, self._page("Home", body))
+
+    def login_page(self):
+        self._send(200, self._page("Login", "<h1>Login</h1>" + self._login_form()))
+
+    def login(self):
+        username = self.form.get("username", "").strip()
+        role = ROLE_PASSWORDS.get(self.form.get("password", ""))
+        if role is None or (username and not username.startswith(role)):
+            body = "<h1>Login</h1>" + self._login_form("Invalid username or password")
+            return self._send(200, self._page("Login", body))
+        user = self.server.state.user(username or f"{role}_username", role)
+        if user["banned"]:
+            body = "<h1>Login</h1>" + self._login_form("This account is banned")
+            return self._send(200, self._page("Login", body))
+        session_id = self._session_id(create=True)
+        self.server.state.sessions[session_id]["user"] = user
+        self._redirect("/en/dashboard")
+
+    def logout(self):
+        session_id = self._session_id()
+        if session_id:
+            self.server.state.sessions[session_id]["user"] = None
+        self._redirect("/en/login")
+
+    def dashboard(self):
+        user = self._require()
+        if not user:
+            return
+        body = f'<h1>{user["role"].title()} Dashboard</h1><p class="profile">Signed in as {html.escape(user["username"])}</p>'
+        if user["role"] == "seller":
+            with self.server.state.lock:
+                notes = list(self.server.state.notifications)
+            body += "".join(f'<div class="notification">{html.escape(n)}</div>' for n in reversed(notes))
+        self._send(200, self._page("Dashboard", body))
+
+    # --- catalog ---
+
+    def products(self):
+        products = list(self.server.state.products.values())
+        query = self.query.get("q", "").lower()
+        if query:
+            products = [p for p in products if query in p["name"].lower() or query in p["category"].lower()]
+        page = int(self.query.get("page", "1"))
+        products = products[(page - 1) * 24 : page * 24]
+        body = f'<h1>Products</h1><div class="product-list">{self._product_items(products)}</div>'
+        self._send(200, self._page("Products", body))
+
+    def product(self, product_id):
+        product = self.server.state.products.get(int(product_id))
+        if product is None:
+            return self._send(404, self._page("Not Found", "<h1>Product not found</h1>"))
+        body = (
+            f'<h1 class="product-name">{html.escape(product["name"])}</h1>'
+            f'<img src="/static/img/product-{product["id"]}.svg" alt="{html.escape(product["name"])}">'
+            f'<p class="product-description">{html.escape(product["description"])}</p>'
+            f'<p class="product-price">{product["price"]:.2f}</p>'
+            '<form method="post" action="/en/cart/add">'
+            f'<input type="hidden" name="product_id" value="{product["id"]}">'
+            '<input type="hidden" name="quantity" value="1">'
+            '<button name="add_to_cart">Add to Cart</button> '
+            '<button name="add-to-cart">Add to Cart (quick)</button></form>'
+        )
+        self._send(200, self._page(product["name"], body, self.query.get("msg")))
+
+    # --- cart and checkout ---
+
+    def cart(self):
+        cart = self._cart()
+        products = self.server.state.products
+        if self._wants_json():
+            items = [{"product_id": p, "quantity": q, "price": products[p]["price"]} for p, q in cart.items()]
+            return self._json({"items": items})
+        if not cart:
+            body = (
+                '<h1>Cart</h1><div class="cart-items">'
+                '<p class="empty-cart-message cart-empty-message">Your cart is empty</p></div>'
+            )
+        else:
+            rows = []
+            for product_id, quantity in cart.items():
+                product = products[product_id]
+                rows.append(
+                    f'<div class="cart-item" data-price="{product["price"]:.2f}">'
+                    f'<span class="item-name">{html.escape(product["name"])}</span> '
+                    f'<span class="item-price">{product["price"]:.2f}</span>'
+                    '<form method="post" action="/en/cart/update" style="display:inline">'
+                    f'<input type="hidden" name="product_id" value="{product_id}">'
+                    f'<input type="number" name="quantity" value="{quantity}" min="0">'
+                    '<button name="increase_quantity" value="1">+</button>'
+                    '<button name="decrease_quantity" value="1">-</button></form>'
+                    '<form method="post" action="/en/cart/remove" style="display:inline">'
+                    f'<input type="hidden" name="product_id" value="{product_id}">'
+                    '<button class="remove-item" name="remove_item">Remove</button></form></div>'
+                )
+            total = sum(products[p]["price"] * q for p, q in cart.items())
+            body = (
+                f'<h1>Cart</h1><div class="cart-items">{"".join(rows)}</div>'
+                f'<p class="cart-total">Total Price: <span class="total-price">{total:.2f}</span></p>'
+                # Keep the total in sync while a quantity is being typed
+                "<script>document.querySelectorAll('input[name=quantity]').forEach(i => i.addEventListener('input', () => {"
+                "let t = 0; document.querySelectorAll('.cart-item').forEach(r => {"
+                "t += parseFloat(r.dataset.price) * (parseInt(r.querySelector('input[name=quantity]').value) || 0); });"
+                "document.querySelector('.total-price').textContent = t.toFixed(2); }));</script>"
+            )
+        body += '<form method="get" action="/en/checkout"><button name="checkout">Proceed to checkout</button></form>'
+        self._send(200, self._page("Cart", body))
+
+    def cart_add(self):
+        cart = self._cart(create=True)
+        try:
+            product_id = int(self.form.get("product_id", 0))
+            quantity = int(self.form.get("quantity", 1))
+        except (TypeError, ValueError):
+            product_id, quantity = 0, 0
+        if product_id not in self.server.state.products or quantity < 1:
+            if self._wants_json():
+                return self._json({"error": "Unknown product or bad quantity"}, 400)
+            return self._send(400, self._page("Bad Request", "<h1>Unknown product</h1>"))
+        with self.server.state.lock:
+            cart[product_id] = cart.get(product_id, 0) + quantity
+        if self._wants_json():
+            return self._json({"cart_items": len(cart), "quantity": cart[product_id]})
+        self._redirect(f"/en/product/{product_id}?{urlencode({'msg': 'Added to cart'})}")
+
+    def cart_update(self):
+        cart = self._cart(create=True)
+        product_id = int(self.form.get("product_id", 0))
+        with self.server.state.lock:
+            quantity = int(self.form.get("quantity") or cart.get(product_id, 0))
+            if "increase_quantity" in self.form:
+                quantity += 1
+            elif "decrease_quantity" in self.form:
+                quantity -= 1
+            if quantity > 0:
+                cart[product_id] = quantity
+            else:
+                cart.pop(product_id, None)
+        self._redirect("/en/cart")
+
+    def cart_remove(self):
+        cart = self._cart(create=True)
+        with self.server.state.lock:
+            cart.pop(int(self.form.get("product_id", 0)), None)
+        self._redirect("/en/cart")
+
+    def checkout(self):
+        cart = self._cart()
+        if not cart:
+            body = '<h1>Checkout</h1><p class="error-message cart-empty-error">Your cart is empty</p>'
+            return self._send(200, self._page("Checkout", body))
+        total = sum(self.server.state.products[p]["price"] * q for p, q in cart.items())
+        body = (
+            f'<h1>Checkout</h1><p class="checkout-total">Total Price: {total:.2f}</p>'
+            '<form method="post" action="/en/checkout"><button name="place_order">Place Order</button></form>'
+        )
+        self._send(200, self._page("Checkout", body))
+
+    def checkout_submit(self):
+        user = self._require()
+        if not user:
+            return
+        cart = self._cart()
+        if not cart:
+            return self._redirect("/en/checkout")
+        order = self.server.state.place_order(user["username"], cart)
+        cart.clear()
+        message = f"Order #{order['id']} placed"
+        self._redirect(f"/en/orders?{urlencode({'msg': message})}")
+
+    # --- orders ---
+
+    def _order_items(self, orders, manage=False):
+        rows = []
+        for order in orders:
+            shipped = order["status"] == "Shipped"
+            status_class = "order-status-shipped" if shipped else "order-status-pending"
+            button = (
+                f'<form method="post" action="/en/admin/orders/{order["id"]}" style="display:inline">'
+                '<button name="manage_order">Mark as shipped</button></form>'
+                if manage and not shipped
+                else ""
+            )
+            rows.append(
+                f'<div class="order-item">order_id: {order["id"]} buyer: {html.escape(order["buyer"])} '
+                f'items: {sum(order["items"].values())} <span class="{status_class}">{order["status"]}</span>{button}</div>'
+            )
+        return f'<div class="order-list">{"".join(rows)}</div>'
+
+    def order_history(self):
+        user = self._require()
+        if not user:
+            return
+        orders = [o for o in self.server.state.orders if o["buyer"] == user["username"]]
+        body = "<h1>Order History</h1>" + self._order_items(reversed(orders))
+        self._send(200, self._page("Order History", body, self.query.get("msg")))
+
+    def order_place(self):
+        user = self._require()
+        if not user:
+            return
+        product_id = int(self.form.get("product_id", 0))
+        if product_id not in self.server.state.products:
+            return self._send(400, self._page("Bad Request", "<h1>Unknown product</h1>"))
+        order = self.server.state.place_order(user["username"], {product_id: int(self.form.get("quantity", 1))})
+        if self._wants_json():
+            return self._json({"order_id": order["id"]})
+        self._redirect("/en/dashboard")
+
+    # --- seller ---
+
+    def _seller_products(self, user):
+        with self.server.state.lock:
+            products = [p for p in self.server.state.products.values() if p["seller"] == user["username"]]
+        return sorted(products, key=lambda p: p["id"], reverse=True)
+
+    def seller_products(self):
+        user = self._require("seller")
+        if not user:
+            return
+        rows = "".join(
+            f'<div class="product-row">{html.escape(p["name"])} {p["price"]:.2f} '
+            f'<form method="get" action="/en/seller/products/{p["id"]}/edit" style="display:inline">'
+            '<button name="edit_product">Edit</button></form>'
+            f'<form method="get" action="/en/seller/products/{p["id"]}/delete" style="display:inline">'
+            '<button name="delete_product">Delete</button></form></div>'
+            for p in self._seller_products(user)[:50]
+        )
+        body = (
+            '<h1>Product Management</h1><form method="get" action="/en/seller/products/new">'
+            f'<button name="add_product">Add Product</button></form><div class="product-list">{rows}</div>'
+        )
+        self._send(200, self._page("Product Management", body, self.query.get("msg")))
+
+    def seller_product_form(self, product_id=None, values=None, error=None):
+        user = self._require("seller")
+        if not user:
+            return
+        if values is None:
+            product = self.server.state.products.get(int(product_id)) if product_id else None
+            values = {
+                "product_name": product["name"] if product else "",
+                "product_price": f'{product["price"]:.2f}' if product else "",
+                "product_description": product["description"] if product else "",
+                "product_category": product["category"] if product else "",
+            }
+        action = f"/en/seller/products/{product_id}/edit" if product_id else "/en/seller/products/new"
+        fields = "".join(
+            f'<label>{label}<input type="text" name="{name}" value="{html.escape(values.get(name, ""))}"></label>'
+            for name, label in [
+                ("product_name", "Name"),
+                ("product_price", "Price"),
+                ("product_description", "Description"),
+                ("product_image", "Image"),
+                ("product_category", "Category"),
+            ]
+        )
+        error_html = f'<p class="validation-message">{html.escape(error)}</p>' if error else ""
+        body = (
+            f'<h1>{"Edit" if product_id else "Add"} Product</h1>{error_html}'
+            f'<form method="post" action="{action}">{fields}<button name="submit_product">Save</button></form>'
+        )
+        self._send(200, self._page("Product Management", body))
+
+    def seller_product_save(self, product_id=None):
+        user = self._require("seller")
+        if not user:
+            return
+        form = self.form
+        error = None
+        if not form.get("product_name", "").strip():
+            error = "Product name is required"
+        else:
+            try:
+                price = float(form.get("product_price", ""))
+            except ValueError:
+                error = "Product price must be a number"
+        if error:
+            return self.seller_product_form(product_id, values=form, error=error)
+
+        with self.server.state.lock:
+            if product_id:
+                product = self.server.state.products.get(int(product_id))
+                if product is None:
+                    if self._wants_json():
+                        return self._json({"error": "Product not found"}, 404)
+                    return self._send(404, self._page("Not Found", "<h1>Product not found</h1>"))
+            else:
+                product = self.server.state.add_product(user["username"], "", 0, "", "")
+            product.update(
+                name=form["product_name"].strip(),
+                price=price,
+                description=form.get("product_description", ""),
+                category=form.get("product_category", "") or product["category"],
+            )
+        if self._wants_json():
+            return self._json({"product_id": product["id"]})
+        self._redirect("/en/seller/products")
+
+    def seller_product_delete_confirm(self, product_id):
+        if not self._require("seller"):
+            return
+        product = self.server.state.products.get(int(product_id))
+        if product is None:
+            return self._redirect("/en/seller/products")
+        body = (
+            f'<h1>Delete {html.escape(product["name"])}?</h1>'
+            f'<form method="post" action="/en/seller/products/{product_id}/delete">'
+            '<button name="confirm_delete">Delete</button></form>'
+        )
+        self._send(200, self._page("Product Management", body))
+
+    def seller_product_delete(self, product_id):
+        if not self._require("seller"):
+            return
+        with self.server.state.lock:
+            self.server.state.products.pop(int(product_id), None)
+        if self._wants_json():
+            return self._json({"deleted": int(product_id)})
+        self._redirect(f"/en/seller/products?{urlencode({'msg': 'Product deleted'})}")
+
+    # --- admin ---
+
+    def admin_products(self):
+        if not self._require("admin"):
+            return
+        products = list(self.server.state.products.values())[:50]
+        rows = "".join(
+            f'<div class="product-row">{html.escape(p["name"])} <span class="status">{p["status"]}</span>'
+            f'<form method="post" action="/en/admin/products/{p["id"]}" style="display:inline">'
+            '<button name="approve_product" value="Approved">Approve</button>'
+            '<button name="reject_product" value="Rejected">Reject</button></form></div>'
+            for p in products
+        )
+        body = f'<h1>Product Moderation</h1><div class="product-list">{rows}</div>'
+        self._send(200, self._page("Product Moderation", body, self.query.get("msg")))
+
+    def admin_product_action(self, product_id):
+        if not self._require("admin"):
+            return
+        status = "Approved" if "approve_product" in self.form else "Rejected"
+        with self.server.state.lock:
+            product = self.server.state.products.get(int(product_id))
+            if product is None:
+                return self._send(404, self._page("Not Found", "<h1>Product not found</h1>"))
+            product["status"] = status
+        message = f"Product {status.lower()}"
+        self._redirect(f"/en/admin/products?{urlencode({'msg': message})}")
+
+    def admin_users(self):
+        if not self._require("admin"):
+            return
+        for role in ("buyer", "seller"):
+            self.server.state.user(f"{role}_username", role)
+        rows = "".join(
+            f'<div class="user-row">{html.escape(u["username"])} {u["role"]} {"banned" if u["banned"] else "active"}'
+            f'<form method="post" action="/en/admin/users/{u["username"]}" style="display:inline">'
+            '<button name="ban_user">Ban</button><button name="unban_user">Unban</button>'
+            '<button name="change_role">Change role</button></form></div>'
+            for u in list(self.server.state.users.values())
+            if u["role"] != "admin"
+        )
+        body = f'<h1>User Management</h1><div class="user-list">{rows}</div>'
+        self._send(200, self._page("User Management", body, self.query.get("msg")))
+
+    def admin_user_action(self, username):
+        if not self._require("admin"):
+            return
+        user = self.server.state.users.get(username)
+        if user is None:
+            return self._send(404, self._page("Not Found", "<h1>User not found</h1>"))
+        if "ban_user" in self.form:
+            user["banned"], message = True, "User banned"
+        elif "unban_user" in self.form:
+            user["banned"], message = False, "User unbanned"
+        else:
+            # The stand-in only records the change; roles come from the password at login
+            message = "User role updated"
+        self._redirect(f"/en/admin/users?{urlencode({'msg': message})}")
+
+    def admin_orders(self):
+        if not self._require("admin"):
+            return
+        body = "<h1>Order Management</h1>" + self._order_items(reversed(self.server.state.orders), manage=True)
+        self._send(200, self._page("Order Management", body, self.query.get("msg")))
+
+    def admin_order_action(self, order_id):
+        if not self._require("admin"):
+            return
+        with self.server.state.lock:
+            for order in self.server.state.orders:
+                if order["id"] == int(order_id):
+                    order["status"] = "Shipped"
+        self._redirect(f"/en/admin/orders?{urlencode({'msg': 'Order marked as shipped'})}")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class FakeShop:
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=0, jitter_ms=0, error_rate=0.0,
+                 product_count=200, verbose=False):
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.state = ShopState(product_count)
+        # Every buyer starts with one order so order history pages are never empty
+        for buyer in ["buyer_username"] + [f"buyer_username_{i}" for i in range(16)]:
+            self.state.place_order(buyer, {1: 1})
+        self.state.notifications.clear()
+        self.verbose = verbose
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self._server.server_port}"
+
+    def start(self):
+        self._server = _Server((self.host, self.port), FakeShopHandler)
+        self._server.shop = self
+        self._server.state = self.state
+        self._server.verbose = self.verbose
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-shop", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def wait(self):
+        try:
+            self._thread.join()
+        except KeyboardInterrupt:
+            self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the local LazyLizard stand-in shop")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random +/- spread around --latency-ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--products", type=int, default=200, help="Number of catalog products")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    shop = FakeShop(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate, args.products, args.verbose)
+    shop.start()
+    print(f"Fake LazyLizard shop listening on {shop.base_url}", flush=True)
+    shop.wait()
+
+
+if __name__ == "__main__":
+    main()
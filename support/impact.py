@@ -0,0 +1,106 @@
+import fnmatch
+import json
+import os
+import time
+
+from selenium.webdriver.support.events import AbstractEventListener
+
+from support.nav_timing import route_of
+from support.shared_json import update_json
+from support.waits import describe
+
+
+# The routes and selectors one test touched while it ran
+class ImpactRecorder:
+    def __init__(self):
+        self.routes = set()
+        self.selectors = set()
+
+    def route(self, url):
+        # Full URLs and bare paths both collapse to e.g. /en/product/<id>
+        self.routes.add(route_of(url))
+
+    def selector(self, locator):
+        self.selectors.add(describe(locator))
+
+
+# Records the route of every document the browser lands on
+class ImpactListener(AbstractEventListener):
+    def __init__(self, impact):
+        self.impact = impact
+
+    def after_navigate_to(self, url, driver):
+        self.impact.route(url)
+
+    def after_click(self, element, driver):
+        try:
+            self.impact.route(driver.current_url)
+        except Exception:
+            # An alert is open or the page is mid-unload
+            pass
+
+
+# Test id -> routes and selectors, built by --record-impact runs and used by
+# --changed-routes / --changed-selectors to pick the tests a change can affect.
+class ImpactIndex:
+    def __init__(self, path):
+        self.path = path
+        self.tests = {}
+        self._recorded = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.tests = json.load(f)["tests"]
+
+    def record(self, test, impact):
+        # A test that touched nothing the index can see stays unknown, so it is never deselected
+        if impact.routes or impact.selectors:
+            self._recorded[test] = {"routes": sorted(impact.routes), "selectors": sorted(impact.selectors)}
+
+    def save(self):
+        if not self._recorded:
+            return
+
+        # Parallel workers each record their own tests into the same file
+        def merge(data):
+            return {"recorded": time.strftime("%Y-%m-%dT%H:%M:%S"), "tests": {**data["tests"], **self._recorded}}
+
+        update_json(self.path, merge, {"tests": {}})
+
+    # True/False for recorded tests, None for tests the index has never seen.
+    # routes are fnmatch patterns such as /en/checkout or /en/seller/*;
+    # selectors match as substrings, e.g. "cart-item" matches "class name=cart-item".
+    def affected(self, test, routes=(), selectors=()):
+        entry = self.tests.get(test)
+        if entry is None:
+            return None
+        if any(fnmatch.fnmatchcase(route, pattern) for route in entry["routes"] for pattern in routes):
+            return True
+        return any(fragment in selector for selector in entry["selectors"] for fragment in selectors)
+
+    # Changes no recorded test has ever touched: a typo, or a page the index predates
+    def unknown(self, routes=(), selectors=()):
+        recorded_routes = {route for entry in self.tests.values() for route in entry["routes"]}
+        recorded_selectors = {selector for entry in self.tests.values() for selector in entry["selectors"]}
+        return [
+            pattern for pattern in routes if not any(fnmatch.fnmatchcase(r, pattern) for r in recorded_routes)
+        ] + [
+            fragment for fragment in selectors if not any(fragment in s for s in recorded_selectors)
+        ]
+
+
+# Turns --changed-routes items into route patterns: "checkout" -> /en/checkout,
+# "product/17" -> /en/product/<id>; templates go through the optional map
+# (template glob -> routes), e.g. {"templates/cart/*.html": ["cart", "checkout"]}.
+# Returns the patterns and the items that could not be mapped: a file (anything
+# with an extension) the map does not cover cannot be tied to a route.
+def changed_route_patterns(items, env, template_map=None):
+    patterns, unmapped = [], []
+    for item in items:
+        mapped = [routes for glob, routes in (template_map or {}).items() if fnmatch.fnmatchcase(item, glob)]
+        if mapped:
+            patterns.extend(changed_route_patterns([r for routes in mapped for r in routes], env)[0])
+        elif os.path.splitext(item)[1]:
+            unmapped.append(item)
+        else:
+            patterns.append(route_of(item if item.startswith("/") else env.path(item)))
+    return patterns, unmapped
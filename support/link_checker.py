@@ -0,0 +1,176 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Statuses some servers send for HEAD although a GET would succeed
+HEAD_REJECTED = {403, 405, 501}
+
+
+class LinkResult:
+    def __init__(self, url, kinds, status=None, error=None, method="HEAD"):
+        self.url = url
+        self.kinds = kinds
+        self.status = status
+        self.error = error
+        self.method = method
+
+    @property
+    def ok(self):
+        return self.error is None and self.status is not None and self.status < 400
+
+    def as_dict(self):
+        return {
+            "url": self.url,
+            "kinds": sorted(self.kinds),
+            "status": self.status,
+            "error": self.error,
+            "method": self.method,
+        }
+
+
+class LinkReport:
+    def __init__(self, results):
+        self.results = results
+
+    @property
+    def broken(self):
+        return [r for r in self.results if not r.ok]
+
+    def as_dict(self):
+        return {"checked": len(self.results), "broken": [r.as_dict() for r in self.broken]}
+
+    def summary(self):
+        lines = [f"{len(self.broken)} of {len(self.results)} URL(s) broken"]
+        for r in self.broken:
+            lines.append(f"  {'/'.join(sorted(r.kinds))} {r.url} - {r.status or r.error}")
+        return "\n".join(lines)
+
+
+# On-disk record of each URL's last status, ETag and Last-Modified. Entries
+# younger than ttl are trusted as-is; older ones are revalidated with a
+# conditional request.
+class LinkCache:
+    def __init__(self, path, ttl=24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as f:
+                self._entries = json.load(f)
+
+    def get(self, url):
+        with self._lock:
+            return self._entries.get(url)
+
+    def is_fresh(self, entry):
+        return time.time() - entry["checked_at"] < self.ttl
+
+    def put(self, url, status, headers=None, **extra):
+        headers = headers or {}
+        entry = {
+            "status": status,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "checked_at": time.time(),
+        }
+        entry.update(extra)
+        with self._lock:
+            self._entries[url] = entry
+        return entry
+
+    def touch(self, url):
+        with self._lock:
+            self._entries[url]["checked_at"] = time.time()
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = json.dumps(self._entries)
+        # Write atomically so an interrupted run can't leave a corrupt cache
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+
+# Checks links and images concurrently over one pooled keep-alive session.
+# Duplicate URLs are checked once and each host gets at most per_host
+# requests in flight.
+class LinkChecker:
+    def __init__(self, max_workers=16, per_host=4, timeout=10, session=None, cache=None):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.cache = cache
+        self.session = session or self._make_session()
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    def check(self, urls):
+        # urls is an iterable of (url, kind) pairs, e.g. ("https://...", "image")
+        kinds_by_url = {}
+        for url, kind in urls:
+            if url and url.startswith("http"):
+                kinds_by_url.setdefault(url.split("#")[0], set()).add(kind)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(lambda item: self._check_one(*item), kinds_by_url.items()))
+        return LinkReport(results)
+
+    def _check_one(self, url, kinds):
+        entry = self.cache.get(url) if self.cache else None
+        if entry and self.cache.is_fresh(entry):
+            return LinkResult(url, kinds, status=entry["status"], method="CACHED")
+
+        headers = self.cache.conditional_headers(entry) if self.cache else {}
+        with self._slot(urlsplit(url).netloc):
+            try:
+                method = "HEAD"
+                response = self.session.head(url, headers=headers, allow_redirects=True, timeout=self.timeout)
+                if response.status_code in HEAD_REJECTED:
+                    # Fall back to GET, but only read the headers
+                    method = "GET"
+                    with self.session.get(
+                        url, headers=headers, allow_redirects=True, timeout=self.timeout, stream=True
+                    ) as response:
+                        pass
+            except requests.RequestException as e:
+                return LinkResult(url, kinds, error=str(e))
+
+        if response.status_code == 304 and entry:
+            # Unchanged since the cached check
+            self.cache.touch(url)
+            return LinkResult(url, kinds, status=entry["status"], method=method)
+        if self.cache:
+            self.cache.put(url, response.status_code, response.headers)
+        return LinkResult(url, kinds, status=response.status_code, method=method)
+
+    def _slot(self, host):
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.Semaphore(self.per_host)
+            return self._host_slots[host]
+
+    def _make_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
@@ -0,0 +1,109 @@
+import csv
+import json
+import os
+import re
+import statistics
+from urllib.parse import urlsplit
+
+from selenium.webdriver.support.events import AbstractEventListener
+
+# Reads Navigation Timing, paint timings, LCP and CLS for the current document.
+# Buffered observers hand their entries over synchronously via takeRecords().
+TIMING_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+if (!nav) { return null; }
+const buffered = (type) => {
+    try {
+        const observer = new PerformanceObserver(() => {});
+        observer.observe({type: type, buffered: true});
+        const entries = observer.takeRecords();
+        observer.disconnect();
+        return entries;
+    } catch (e) { return []; }
+};
+const paints = {};
+performance.getEntriesByType('paint').forEach(p => { paints[p.name] = p.startTime; });
+const lcp = buffered('largest-contentful-paint');
+let cls = 0;
+buffered('layout-shift').forEach(e => { if (!e.hadRecentInput) { cls += e.value; } });
+return {
+    time_origin: performance.timeOrigin,
+    url: location.href,
+    ttfb: nav.responseStart,
+    dom_content_loaded: nav.domContentLoadedEventEnd,
+    load: nav.loadEventEnd,
+    transfer_size: nav.transferSize,
+    first_paint: paints['first-paint'] ?? null,
+    first_contentful_paint: paints['first-contentful-paint'] ?? null,
+    largest_contentful_paint: lcp.length ? lcp[lcp.length - 1].startTime : null,
+    cumulative_layout_shift: cls,
+};
+"""
+
+FIELDS = [
+    "test", "trigger", "route", "url", "ttfb", "dom_content_loaded", "load", "transfer_size",
+    "first_paint", "first_contentful_paint", "largest_contentful_paint", "cumulative_layout_shift",
+]
+
+
+# Collapses ids so /en/product/17 and /en/product/42 report as one route
+def route_of(url):
+    path = urlsplit(url).path or "/"
+    return re.sub(r"/\d+(?=/|$)", "/<id>", path)
+
+
+class NavigationTimings:
+    def __init__(self):
+        self.records = []
+
+    def add(self, record):
+        self.records.append(record)
+
+    def by_route(self):
+        routes = {}
+        for record in self.records:
+            routes.setdefault(record["route"], []).append(record)
+        summary = []
+        for route, records in sorted(routes.items()):
+            row = {"route": route, "samples": len(records)}
+            for metric in ("ttfb", "dom_content_loaded", "first_contentful_paint", "largest_contentful_paint"):
+                values = [r[metric] for r in records if r[metric]]
+                row[metric] = statistics.median(values) if values else None
+            row["cumulative_layout_shift"] = max(r["cumulative_layout_shift"] or 0 for r in records)
+            summary.append(row)
+        return summary
+
+    def write(self, directory, suffix=""):
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"nav_timings{suffix}.json"), "w") as f:
+            json.dump({"routes": self.by_route(), "navigations": self.records}, f, indent=2)
+        with open(os.path.join(directory, f"nav_timings{suffix}.csv"), "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(self.records)
+
+
+# Captures timings after every driver.get() and after clicks that loaded a new document
+class NavigationTimingListener(AbstractEventListener):
+    def __init__(self, timings, test=None):
+        self.timings = timings
+        self.test = test
+        self._last_origin = None
+
+    def after_navigate_to(self, url, driver):
+        self._capture(driver, "get")
+
+    def after_click(self, element, driver):
+        self._capture(driver, "click")
+
+    def _capture(self, driver, trigger):
+        try:
+            data = driver.execute_script(TIMING_SCRIPT)
+        except Exception:
+            # Alerts, about:blank or a page that is mid-unload; nothing to measure
+            return
+        if not data or not data["url"].startswith("http") or data["time_origin"] == self._last_origin:
+            return
+        self._last_origin = data.pop("time_origin")
+        data.update(test=self.test, trigger=trigger, route=route_of(data["url"]))
+        self.timings.add(data)
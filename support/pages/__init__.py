@@ -0,0 +1,25 @@
+# Page objects for the shop: selectors in one place, cached element handles
+# and batched reads. Tests get them through the `pages` fixture.
+from support.pages.base import Page
+from support.pages.shop import (
+    AdminDashboard,
+    CartPage,
+    CheckoutPage,
+    LoginPage,
+    OrderHistoryPage,
+    Pages,
+    ProductManagementPage,
+    ProductPage,
+)
+
+__all__ = [
+    "AdminDashboard",
+    "CartPage",
+    "CheckoutPage",
+    "LoginPage",
+    "OrderHistoryPage",
+    "Page",
+    "Pages",
+    "ProductManagementPage",
+    "ProductPage",
+]
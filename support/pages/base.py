@@ -0,0 +1,190 @@
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+
+from support.waits import describe
+
+# Selenium locator -> matching elements, in the page
+FIND_JS = """
+const find = (by, value) => {
+    switch (by) {
+        case 'css selector': return Array.from(document.querySelectorAll(value));
+        case 'name': return Array.from(document.getElementsByName(value));
+        case 'class name': return Array.from(document.getElementsByClassName(value));
+        case 'tag name': return Array.from(document.getElementsByTagName(value));
+        case 'id': { const e = document.getElementById(value); return e ? [e] : []; }
+        case 'link text': return Array.from(document.links).filter(a => a.innerText.trim() === value);
+        case 'partial link text': return Array.from(document.links).filter(a => a.innerText.includes(value));
+        case 'xpath': {
+            const found = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            return Array.from({length: found.snapshotLength}, (_, i) => found.snapshotItem(i));
+        }
+    }
+    return [];
+};
+"""
+
+# Finds every locator passed in and returns count, text and value of the
+# matches, so a page can be read in one round-trip instead of one per element
+READ_SCRIPT = FIND_JS + """
+const out = {};
+for (const [key, by, value] of arguments[0]) {
+    const found = find(by, value);
+    out[key] = {
+        count: found.length,
+        texts: found.map(e => e.innerText.trim()),
+        values: found.map(e => e.value === undefined ? null : e.value),
+    };
+}
+return out;
+"""
+
+# Title, URL, visible text and match counts for the given locators: enough to
+# check a page state without pulling page_source over the wire
+SNAPSHOT_SCRIPT = FIND_JS + """
+const counts = {};
+for (const [key, by, value] of arguments[0]) { counts[key] = find(by, value).length; }
+return {
+    title: document.title,
+    url: location.href,
+    text: document.body ? document.body.innerText : '',
+    counts: counts,
+};
+"""
+
+
+# One read of a page state, checked against many expectations at once
+class Snapshot:
+    def __init__(self, data, locators):
+        self.title = data["title"]
+        self.url = data["url"]
+        self.text = data["text"]
+        # Counts are keyed by describe(locator), so pages sharing a cache can't mix up names
+        self.counts = data["counts"]
+        self.locators = locators
+
+    # locators maps a readable name to the locator it stands for
+    def missing(self, texts=(), locators=None, title=None):
+        problems = [f"text {text!r}" for text in texts if text not in self.text]
+        for name, locator in (locators or {}).items():
+            if not self.counts.get(describe(locator)):
+                problems.append(f"element {name}")
+        if title is not None and title not in self.title:
+            problems.append(f"title {title!r} (title is {self.title!r})")
+        return problems
+
+
+# Base page object. Selectors live in LOCATORS; element handles are cached
+# per locator and shared by every page of the same Pages, and dropped after
+# anything that can load a new document (open, refresh, click).
+class Page:
+    ROUTE = ""
+    # Site-wide navigation, available on every page
+    LOCATORS = {
+        "product_listing_link": (By.LINK_TEXT, "Product Listing"),
+        "cart_link": (By.LINK_TEXT, "Cart"),
+        "checkout_link": (By.LINK_TEXT, "Checkout"),
+        "order_history_link": (By.LINK_TEXT, "Order History"),
+        "cart_icon": (By.CLASS_NAME, "cart-icon"),
+        "logout": (By.NAME, "logout"),
+    }
+
+    def __init__(self, driver, env, wait, cache=None, impact=None):
+        self.driver = driver
+        self.env = env
+        self.wait = wait
+        self.cache = {} if cache is None else cache
+        # Optional support.impact.ImpactRecorder noting every selector the test uses
+        self.impact = impact
+
+    def locator(self, name):
+        locator = self.LOCATORS[name]
+        if self.impact is not None:
+            self.impact.selector(locator)
+        return locator
+
+    def open(self, route=None):
+        self.driver.get(self.env.url(self.ROUTE if route is None else route))
+        self.navigated()
+        return self
+
+    def refresh(self):
+        self.driver.refresh()
+        self.navigated()
+        return self
+
+    def navigated(self):
+        self.cache.clear()
+
+    # Taken once per page state and reused until the next open/refresh/click/fill;
+    # fetched again only when asked for locators the cached one didn't count
+    def snapshot(self, selectors=()):
+        snapshot = self.cache.get("snapshot")
+        wanted = {describe(locator): locator for locator in map(self.locator, selectors)}
+        if snapshot is None or not wanted.keys() <= snapshot.counts.keys():
+            if snapshot:
+                wanted.update(snapshot.locators)
+            snapshot = Snapshot(
+                self.driver.execute_script(SNAPSHOT_SCRIPT, [[key, *locator] for key, locator in wanted.items()]),
+                wanted,
+            )
+            self.cache["snapshot"] = snapshot
+        return snapshot
+
+    # Asserts every expected text, element and title against one snapshot and
+    # reports all that are missing together: page.expect("Product approved", selectors=["product_list"])
+    def expect(self, *texts, selectors=(), title=None):
+        snapshot = self.snapshot(selectors)
+        problems = snapshot.missing(texts, {name: self.locator(name) for name in selectors}, title)
+        assert not problems, f"Missing on {snapshot.url}: " + ", ".join(problems)
+        return snapshot
+
+    def find(self, name):
+        locator = self.locator(name)
+        if locator not in self.cache:
+            self.cache[locator] = self.driver.find_element(*locator)
+        return self.cache[locator]
+
+    def find_all(self, name):
+        locator = self.locator(name)
+        key = ("all", *locator)
+        if key not in self.cache:
+            self.cache[key] = self.driver.find_elements(*locator)
+        return self.cache[key]
+
+    # until is a Waiter condition: "present", "visible", "clickable" or "all_present"
+    def wait_for(self, name, until="present", timeout="element"):
+        locator = self.locator(name)
+        found = getattr(self.wait, until)(locator, timeout=timeout)
+        self.cache[("all", *locator) if until == "all_present" else locator] = found
+        return found
+
+    def click(self, name, until=None, timeout="element"):
+        element = self.wait_for(name, until, timeout) if until else self.find(name)
+        try:
+            element.click()
+        except StaleElementReferenceException:
+            # The page re-rendered since the handle was cached
+            self.cache.pop(self.LOCATORS[name], None)
+            self.find(name).click()
+        self.navigated()
+
+    def fill(self, name, text, clear=False):
+        element = self.find(name)
+        if clear:
+            element.clear()
+        element.send_keys(text)
+        # Typing can re-render the page (live totals, validation)
+        self.cache.pop("snapshot", None)
+        return element
+
+    # Count, trimmed texts and values of several locators in one round-trip:
+    # page.read("cart_item", "cart_total")["cart_item"]["count"]
+    def read(self, *names):
+        return self.driver.execute_script(READ_SCRIPT, [[name, *self.locator(name)] for name in names])
+
+    def count(self, name):
+        return self.read(name)[name]["count"]
+
+    def text(self, name):
+        texts = self.read(name)[name]["texts"]
+        return texts[0] if texts else None
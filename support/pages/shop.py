@@ -0,0 +1,165 @@
+from selenium.webdriver.common.by import By
+
+from support.pages.base import Page
+
+
+def heading(text):
+    return (By.XPATH, f"//h1[contains(text(),'{text}')]")
+
+
+class LoginPage(Page):
+    ROUTE = "login"
+    LOCATORS = {
+        **Page.LOCATORS,
+        "username": (By.NAME, "username"),
+        "password": (By.NAME, "password"),
+        "login": (By.NAME, "login"),
+        "error": (By.CLASS_NAME, "error-message"),
+    }
+
+    # Fills whichever credentials are given and submits the form
+    def login(self, username=None, password=None, timeout="element"):
+        self.wait_for("password", "visible", timeout)
+        if username is not None:
+            self.fill("username", username)
+        if password is not None:
+            self.fill("password", password)
+        self.click("login")
+        return self
+
+
+class ProductPage(Page):
+    ROUTE = "products"
+    LOCATORS = {
+        **Page.LOCATORS,
+        "product_item": (By.CLASS_NAME, "product-item"),
+        "add_to_cart": (By.NAME, "add_to_cart"),
+        "add_to_cart_button": (By.NAME, "add-to-cart"),
+        "place_order": (By.NAME, "place_order"),
+    }
+
+    def open_product(self, product_id):
+        return self.open(f"product/{product_id}")
+
+    # From a listing (the home page or /products), open the first product shown
+    def open_first_product(self, timeout="element"):
+        self.wait_for("product_item", "all_present", timeout)
+        self.click("product_item")
+        return self
+
+    def add_to_cart(self, name="add_to_cart", timeout="element"):
+        self.click(name, until="clickable", timeout=timeout)
+        return self
+
+
+class CartPage(Page):
+    ROUTE = "cart"
+    LOCATORS = {
+        **Page.LOCATORS,
+        "cart_items": (By.CLASS_NAME, "cart-items"),
+        "cart_item": (By.CLASS_NAME, "cart-item"),
+        "quantity": (By.NAME, "quantity"),
+        "item_price": (By.CLASS_NAME, "item-price"),
+        "total_price": (By.CLASS_NAME, "total-price"),
+        "cart_total": (By.CLASS_NAME, "cart-total"),
+        "remove_item": (By.CLASS_NAME, "remove-item"),
+        "remove_item_button": (By.NAME, "remove_item"),
+        "increase_quantity": (By.NAME, "increase_quantity"),
+        "decrease_quantity": (By.NAME, "decrease_quantity"),
+        "checkout": (By.NAME, "checkout"),
+        "empty_cart_message": (By.CLASS_NAME, "empty-cart-message"),
+        "cart_empty_message": (By.CLASS_NAME, "cart-empty-message"),
+        "error_message": (By.CLASS_NAME, "error-message"),
+    }
+
+    def item_count(self):
+        return self.count("cart_item")
+
+    # Types a new quantity for the first item
+    def set_quantity(self, quantity):
+        self.fill("quantity", str(quantity), clear=True)
+        return self
+
+
+class CheckoutPage(Page):
+    ROUTE = "checkout"
+    LOCATORS = {
+        **Page.LOCATORS,
+        "checkout_total": (By.CLASS_NAME, "checkout-total"),
+        "place_order": (By.NAME, "place_order"),
+        "cart_empty_error": (By.CLASS_NAME, "cart-empty-error"),
+    }
+
+
+class OrderHistoryPage(Page):
+    ROUTE = "orders"
+    LOCATORS = {
+        **Page.LOCATORS,
+        "buyer_dashboard": heading("Buyer Dashboard"),
+        "seller_dashboard": heading("Seller Dashboard"),
+        "order_list": (By.CLASS_NAME, "order-list"),
+        "order_item": (By.CLASS_NAME, "order-item"),
+        "notification": (By.CLASS_NAME, "notification"),
+    }
+
+
+class AdminDashboard(Page):
+    ROUTE = "dashboard"
+    LOCATORS = {
+        **Page.LOCATORS,
+        "heading": heading("Admin Dashboard"),
+        "product_moderation_link": (By.LINK_TEXT, "Product Moderation"),
+        "user_management_link": (By.LINK_TEXT, "User Management"),
+        "order_management_link": (By.LINK_TEXT, "Order Management"),
+        "product_list": (By.CLASS_NAME, "product-list"),
+        "approve_product": (By.NAME, "approve_product"),
+        "reject_product": (By.NAME, "reject_product"),
+        "user_list": (By.CLASS_NAME, "user-list"),
+        "ban_user": (By.NAME, "ban_user"),
+        "unban_user": (By.NAME, "unban_user"),
+        "change_role": (By.NAME, "change_role"),
+        "order_list": (By.CLASS_NAME, "order-list"),
+        "order_item": (By.CLASS_NAME, "order-item"),
+        "manage_order": (By.NAME, "manage_order"),
+        "order_status_shipped": (By.CLASS_NAME, "order-status-shipped"),
+    }
+
+
+class ProductManagementPage(Page):
+    ROUTE = "seller/products"
+    LOCATORS = {
+        **Page.LOCATORS,
+        "product_management_link": (By.LINK_TEXT, "Product Management"),
+        "add_product": (By.NAME, "add_product"),
+        "edit_product": (By.NAME, "edit_product"),
+        "delete_product": (By.NAME, "delete_product"),
+        "confirm_delete": (By.NAME, "confirm_delete"),
+        "product_name": (By.NAME, "product_name"),
+        "product_price": (By.NAME, "product_price"),
+        "product_description": (By.NAME, "product_description"),
+        "product_image": (By.NAME, "product_image"),
+        "product_category": (By.NAME, "product_category"),
+        "submit_product": (By.NAME, "submit_product"),
+        "product_list": (By.CLASS_NAME, "product-list"),
+        "validation_message": (By.CLASS_NAME, "validation-message"),
+    }
+
+    # Fills the product form; fields left as None are not touched
+    def fill_product(self, clear=False, **fields):
+        for field, value in fields.items():
+            if value is not None:
+                self.fill(f"product_{field}", value, clear=clear)
+        return self
+
+
+# One of each page for a test, sharing the element cache
+class Pages:
+    def __init__(self, driver, env, wait, impact=None):
+        cache = {}
+        self.login = LoginPage(driver, env, wait, cache, impact)
+        self.product = ProductPage(driver, env, wait, cache, impact)
+        self.cart = CartPage(driver, env, wait, cache, impact)
+        self.checkout = CheckoutPage(driver, env, wait, cache, impact)
+        self.orders = OrderHistoryPage(driver, env, wait, cache, impact)
+        self.admin = AdminDashboard(driver, env, wait, cache, impact)
+        self.product_management = ProductManagementPage(driver, env, wait, cache, impact)
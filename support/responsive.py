@@ -0,0 +1,187 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.common.exceptions import WebDriverException
+
+from support.nav_timing import route_of
+
+DEVICES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "devices.json")
+
+# One round-trip per page: horizontal overflow, the outermost elements that
+# stick out of the viewport, and the visibility of every expected selector.
+LAYOUT_SCRIPT = """
+const selectors = arguments[0];
+const root = document.documentElement;
+const vw = root.clientWidth;
+const name = el => el.tagName.toLowerCase() + (el.id ? '#' + el.id : '')
+    + (typeof el.className === 'string' && el.className.trim() ? '.' + el.className.trim().split(/\\s+/).join('.') : '');
+const scrolls = el => {
+    for (let p = el.parentElement; p && p !== document.body; p = p.parentElement) {
+        if (['auto', 'scroll', 'hidden'].includes(getComputedStyle(p).overflowX)) return true;
+    }
+    return false;
+};
+const flagged = new Set();
+const overflowing = [];
+for (const el of document.body.querySelectorAll('*')) {
+    const r = el.getBoundingClientRect();
+    if (!r.width || (r.left >= -1 && r.right <= vw + 1)) continue;
+    if (flagged.has(el.parentElement) || scrolls(el)) { flagged.add(el); continue; }
+    flagged.add(el);
+    if (overflowing.length < 20) overflowing.push(`${name(el)} spans ${Math.round(r.left)}..${Math.round(r.right)}px`);
+}
+const visibility = {};
+for (const selector of selectors) {
+    const el = document.querySelector(selector);
+    if (!el) { visibility[selector] = 'missing'; continue; }
+    const style = getComputedStyle(el);
+    const r = el.getBoundingClientRect();
+    if (style.display === 'none' || style.visibility === 'hidden' || style.opacity === '0' || !r.width || !r.height) {
+        visibility[selector] = 'hidden';
+    } else if (r.right <= 0 || r.left >= vw) {
+        visibility[selector] = 'off-screen';
+    } else {
+        visibility[selector] = 'visible';
+    }
+}
+return {
+    title: document.title,
+    url: location.href,
+    viewport: [vw, root.clientHeight],
+    scroll_width: root.scrollWidth,
+    overflowing: overflowing,
+    visibility: visibility,
+};
+"""
+
+
+# A viewport Chrome emulates through the DevTools protocol
+class Device:
+    def __init__(self, name, width, height, device_scale_factor=1, mobile=False, touch=False, user_agent=None):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.device_scale_factor = device_scale_factor
+        self.mobile = mobile
+        self.touch = touch
+        self.user_agent = user_agent
+
+    def emulate(self, driver):
+        driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", {
+            "width": self.width,
+            "height": self.height,
+            "deviceScaleFactor": self.device_scale_factor,
+            "mobile": self.mobile,
+        })
+        driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": self.touch, "maxTouchPoints": 5})
+        if self.user_agent:
+            driver.execute_cdp_cmd("Emulation.setUserAgentOverride", {"userAgent": self.user_agent})
+
+    def __repr__(self):
+        return f"Device({self.name!r}, {self.width}x{self.height}@{self.device_scale_factor}x)"
+
+
+# Layout problems found on one page for one device
+class PageLayout:
+    def __init__(self, device, route, data=None, title=None, error=None):
+        self.device = device
+        self.route = route
+        self.data = data or {}
+        self.error = error
+        self.problems = []
+        if error:
+            self.problems.append(f"could not be checked: {error}")
+            return
+        if title and title not in self.data["title"]:
+            self.problems.append(f"title {self.data['title']!r} does not contain {title!r}")
+        width = self.data["viewport"][0]
+        if self.data["scroll_width"] > width + 1:
+            self.problems.append(f"scrolls horizontally ({self.data['scroll_width']}px content in a {width}px viewport)")
+        self.problems.extend(f"overflows: {element}" for element in self.data["overflowing"])
+        self.problems.extend(
+            f"{selector} is {state}" for selector, state in self.data["visibility"].items() if state != "visible"
+        )
+
+    @property
+    def ok(self):
+        return not self.problems
+
+
+class ResponsivenessReport:
+    def __init__(self, layouts):
+        self.layouts = layouts
+
+    @property
+    def failures(self):
+        return [layout for layout in self.layouts if not layout.ok]
+
+    def summary(self):
+        lines = [f"{len(self.failures)} of {len(self.layouts)} device/page combination(s) have layout problems"]
+        for layout in self.failures:
+            lines.append(f"  {layout.device.name} /{layout.route}:")
+            lines.extend(f"    {problem}" for problem in layout.problems)
+        return "\n".join(lines)
+
+
+# Runs the page list on every device at once, each device in its own leased
+# browser, and collects every layout problem instead of stopping at the first.
+class ResponsivenessChecker:
+    def __init__(self, pool, env, devices, pages, title=None, visual=None, profile="headless", test="responsiveness"):
+        self.pool = pool
+        self.env = env
+        self.devices = devices
+        self.pages = pages
+        self.title = title
+        # Optional support.visual.VisualRegression: screenshot each page on each device
+        self.visual = visual
+        self.profile = profile
+        self.test = test
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=len(self.devices), thread_name_prefix="device") as executor:
+            results = list(executor.map(self._check_device, self.devices))
+        return ResponsivenessReport([layout for layouts in results for layout in layouts])
+
+    def _check_device(self, device):
+        driver = self.pool.acquire()
+        try:
+            # Emulation sticks to the tab, so it has to be undone before the browser goes back
+            user_agent = driver.execute_script("return navigator.userAgent;")
+            device.emulate(driver)
+            layouts = [self._check_page(driver, device, page) for page in self.pages]
+            driver.execute_cdp_cmd("Emulation.clearDeviceMetricsOverride", {})
+            driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": False})
+            driver.execute_cdp_cmd("Emulation.setUserAgentOverride", {"userAgent": user_agent})
+        except BaseException:
+            # Whatever went wrong, the emulation may still be applied: the browser
+            # can't go back to the pool, but its slot must be freed for the next lease
+            self.pool.discard(driver)
+            raise
+        self.pool.release(driver)
+        return layouts
+
+    def _check_page(self, driver, device, page):
+        try:
+            driver.get(self.env.url(page["route"]))
+            data = driver.execute_script(LAYOUT_SCRIPT, page.get("visible", []))
+            if self.visual:
+                self.visual.capture(
+                    driver, self.profile, f"{self.test}[{device.name}]", route_of(data["url"]), data["viewport"]
+                )
+        except WebDriverException as e:
+            return PageLayout(device, page["route"], error=e.msg)
+        return PageLayout(device, page["route"], data, title=self.title)
+
+
+# The device matrix and page list from devices.json; names picks a subset of devices
+def load_matrix(path=DEVICES_FILE, names=None):
+    with open(path) as f:
+        matrix = json.load(f)
+    devices = {name: Device(name, **spec) for name, spec in matrix["devices"].items()}
+    if names:
+        unknown = [name for name in names if name not in devices]
+        if unknown:
+            raise ValueError(f"Unknown device(s) {', '.join(unknown)}; choose from {', '.join(devices)}")
+        devices = {name: devices[name] for name in names}
+    return list(devices.values()), matrix["pages"], matrix.get("title")
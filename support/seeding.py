@@ -0,0 +1,167 @@
+import re
+import threading
+
+import requests
+
+# Fallback for hosts without the JSON cart: the cart page's remove forms carry
+# the product ids, one form per .cart-item row
+CART_PRODUCT_ID = re.compile(r'action="[^"]*/cart/remove".*?name="product_id" value="(\d+)"', re.S)
+CART_ROW = re.compile(r'class="[^"]*\bcart-item\b')
+EMPTY_CART = "Your cart is empty"
+
+
+# Issued by the seed fixture when cleanup() could not undo something. It shows in
+# pytest's warnings summary; -W error::support.seeding.SeedCleanupWarning fails the run.
+class SeedCleanupWarning(UserWarning):
+    pass
+
+
+# Sets up test data over HTTP instead of clicking through the UI. Every role
+# talks through the same session cookies the SessionCache replays into the
+# browser, so a seeded cart is the cart the test's browser sees. Requests are
+# the form posts the shop's own pages make; ids of created products and orders
+# are read from the JSON answer the shop gives clients that accept it. Whatever
+# is created is undone by cleanup(), newest first.
+class Seeder:
+    def __init__(self, env, session_cache, timeout=None, impact=None):
+        self.env = env
+        self.session_cache = session_cache
+        # Optional support.impact.ImpactRecorder noting the routes seeded through
+        self.impact = impact
+        self.timeout = timeout or env.timeouts["element"]
+        self.requests = 0
+        self._clients = {}
+        self._undo = []
+        self._lock = threading.Lock()
+
+    # --- users ---
+
+    def user(self, role):
+        # A logged-in HTTP client for the role. Reuses the browser's cached
+        # session when there is one, otherwise logs in over HTTP and hands the
+        # cookies to the session cache so login_as(role) skips the UI login too.
+        with self._lock:
+            client = self._clients.get(role)
+        if client is not None:
+            return client
+        client = requests.Session()
+        cookies = self.session_cache.cookies(role)
+        if cookies:
+            for cookie in cookies:
+                client.cookies.set(cookie["name"], cookie["value"], path=cookie.get("path", "/"))
+        else:
+            username, password = self.session_cache.credentials[role]
+            self._touch("login")
+            response = client.post(
+                self.env.url("login"),
+                data={"username": username, "password": password, "login": ""},
+                timeout=self.timeout,
+            )
+            self.requests += 1
+            response.raise_for_status()
+            if "/login" in response.url:
+                raise RuntimeError(f"HTTP login as {role} ({username}) was rejected")
+            self.session_cache.adopt(
+                role,
+                [{"name": c.name, "value": c.value, "path": c.path or "/", "secure": c.secure} for c in client.cookies],
+                landing_url=response.url,
+            )
+        with self._lock:
+            self._clients[role] = client
+        return client
+
+    # --- carts ---
+
+    def cart(self, role, product_id, quantity=1):
+        self._post(role, "cart/add", {"product_id": product_id, "quantity": quantity})
+        self._undo.append((role, "cart/remove", {"product_id": product_id}))
+        return product_id
+
+    def cart_product_ids(self, role):
+        self._touch("cart")
+        response = self.user(role).get(
+            self.env.url("cart"), headers={"Accept": "application/json"}, timeout=self.timeout
+        )
+        self.requests += 1
+        response.raise_for_status()
+        if "json" in response.headers.get("Content-Type", ""):
+            return [int(item["product_id"]) for item in response.json()["items"]]
+
+        # An empty list from a page we can't read would let "empty cart" tests run
+        # against whatever is left in the cart, so only trust markup we recognise
+        product_ids = [int(product_id) for product_id in CART_PRODUCT_ID.findall(response.text)]
+        rows = len(CART_ROW.findall(response.text))
+        if (product_ids and len(product_ids) == rows) or (not rows and EMPTY_CART in response.text):
+            return product_ids
+        raise RuntimeError(
+            f"Can't read the {role} cart from {response.url}: no JSON cart and "
+            f"{rows} cart row(s) but {len(product_ids)} remove form(s)"
+        )
+
+    # Removes whatever earlier tests left in the role's cart
+    def empty_cart(self, role):
+        for product_id in self.cart_product_ids(role):
+            self._post(role, "cart/remove", {"product_id": product_id})
+
+    # --- products ---
+
+    def product(self, role="seller", name="Seeded Product", price="10", description="", category="Electronics"):
+        payload = {
+            "product_name": name,
+            "product_price": str(price),
+            "product_description": description,
+            "product_category": category,
+        }
+        response = self._post(role, "seller/products/new", payload)
+        product_id = self._created("seller/products/new", response, "product_id")
+        self._undo.append((role, f"seller/products/{product_id}/delete", {}))
+        return product_id
+
+    # --- orders ---
+
+    def order(self, role, product_id, quantity=1):
+        # The shop has no endpoint to delete orders; they stay in the history
+        response = self._post(role, "orders", {"product_id": product_id, "quantity": quantity})
+        return self._created("orders", response, "order_id")
+
+    def cleanup(self):
+        errors = []
+        while self._undo:
+            role, route, payload = self._undo.pop()
+            try:
+                self._post(role, route, payload)
+            except (requests.RequestException, RuntimeError) as e:
+                errors.append(f"{route}: {e}")
+        for client in self._clients.values():
+            client.close()
+        self._clients.clear()
+        return errors
+
+    def _touch(self, route):
+        if self.impact is not None:
+            self.impact.route(self.env.path(route))
+
+    def _post(self, role, route, payload):
+        self._touch(route)
+        response = self.user(role).post(
+            self.env.url(route), data=payload, headers={"Accept": "application/json"}, timeout=self.timeout
+        )
+        self.requests += 1
+        response.raise_for_status()
+        # Requests follows the shop's redirect to the login form when a session has expired
+        if "/login" in response.url:
+            self.session_cache.forget(role)
+            with self._lock:
+                self._clients.pop(role, None)
+            raise RuntimeError(f"The {role} session was rejected by POST {self.env.path(route)}")
+        return response
+
+    # The id of what a POST created. Without it nothing could be cleaned up, so
+    # a host that only redirects after the form post is an error, not a guess.
+    def _created(self, route, response, key):
+        if "json" in response.headers.get("Content-Type", ""):
+            return response.json()[key]
+        raise RuntimeError(
+            f"POST {self.env.path(route)} answered {response.url} without a JSON {key}; "
+            "this host can't report what was seeded"
+        )
@@ -0,0 +1,79 @@
+import threading
+
+from selenium.webdriver.common.by import By
+
+from support.waits import Waiter
+
+
+# Logs in through the UI once per role and replays the saved cookies and
+# localStorage into later browsers, so tests start already authenticated.
+class SessionCache:
+    def __init__(self, env, credentials=None, recorder=None):
+        self.env = env
+        self.recorder = recorder
+        self.credentials = credentials or env.credentials
+        self.ui_logins = 0
+        self.restores = 0
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def login(self, driver, role):
+        with self._lock:
+            session = self._sessions.get(role)
+        if session is None:
+            session = self._login_via_ui(driver, role)
+            with self._lock:
+                self._sessions[role] = session
+                self.ui_logins += 1
+        else:
+            self._restore(driver, session)
+            with self._lock:
+                self.restores += 1
+        return driver
+
+    def cookies(self, role):
+        with self._lock:
+            session = self._sessions.get(role)
+        return session["cookies"] if session else None
+
+    # Takes over a session logged in some other way (e.g. over HTTP by the Seeder)
+    def adopt(self, role, cookies, landing_url):
+        with self._lock:
+            self._sessions.setdefault(role, {"cookies": cookies, "local_storage": {}, "landing_url": landing_url})
+
+    def forget(self, role):
+        # Drop a session the site no longer accepts so the next test logs in again
+        with self._lock:
+            self._sessions.pop(role, None)
+
+    def _login_via_ui(self, driver, role):
+        username, password = self.credentials[role]
+        wait = Waiter(driver, self.env.timeouts, recorder=self.recorder, test=f"login:{role}")
+        driver.get(self.env.url("login"))
+        wait.visible((By.NAME, "username"), timeout="login")
+        driver.find_element(By.NAME, "username").send_keys(username)
+        driver.find_element(By.NAME, "password").send_keys(password)
+        driver.find_element(By.NAME, "login").click()
+
+        # The login is done once the site has redirected away from the form
+        wait.until(lambda d: "/login" not in d.current_url, "left /login", timeout="login")
+
+        return {
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script("return Object.assign({}, window.localStorage);"),
+            "landing_url": driver.current_url,
+        }
+
+    def _restore(self, driver, session):
+        # Cookies can only be set for the current origin, so open a cheap page on it first.
+        # Chrome stays put on a 204 or an error without a body, so fall back to the login page.
+        driver.get(f"{self.env.base_url}/favicon.ico")
+        if not driver.current_url.startswith(self.env.base_url):
+            driver.get(self.env.url("login"))
+        for cookie in session["cookies"]:
+            driver.add_cookie(cookie)
+        driver.execute_script(
+            "for (const [k, v] of Object.entries(arguments[0])) { window.localStorage.setItem(k, v); }",
+            session["local_storage"],
+        )
+        driver.get(session["landing_url"])
@@ -0,0 +1,35 @@
+import json
+import os
+import tempfile
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no advisory locks, the atomic replace still keeps the file whole
+    fcntl = None
+
+
+# Read-modify-write of a JSON file shared by parallel pytest-xdist workers.
+# An exclusive lock on a sidecar .lock file serialises the workers, and the
+# result goes to a temp file that is renamed over the original, so nobody
+# ever reads half a file: update_json(path, lambda data: {**data, **mine}, {})
+def update_json(path, update, default):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path + ".lock", "w") as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        data = default
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+        data = update(data)
+        fd, temp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(temp, path)
+        except BaseException:
+            os.unlink(temp)
+            raise
+    return data
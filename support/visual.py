@@ -0,0 +1,226 @@
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from collections import Counter
+
+from selenium.webdriver.support.events import AbstractEventListener
+
+from support.nav_timing import route_of
+from support.shared_json import update_json
+
+# Optional: pip install numpy Pillow (only needed with --visual / --update-baselines)
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    np = Image = None
+
+PAGE_SCRIPT = (
+    "return {origin: performance.timeOrigin, url: location.href, type: document.contentType,"
+    " width: window.innerWidth, height: window.innerHeight};"
+)
+
+# Largest possible weighted YIQ distance between two colours (pixelmatch's scale)
+MAX_YIQ_DELTA = 35215.0
+FAILED = ("changed", "size-changed")
+
+
+def require_imaging():
+    if np is None:
+        raise RuntimeError("Visual regression needs numpy and Pillow: pip install numpy Pillow")
+
+
+# A difference hash per tile of a grid x grid split: each tile is shrunk to 9x8
+# and every bit says whether a sample is brighter than its left neighbour.
+# Hashing tiles keeps a local change from being averaged away by the whole page.
+def perceptual_hash(image, grid=8):
+    gray = image.convert("L").resize((grid * 9, grid * 8), Image.BILINEAR)
+    tiles = np.asarray(gray, dtype=np.int16).reshape(grid, 8, grid, 9)
+    return np.packbits(tiles[..., 1:] > tiles[..., :-1]).tobytes().hex()
+
+
+def hash_distance(a, b):
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+def _yiq(rgb):
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    return np.stack([
+        0.29889531 * r + 0.58662247 * g + 0.11448223 * b,
+        0.59597799 * r - 0.27417610 * g - 0.32180189 * b,
+        0.21147017 * r - 0.52261711 * g + 0.31114694 * b,
+    ], axis=-1)
+
+
+# Boolean mask of pixels that visibly changed. Colours are compared in YIQ
+# (brightness weighted over hue, like pixelmatch), and a pixel only counts if
+# no baseline pixel within `shift` px matches it, so anti-aliasing and
+# one-pixel rendering jitter are not reported as changes.
+def perceptual_diff(actual, expected, threshold=0.1, shift=1):
+    a = _yiq(actual.astype(np.float32))
+    e = np.pad(_yiq(expected.astype(np.float32)), ((shift, shift), (shift, shift), (0, 0)), mode="edge")
+    height, width = a.shape[:2]
+    best = None
+    for dy in range(2 * shift + 1):
+        for dx in range(2 * shift + 1):
+            d = a - e[dy:dy + height, dx:dx + width]
+            delta = 0.5053 * d[..., 0] ** 2 + 0.299 * d[..., 1] ** 2 + 0.1957 * d[..., 2] ** 2
+            best = delta if best is None else np.minimum(best, delta)
+    return best > MAX_YIQ_DELTA * threshold ** 2
+
+
+# The baseline faded to grey with changed pixels in red
+def diff_image(expected, mask):
+    faded = (expected.astype(np.float32).mean(axis=2) * 0.3 + 170).astype(np.uint8)
+    out = np.repeat(faded[..., None], 3, axis=2)
+    out[mask] = (255, 0, 0)
+    return Image.fromarray(out)
+
+
+class VisualResult:
+    def __init__(self, key, test, status, ratio=0.0, pixels=0, actual=None, diff=None, hash_distance=None):
+        self.key = key
+        self.test = test
+        self.status = status
+        self.ratio = ratio
+        self.pixels = pixels
+        self.actual = actual
+        self.diff = diff
+        self.hash_distance = hash_distance
+
+    def describe(self):
+        if self.status == "size-changed":
+            return f"{self.key}: screenshot size changed, see {self.actual}"
+        # A non-zero perceptual hash distance means the layout moved, not just some text
+        layout = f", perceptual hash moved {self.hash_distance} bit(s)" if self.hash_distance else ""
+        return f"{self.key}: {self.pixels} pixel(s) changed ({self.ratio:.3%}{layout}), see {self.diff}"
+
+
+# Compares screenshots against baselines stored as PNGs next to an index.json
+# of content digests and perceptual hashes. Identical bytes are skipped without
+# decoding; everything else gets the pixel diff. The perceptual hash is too
+# coarse to vouch for a page (one changed digit doesn't move it), so it only
+# grades how much a failed page changed. New keys become baselines;
+# --update-baselines replaces the existing ones.
+class VisualRegression:
+    def __init__(self, baseline_dir, output_dir, update=False, threshold=0.1, max_diff=0.0):
+        require_imaging()
+        self.baseline_dir = baseline_dir
+        self.output_dir = output_dir
+        self.update = update
+        self.threshold = threshold
+        self.max_diff = max_diff
+        self.index_path = os.path.join(baseline_dir, "index.json")
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        self.results = []
+        self._written = {}
+        self._seen = Counter()
+        self._lock = threading.Lock()
+
+    def capture(self, driver, profile, test, route, size):
+        png = driver.get_screenshot_as_png()
+        key = f"{profile}/{test}::{route}@{size[0]}x{size[1]}"
+        with self._lock:
+            self._seen[key] += 1
+            if self._seen[key] > 1:
+                key += f"#{self._seen[key]}"
+        return self.compare(key, png, test)
+
+    def compare(self, key, png, test=None):
+        digest = hashlib.sha256(png).hexdigest()
+        entry = self.index.get(key)
+        if entry and not self.update and entry["digest"] == digest:
+            return self._record(VisualResult(key, test, "unchanged"))
+
+        image = Image.open(io.BytesIO(png)).convert("RGB")
+        phash = perceptual_hash(image)
+        if entry is None or self.update:
+            image.save(self._path(self.baseline_dir, key))
+            self._store(key, {"digest": digest, "phash": phash, "size": list(image.size)})
+            return self._record(VisualResult(key, test, "updated" if entry else "new"))
+        actual = self._path(self.output_dir, key)
+        with Image.open(self._path(self.baseline_dir, key)) as baseline:
+            expected = np.asarray(baseline.convert("RGB"))
+        current = np.asarray(image)
+        if current.shape != expected.shape:
+            image.save(actual)
+            pixels = image.width * image.height
+            return self._record(VisualResult(key, test, "size-changed", 1.0, pixels, actual=actual))
+        mask = perceptual_diff(current, expected, self.threshold)
+        pixels = int(mask.sum())
+        ratio = pixels / mask.size
+        if ratio <= self.max_diff:
+            return self._record(VisualResult(key, test, "passed", ratio, pixels))
+        diff = actual[:-len(".png")] + ".diff.png"
+        image.save(actual)
+        diff_image(expected, mask).save(diff)
+        distance = hash_distance(entry["phash"], phash)
+        return self._record(
+            VisualResult(key, test, "changed", ratio, pixels, actual=actual, diff=diff, hash_distance=distance)
+        )
+
+    # Failed comparisons for a test, including parametrised sub-keys like test[mobile]
+    def failures(self, test):
+        with self._lock:
+            return [
+                r for r in self.results
+                if r.status in FAILED and (r.test == test or (r.test or "").startswith(test + "["))
+            ]
+
+    def counts(self):
+        with self._lock:
+            return Counter(r.status for r in self.results)
+
+    def save(self):
+        if not self._written:
+            return
+        # Parallel workers each add their own keys to the same index
+        update_json(self.index_path, lambda index: {**index, **self._written}, {})
+
+    def _store(self, key, entry):
+        with self._lock:
+            self.index[key] = entry
+            self._written[key] = entry
+
+    def _record(self, result):
+        with self._lock:
+            self.results.append(result)
+        return result
+
+    def _path(self, directory, key):
+        profile, _, name = key.partition("/")
+        path = os.path.join(directory, profile, re.sub(r"[^\w.@#-]+", "_", name).strip("_") + ".png")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+
+# Screenshots every new HTML document the test's browser lands on, after driver.get() and clicks
+class VisualListener(AbstractEventListener):
+    def __init__(self, visual, profile, test):
+        self.visual = visual
+        self.profile = profile
+        self.test = test
+        self._last_origin = None
+
+    def after_navigate_to(self, url, driver):
+        self._capture(driver)
+
+    def after_click(self, element, driver):
+        self._capture(driver)
+
+    def _capture(self, driver):
+        try:
+            page = driver.execute_script(PAGE_SCRIPT)
+        except Exception:
+            # Alerts or a page that is mid-unload; nothing to capture
+            return
+        if not page["url"].startswith("http") or page["type"] != "text/html" or page["origin"] == self._last_origin:
+            return
+        self._last_origin = page["origin"]
+        self.visual.capture(driver, self.profile, self.test, route_of(page["url"]), (page["width"], page["height"]))
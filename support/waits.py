@@ -0,0 +1,101 @@
+import json
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+# A wait that used this much of its timeout counts as "close to timing out"
+NEAR_TIMEOUT_RATIO = 0.8
+
+
+def describe(locator):
+    by, value = locator
+    return f"{by}={value}"
+
+
+# Collects how long every wait actually took, across the whole session
+class WaitRecorder:
+    def __init__(self):
+        self.records = []
+
+    def add(self, label, timeout, elapsed, timed_out, test=None):
+        self.records.append(
+            {"label": label, "timeout": timeout, "elapsed": elapsed, "timed_out": timed_out, "test": test}
+        )
+
+    def by_label(self):
+        stats = {}
+        for record in self.records:
+            entry = stats.setdefault(
+                record["label"], {"label": record["label"], "count": 0, "total": 0.0, "max": 0.0, "near_timeout": 0}
+            )
+            entry["count"] += 1
+            entry["total"] += record["elapsed"]
+            entry["max"] = max(entry["max"], record["elapsed"])
+            if record["timed_out"] or record["elapsed"] >= NEAR_TIMEOUT_RATIO * record["timeout"]:
+                entry["near_timeout"] += 1
+        for entry in stats.values():
+            entry["mean"] = entry["total"] / entry["count"]
+        return sorted(stats.values(), key=lambda e: e["mean"], reverse=True)
+
+    def flagged(self):
+        # Selectors that routinely (at least half the time) get close to their timeout
+        return [e for e in self.by_label() if e["near_timeout"] * 2 >= e["count"]]
+
+    def report_lines(self, top=10):
+        lines = [f"{'mean s':>8} {'max s':>8} {'count':>6}  selector"]
+        for entry in self.by_label()[:top]:
+            lines.append(f"{entry['mean']:>8.2f} {entry['max']:>8.2f} {entry['count']:>6}  {entry['label']}")
+        for entry in self.flagged():
+            lines.append(
+                f"near timeout: {entry['label']} ({entry['near_timeout']}/{entry['count']} waits "
+                f"used >= {NEAR_TIMEOUT_RATIO:.0%} of the timeout)"
+            )
+        return lines
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump({"selectors": self.by_label(), "waits": self.records}, f, indent=2)
+
+
+# Explicit waits with one timeout budget per environment. timeout is either
+# seconds or a budget name from the environment ("element", "page_load", ...).
+class Waiter:
+    def __init__(self, driver, timeouts, poll_frequency=0.25, recorder=None, test=None):
+        self.driver = driver
+        self.timeouts = timeouts
+        self.poll_frequency = poll_frequency
+        self.recorder = recorder
+        self.test = test
+
+    def until(self, condition, label, timeout="element"):
+        seconds = self.timeouts[timeout] if isinstance(timeout, str) else timeout
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return WebDriverWait(self.driver, seconds, poll_frequency=self.poll_frequency).until(condition)
+        except TimeoutException:
+            timed_out = True
+            raise
+        finally:
+            if self.recorder is not None:
+                self.recorder.add(label, seconds, time.perf_counter() - started, timed_out, self.test)
+
+    def visible(self, locator, timeout="element"):
+        return self.until(EC.visibility_of_element_located(locator), describe(locator), timeout)
+
+    def present(self, locator, timeout="element"):
+        return self.until(EC.presence_of_element_located(locator), describe(locator), timeout)
+
+    def all_present(self, locator, timeout="element"):
+        return self.until(EC.presence_of_all_elements_located(locator), describe(locator), timeout)
+
+    def clickable(self, locator, timeout="element"):
+        return self.until(EC.element_to_be_clickable(locator), describe(locator), timeout)
+
+    def invisible(self, element, label, timeout="element"):
+        return self.until(EC.invisibility_of_element(element), f"invisible {label}", timeout)
+
+    def alert(self, timeout="element"):
+        return self.until(EC.alert_is_present(), "alert", timeout)
@@ -1,42 +1,23 @@
 import pytest
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
-
-# Setup WebDriver for Chrome
-@pytest.fixture
-def driver():
-    driver = webdriver.Chrome()
-    driver.implicitly_wait(5)
-    yield driver
-    driver.quit()
+from support.crawler import SiteCrawler
+from support.link_checker import LinkCache, LinkChecker
+from support.responsive import ResponsivenessChecker, load_matrix
 
 
 # Test: Verify navigation across pages (Login, Product Listing, Cart, Checkout, Order History)
-def test_navigation(driver):
+def test_navigation(pages):
     print("Starting test: Navigation across pages")
 
-    driver.get("https://lazylizard.click/en/login")
-    
-    try:
-        WebDriverWait(driver, 30).until(EC.visibility_of_element_located((By.NAME, "username")))
-        login_button = driver.find_element(By.NAME, "login")
-        login_button.click()
-
-        WebDriverWait(driver, 30).until(EC.visibility_of_element_located((By.LINK_TEXT, "Product Listing")))
-        driver.find_element(By.LINK_TEXT, "Product Listing").click()
-
-        WebDriverWait(driver, 30).until(EC.visibility_of_element_located((By.LINK_TEXT, "Cart")))
-        driver.find_element(By.LINK_TEXT, "Cart").click()
+    login_page = pages.login.open()
 
-        WebDriverWait(driver, 30).until(EC.visibility_of_element_located((By.LINK_TEXT, "Checkout")))
-        driver.find_element(By.LINK_TEXT, "Checkout").click()
+    try:
+        login_page.wait_for("username", "visible", timeout="page_load")
+        login_page.click("login")
 
-        WebDriverWait(driver, 30).until(EC.visibility_of_element_located((By.LINK_TEXT, "Order History")))
-        driver.find_element(By.LINK_TEXT, "Order History").click()
+        for link in ("product_listing_link", "cart_link", "checkout_link", "order_history_link"):
+            login_page.click(link, until="visible", timeout="page_load")
 
         print("Successfully navigated through all pages.")
 
@@ -44,66 +25,83 @@ def test_navigation(driver):
         print("TimeoutException: Navigation test failed.")
 
 
-# Test: Test responsiveness on different devices (desktop, tablet, mobile)
-def test_responsiveness(driver):
+# Test: Test responsiveness on every device in devices.json (desktop, tablets, phones)
+# Each device gets its own headless browser with Chrome's device emulation (viewport,
+# DPR, touch, user agent); all devices run at once over the same list of pages.
+def test_responsiveness(request, env, browser_pools, impact):
     print("Starting test: Responsiveness on different devices")
 
-    for width, height in [(1920, 1080), (768, 1024), (375, 667)]:
-        driver.set_window_size(width, height)
-        driver.get("https://lazylizard.click/en/login")
-        assert "LazyLizard" in driver.title
-        print(f"Responsive test passed at resolution {width}x{height}")
-
-    print("Successfully tested responsiveness on desktop, tablet, and mobile views.")
+    names = request.config.getoption("--devices")
+    try:
+        devices, page_list, title = load_matrix(
+            request.config.getoption("--devices-file"), names.split(",") if names else None
+        )
+    except ValueError as e:
+        pytest.fail(str(e), pytrace=False)
+
+    if impact is not None:
+        for page in page_list:
+            impact.route(env.path(page["route"]))
+
+    pool = browser_pools("headless", size=len(devices))
+    visual = request.config._visual
+    checker = ResponsivenessChecker(
+        pool, env, devices, page_list, title=title, visual=visual, test=request.node.nodeid
+    )
+    report = checker.run()
+    print(f"Checked {len(page_list)} page(s) on {len(devices)} device(s): {', '.join(d.name for d in devices)}")
+    assert not report.failures, report.summary()
+
+    # With --visual, every device's screenshots are compared to their baselines too
+    changed = visual.failures(request.node.nodeid) if visual else []
+    assert not changed, "Visual regression:\n" + "\n".join(r.describe() for r in changed)
 
 
 # Test: Check for broken links or missing images
-def test_broken_links_and_missing_images(driver):
-    import requests
+def test_broken_links_and_missing_images(driver, env):
     print("Starting test: Broken links and missing images")
 
-    driver.get("https://lazylizard.click/en/")
-
-    # Check for broken links
-    links = driver.find_elements(By.TAG_NAME, "a")
-    for link in links:
-        url = link.get_attribute("href")
-        if url and url.startswith("http"):
-            try:
-                response = requests.head(url, allow_redirects=True, timeout=10)
-                assert response.status_code < 400
-                print(f"Link OK: {url}")
-            except Exception as e:
-                print(f"Broken link: {url} - {e}")
-
-    # Check for missing images
-    images = driver.find_elements(By.TAG_NAME, "img")
-    for img in images:
-        src = img.get_attribute("src")
-        if src and src.startswith("http"):
-            try:
-                response = requests.head(src, allow_redirects=True, timeout=10)
-                assert response.status_code < 400
-                print(f"Image OK: {src}")
-            except Exception as e:
-                print(f"Missing image: {src} - {e}")
+    driver.get(env.url())
+
+    # Collect every link and image URL in one round-trip
+    found = driver.execute_script(
+        "return {links: Array.from(document.links, a => a.href), images: Array.from(document.images, i => i.src)};"
+    )
+    urls = [(url, "link") for url in found["links"]] + [(src, "image") for src in found["images"]]
+
+    report = LinkChecker().check(urls)
+    assert not report.broken, report.summary()
+
+
+# Test: Crawl the site and check links and images on every page reached
+def test_site_crawl_broken_links(request, env):
+    print("Starting test: Site crawl for broken links and missing images")
+
+    cache = LinkCache(request.config.getoption("--link-cache"), ttl=request.config.getoption("--link-cache-ttl"))
+    crawler = SiteCrawler(
+        env.url(),
+        max_depth=request.config.getoption("--crawl-depth"),
+        max_pages=request.config.getoption("--crawl-max-pages"),
+        cache=cache,
+    )
+    report = crawler.crawl()
+    print(f"Crawled {len(report.pages)} page(s), checked {len(report.results)} URL(s)")
+    assert not report.broken, report.summary()
 
 
 # Test: Ensure buttons, menus, and popups function as expected
-def test_buttons_menus_popups(driver):
+def test_buttons_menus_popups(driver, pages, wait):
     print("Starting test: Buttons, menus, and popups functionality")
 
-    driver.get("https://lazylizard.click/en/login")
+    login_page = pages.login.open()
 
     try:
-        login_button = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.NAME, "login")))
-        login_button.click()
+        login_page.click("login", until="clickable")
 
-        menu_button = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.LINK_TEXT, "Product Listing")))
-        menu_button.click()
+        login_page.click("product_listing_link", until="clickable")
 
         try:
-            WebDriverWait(driver, 5).until(EC.alert_is_present())
+            wait.alert(timeout=5)
             alert = driver.switch_to.alert
             alert.accept()
         except TimeoutException:
@@ -116,26 +114,20 @@ def test_buttons_menus_popups(driver):
 
 
 # Test: Validate proper error messages for incorrect user actions
-def test_error_messages(driver):
+def test_error_messages(pages):
     print("Starting test: Error messages for incorrect user actions")
 
-    driver.get("https://lazylizard.click/en/login")
+    login_page = pages.login.open()
 
     try:
-        username_field = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.NAME, "username")))
-        password_field = driver.find_element(By.NAME, "password")
-        login_button = driver.find_element(By.NAME, "login")
-
-        username_field.send_keys("wronguser")
-        password_field.send_keys("wrongpass")
-        login_button.click()
+        login_page.wait_for("username")
+        login_page.login(username="wronguser", password="wrongpass")
 
-        error_element = WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.CLASS_NAME, "error-message")))
-        assert "Invalid username" in error_element.text or "password" in error_element.text.lower()
+        error_text = login_page.wait_for("error", "visible").text
+        assert "Invalid username" in error_text or "password" in error_text.lower()
         print("Error message for incorrect login credentials verified.")
 
     except TimeoutException:
         print("TimeoutException: Failed to verify error message.")
     except NoSuchElementException:
         print("NoSuchElementException: Error element not found.")
-
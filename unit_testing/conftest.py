@@ -0,0 +1,73 @@
+import os
+import sys
+
+# The Locust plugins import each other as top-level modules (from slo import Sample)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "performance_testing"))
+
+# Importing locust would otherwise gevent-patch the whole pytest process, Selenium suites included
+os.environ.setdefault("LOCUST_SKIP_MONKEY_PATCH", "1")
+
+import pytest  # noqa: E402
+
+from support.fake_shop import FakeShop  # noqa: E402
+
+
+# A fresh stand-in shop on an ephemeral port
+@pytest.fixture
+def shop():
+    shop = FakeShop(product_count=30).start()
+    yield shop
+    shop.stop()
+
+
+# Just enough of a WebDriver for the pool and the page checks: every call is
+# recorded, and execute_script answers from `scripts` (a callable or a value)
+class FakeDriver:
+    def __init__(self, scripts=None):
+        self.scripts = scripts
+        self.calls = []
+        self.current_url = "about:blank"
+        self.window_size = {"width": 1280, "height": 800}
+        self.quit_calls = 0
+
+    def execute_script(self, script, *args):
+        self.calls.append(("execute_script", script))
+        return self.scripts(script, *args) if callable(self.scripts) else self.scripts
+
+    def execute_cdp_cmd(self, command, params):
+        self.calls.append((command, params))
+
+    def get(self, url):
+        self.calls.append(("get", url))
+        self.current_url = url
+
+    def get_window_size(self):
+        return dict(self.window_size)
+
+    def set_window_size(self, width, height):
+        self.window_size = {"width": width, "height": height}
+
+    def delete_all_cookies(self):
+        self.calls.append(("delete_all_cookies",))
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+# A driver factory for BrowserPool that remembers what it launched
+@pytest.fixture
+def fake_drivers():
+    launched = []
+
+    def factory(scripts=None):
+        def launch():
+            driver = FakeDriver(scripts)
+            launched.append(driver)
+            return driver
+        return launch
+
+    factory.launched = launched
+    return factory
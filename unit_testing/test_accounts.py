@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from support.accounts import AccountAllocator, current_worker_id, worker_index
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "accounts.example.json")
+
+
+def accounts(count, products=None):
+    data = {
+        role: [{"username": f"{role}_{i}", "password": f"{role}_password"} for i in range(count)]
+        for role in ("buyer", "seller", "admin")
+    }
+    data["products"] = products if products is not None else list(range(100, 100 + count))
+    return data
+
+
+@pytest.mark.parametrize("worker_id, index", [("gw0", 0), ("gw3", 3), ("gw12", 12), ("master", 0), ("gw", 0), ("gwx", 0)])
+def test_worker_index(worker_id, index):
+    assert worker_index(worker_id) == index
+
+
+def test_current_worker_id(monkeypatch):
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    assert current_worker_id() == "master"
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw5")
+    assert current_worker_id() == "gw5"
+
+
+def test_workers_get_their_own_accounts():
+    allocator = AccountAllocator(accounts(3))
+    allocated = [allocator.allocate(worker) for worker in ("gw0", "gw1", "gw2")]
+    assert [a.credentials["buyer"][0] for a in allocated] == ["buyer_0", "buyer_1", "buyer_2"]
+    assert [a.product_id for a in allocated] == [100, 101, 102]
+    # A serial run is worker 0
+    assert allocator.allocate("master").credentials == allocated[0].credentials
+
+
+def test_more_workers_than_accounts():
+    allocator = AccountAllocator(accounts(2))
+    with pytest.raises(ValueError, match="gw2 needs buyer account #3 but only 2"):
+        allocator.allocate("gw2")
+    with pytest.raises(ValueError, match="gw1 needs product #2 but only 1"):
+        AccountAllocator(accounts(2, products=[7])).allocate("gw1")
+
+
+def test_environment_credentials_serve_a_serial_run_only():
+    allocator = AccountAllocator.from_credentials({role: (f"{role}_username", "pw") for role in ("buyer", "seller", "admin")})
+    assert allocator.allocate("master").product_id == 1
+    with pytest.raises(ValueError):
+        allocator.allocate("gw1")
+
+
+def test_example_file_allocates():
+    allocator = AccountAllocator.from_file(EXAMPLE)
+    assert allocator.allocate("gw0").credentials["admin"]
@@ -0,0 +1,121 @@
+import threading
+import time
+
+import pytest
+
+from support.browser_pool import BrowserPool
+
+
+def test_idle_browsers_are_reused_last_in_first_out(fake_drivers):
+    pool = BrowserPool(size=3, factory=fake_drivers())
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+    # The most recently used browser is the warmest
+    assert pool.acquire() is second
+    assert pool.acquire() is first
+    assert pool.launches == 2 and pool.leases == 4
+
+
+def test_release_resets_the_browser(fake_drivers):
+    pool = BrowserPool(size=1, factory=fake_drivers())
+    driver = pool.acquire()
+    driver.current_url = "http://shop.test/en/cart"
+    driver.set_window_size(375, 667)
+    pool.release(driver)
+    assert ("delete_all_cookies",) in driver.calls
+    assert driver.calls[-1] == ("get", "about:blank")
+    assert driver.get_window_size() == {"width": 1280, "height": 800}
+
+
+def test_slot_is_reserved_before_the_launch(fake_drivers):
+    launch = fake_drivers()
+
+    def slow_launch():
+        time.sleep(0.2)
+        return launch()
+
+    pool = BrowserPool(size=2, factory=slow_launch)
+    leased, timed_out = [], []
+
+    def lease():
+        try:
+            leased.append(pool.acquire(timeout=0.1))
+        except TimeoutError:
+            timed_out.append(True)
+
+    threads = [threading.Thread(target=lease) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Four threads raced for two slots while the launches were still running
+    assert len(fake_drivers.launched) == 2
+    assert (len(leased), len(timed_out)) == (2, 2)
+
+
+def test_discard_frees_the_slot(fake_drivers):
+    pool = BrowserPool(size=1, factory=fake_drivers())
+    driver = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.1)
+    pool.discard(driver)
+    assert driver.quit_calls == 1
+    assert pool.acquire(timeout=1) is fake_drivers.launched[1]
+
+
+def test_browser_that_cannot_reset_is_discarded(fake_drivers):
+    pool = BrowserPool(size=1, factory=fake_drivers())
+    driver = pool.acquire()
+
+    def gone():
+        raise RuntimeError("browser crashed")
+
+    driver.delete_all_cookies = gone
+    pool.release(driver)
+    assert driver.quit_calls == 1
+    assert pool.acquire(timeout=1) is not driver
+
+
+def test_failed_launch_gives_the_slot_back(fake_drivers):
+    launch = fake_drivers()
+    attempts = []
+
+    def devtools_gone():
+        raise RuntimeError("devtools gone")
+
+    def flaky():
+        driver = launch()
+        attempts.append(driver)
+        if len(attempts) == 1:
+            driver.get_window_size = devtools_gone
+        return driver
+
+    pool = BrowserPool(size=1, factory=flaky)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    assert attempts[0].quit_calls == 1
+    assert pool.acquire(timeout=1) is attempts[1]
+    assert pool.launches == 1
+
+
+def test_saved_seconds(fake_drivers):
+    pool = BrowserPool(size=1, factory=fake_drivers())
+    assert pool.saved_seconds() == 0.0
+    for _ in range(4):
+        pool.release(pool.acquire())
+    pool.launch_seconds = 2.0
+    # One launch for four leases: three launches avoided at 2s each
+    assert pool.saved_seconds() == 6.0
+
+
+def test_size_must_be_positive():
+    with pytest.raises(ValueError):
+        BrowserPool(size=0)
+
+
+def test_close_quits_everything(fake_drivers):
+    pool = BrowserPool(size=2, factory=fake_drivers())
+    pool.acquire(), pool.acquire()
+    pool.close()
+    assert [driver.quit_calls for driver in fake_drivers.launched] == [1, 1]
@@ -0,0 +1,87 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from support.crawler import SiteCrawler
+from support.link_checker import LinkCache, LinkChecker
+
+
+def checked(report):
+    return {r.url: r for r in report.results}
+
+
+def test_relative_links_resolve_against_the_redirected_url(shop):
+    # / redirects to /en/, whose "products" link means /en/products, not /products
+    report = SiteCrawler(shop.base_url + "/", max_depth=0).crawl()
+    results = checked(report)
+    assert report.pages == [shop.base_url + "/"]
+    assert results[shop.base_url + "/en/products"].status == 200
+    assert shop.base_url + "/products" not in results
+    assert not report.broken, report.summary()
+
+
+def test_depth_limit(shop):
+    start = shop.base_url + "/en/"
+    shallow = SiteCrawler(start, max_depth=0).crawl()
+    linked = {r.url for r in shallow.results if "link" in r.kinds and r.url.startswith(shop.base_url)}
+    report = SiteCrawler(start, max_depth=1, max_pages=1000).crawl()
+    # Depth 1 crawls exactly the start page and the pages it links to
+    assert set(report.pages) == linked | {start}
+
+
+def test_page_budget(shop):
+    report = SiteCrawler(shop.base_url + "/en/", max_depth=3, max_pages=4).crawl()
+    assert len(report.pages) == 4
+
+
+def test_stale_pages_are_revalidated(shop, tmp_path):
+    path = str(tmp_path / "links.json")
+    first = SiteCrawler(shop.base_url + "/", max_depth=0, cache=LinkCache(path)).crawl()
+
+    # ttl=0: every entry is stale, so the page goes out as a conditional GET
+    statuses = []
+    checker = LinkChecker(cache=LinkCache(path, ttl=0))
+    checker.session.hooks["response"].append(lambda r, *a, **k: statuses.append((r.request.method, r.url, r.status_code)))
+    second = SiteCrawler(shop.base_url + "/", max_depth=0, checker=checker, cache=checker.cache).crawl()
+
+    assert ("GET", shop.base_url + "/en/", 304) in statuses
+    # The links recorded on the first run are reused, still resolved against /en/
+    assert checked(second).keys() == checked(first).keys()
+    assert not second.broken, second.summary()
+
+
+def test_fresh_pages_come_from_the_cache(shop, tmp_path):
+    path = str(tmp_path / "links.json")
+    start = shop.base_url + "/"
+    SiteCrawler(start, max_depth=0, cache=LinkCache(path)).crawl()
+    # Nothing is fetched while the entries are fresh, so the shop can go away
+    shop.stop()
+    report = SiteCrawler(start, max_depth=0, cache=LinkCache(path)).crawl()
+    assert {r.method for r in report.results} == {"CACHED"}
+
+
+class BaseHrefPage(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        body = b'<base href="/assets/"><a href="guide.html">Guide</a><img src="logo.png">'
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_base_href_wins_over_the_page_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BaseHrefPage)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        crawler = SiteCrawler(base + "/docs/index.html", max_depth=0, checker=LinkChecker(session=requests.Session()))
+        results = checked(crawler.crawl())
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert {base + "/assets/guide.html", base + "/assets/logo.png"} <= results.keys()
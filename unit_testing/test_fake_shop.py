@@ -0,0 +1,89 @@
+import http.client
+import json
+from urllib.parse import urlsplit
+
+import pytest
+
+from support.fake_shop import FakeShopHandler
+
+
+@pytest.fixture
+def conn(shop):
+    conn = http.client.HTTPConnection(urlsplit(shop.base_url).netloc, timeout=5)
+    yield conn
+    conn.close()
+
+
+def request(conn, method, path, body=None, headers=None):
+    conn.request(method, path, body=body, headers=headers or {})
+    response = conn.getresponse()
+    return response, response.read()
+
+
+def test_bad_query_is_a_400(conn):
+    response, body = request(conn, "GET", "/en/products?page=abc")
+    assert response.status == 400
+    assert b"ValueError" in body
+
+
+def test_invalid_json_is_a_400(conn):
+    response, body = request(conn, "POST", "/en/cart/add", "{not json", {"Content-Type": "application/json"})
+    assert response.status == 400
+    assert "JSONDecodeError" in json.loads(body)["error"]
+
+
+def test_handler_exception_is_a_500_on_a_live_connection(conn, monkeypatch):
+    def broken(self):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(FakeShopHandler, "checkout", broken)
+    response, body = request(conn, "GET", "/en/checkout")
+    assert response.status == 500
+    assert b"RuntimeError: boom" in body
+    assert response.getheader("Connection") != "close"
+
+    socket = conn.sock
+    response, _ = request(conn, "GET", "/en/products")
+    assert response.status == 200
+    # Same socket: the error did not cost the client its connection
+    assert conn.sock is socket
+
+
+def test_bad_form_input_keeps_the_connection(conn):
+    response, _ = request(conn, "POST", "/en/cart/update", "product_id=x", {
+        "Content-Type": "application/x-www-form-urlencoded",
+    })
+    assert response.status == 400
+    assert response.getheader("Connection") != "close"
+
+
+def test_unread_body_closes_the_connection(conn):
+    # The body can't be read past a broken Content-Length, so it would sit in front of the next request
+    response, _ = request(conn, "POST", "/en/cart/add", "product_id=1", {
+        "Content-Type": "application/x-www-form-urlencoded", "Content-Length": "twelve",
+    })
+    assert response.status == 400
+    assert response.getheader("Connection") == "close"
+
+
+def test_head_has_headers_but_no_body(conn):
+    response, body = request(conn, "HEAD", "/en/products")
+    assert response.status == 200
+    assert int(response.getheader("Content-Length")) > 0
+    assert body == b""
+    # The connection stays usable after a bodiless response
+    response, body = request(conn, "GET", "/en/products")
+    assert response.status == 200 and b"product-list" in body
+
+
+def test_unknown_product_is_a_404(shop):
+    conn = http.client.HTTPConnection(urlsplit(shop.base_url).netloc, timeout=5)
+    response, _ = request(conn, "POST", "/en/login", "username=admin_username&password=admin_password&login=", {
+        "Content-Type": "application/x-www-form-urlencoded",
+    })
+    cookie = response.getheader("Set-Cookie").split(";")[0]
+    response, _ = request(conn, "POST", "/en/admin/products/99999", "approve_product=Approved", {
+        "Content-Type": "application/x-www-form-urlencoded", "Cookie": cookie,
+    })
+    conn.close()
+    assert response.status == 404
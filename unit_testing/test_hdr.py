@@ -0,0 +1,40 @@
+from hdr import HdrHistogram
+
+VALUES = [(150, 3), (2_500, 5), (48_000, 1), (1_200_000, 1)]
+# The same values encoded by the reference hdrhistogram package (HdrHistogram(1, 3600000000, 3))
+REFERENCE = "HISTFAAAACx4nJNpmSzMwMDAwwABzFCaEURcm7yEwf4DRGA1E9tURa6PzkyvvZgAon8Icw=="
+
+
+def histogram():
+    h = HdrHistogram()
+    for value, count in VALUES:
+        h.record(value, count)
+    return h
+
+
+def test_percentiles_within_precision():
+    h = HdrHistogram()
+    for value in range(1, 10_001):
+        h.record(value)
+    for percentile in (50, 90, 99, 99.9):
+        expected = percentile / 100 * 10_000
+        assert abs(h.value_at_percentile(percentile) - expected) <= expected * 0.001
+    assert h.value_at_percentile(100) == 10_000
+    assert h.values_at_percentiles([50, 99]) == {50: h.value_at_percentile(50), 99: h.value_at_percentile(99)}
+
+
+def test_percentiles_match_reference():
+    assert histogram().values_at_percentiles([50, 90, 99]) == {50: 2501, 90: 48031, 99: 1200000}
+
+
+def test_encode_matches_reference():
+    assert histogram().encode() == REFERENCE
+
+
+def test_decode_round_trip():
+    h = histogram()
+    decoded = HdrHistogram.decode(h.encode())
+    assert decoded.sparse() == h.sparse()
+    assert decoded.total_count == 10
+    assert decoded.values_at_percentiles([50, 90]) == {50: 2501, 90: 48031}
+    assert HdrHistogram.decode(REFERENCE).sparse() == h.sparse()
@@ -0,0 +1,55 @@
+import pytest
+from locust.env import Environment
+from selenium.webdriver.remote.webdriver import WebDriver
+
+import hybrid
+
+
+# Passes EventFiringWebDriver's type check without starting a browser
+class FakeChrome(WebDriver):
+    launched = []
+
+    def __init__(self, options=None):
+        self.quit_calls = 0
+        FakeChrome.launched.append(self)
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+class RejectedLogin:
+    def __init__(self, env, credentials=None):
+        pass
+
+    def login(self, driver, role):
+        raise RuntimeError("login rejected")
+
+
+@pytest.fixture
+def shopper(monkeypatch):
+    FakeChrome.launched = []
+    monkeypatch.setattr(hybrid.webdriver, "Chrome", FakeChrome)
+    return hybrid.BrowserShopper(Environment(user_classes=[hybrid.BrowserShopper]))
+
+
+def test_failed_login_quits_the_browser(shopper, monkeypatch):
+    monkeypatch.setattr(hybrid, "SessionCache", RejectedLogin)
+    with pytest.raises(RuntimeError, match="login rejected"):
+        shopper.on_start()
+    assert [chrome.quit_calls for chrome in FakeChrome.launched] == [1]
+    shopper.on_stop()
+    assert FakeChrome.launched[0].quit_calls == 1
+
+
+def test_failed_launch_leaves_nothing_to_stop(shopper, monkeypatch):
+    def no_chrome(options=None):
+        raise hybrid.WebDriverException("chrome not reachable")
+
+    monkeypatch.setattr(hybrid.webdriver, "Chrome", no_chrome)
+    with pytest.raises(hybrid.WebDriverException):
+        shopper.on_start()
+    shopper.on_stop()
+    assert shopper.driver is None
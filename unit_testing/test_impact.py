@@ -0,0 +1,62 @@
+import pytest
+
+from support.environment import Environment
+from support.impact import ImpactIndex, ImpactRecorder, changed_route_patterns
+
+CHECKOUT = "functional_testing/test_checkout.py::test_checkout_empty_cart"
+EDIT = "functional_testing/test_product_management.py::test_edit_product"
+
+
+@pytest.fixture
+def env():
+    return Environment("test", "http://shop.test")
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = ImpactIndex(str(tmp_path / "impact.json"))
+    checkout = ImpactRecorder()
+    checkout.route("http://shop.test/en/checkout")
+    checkout.route("/en/cart")
+    checkout.selector(("class name", "cart-empty-error"))
+    index.record(CHECKOUT, checkout)
+    edit = ImpactRecorder()
+    edit.route("http://shop.test/en/seller/products/17/edit?msg=saved")
+    index.record(EDIT, edit)
+    index.record("ui_ux_testing/user_experience.py::test_site_crawl_broken_links", ImpactRecorder())
+    index.save()
+    return ImpactIndex(index.path)
+
+
+def test_routes_are_recorded_without_ids_or_queries(index):
+    assert index.tests[EDIT]["routes"] == ["/en/seller/products/<id>/edit"]
+
+
+def test_tests_that_recorded_nothing_stay_unknown(index):
+    assert index.affected("ui_ux_testing/user_experience.py::test_site_crawl_broken_links", ["/en/checkout"]) is None
+
+
+def test_route_and_glob_selection(index, env):
+    patterns, unmapped = changed_route_patterns(["checkout"], env)
+    assert (patterns, unmapped) == (["/en/checkout"], [])
+    assert index.affected(CHECKOUT, patterns) is True
+    assert index.affected(EDIT, patterns) is False
+    assert index.affected(EDIT, changed_route_patterns(["/en/seller/*"], env)[0]) is True
+
+
+def test_selector_fragments(index):
+    assert index.affected(CHECKOUT, selectors=["cart-empty"]) is True
+    assert index.affected(EDIT, selectors=["cart-empty"]) is False
+
+
+def test_unmapped_template_is_reported_not_guessed(env):
+    assert changed_route_patterns(["templates/checkout.html"], env) == ([], ["templates/checkout.html"])
+    mapped = changed_route_patterns(["templates/checkout.html"], env, {"templates/checkout*.html": ["checkout"]})
+    assert mapped == (["/en/checkout"], [])
+
+
+def test_changes_no_test_touched_are_unknown(index):
+    assert index.unknown(["/en/chekout", "/en/checkout"], ["cart-empty", "no-such-class"]) == [
+        "/en/chekout",
+        "no-such-class",
+    ]
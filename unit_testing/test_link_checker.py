@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from support.link_checker import LinkCache, LinkChecker
+
+
+# /head-405 and friends reject HEAD with that status but serve GET;
+# /slow/* holds each request for a moment so concurrency can be measured
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self.respond()
+
+    def do_GET(self):
+        self.respond()
+
+    def respond(self):
+        server = self.server
+        with server.lock:
+            server.hits[(self.command, self.path)] += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            if self.path.startswith("/slow/"):
+                time.sleep(0.1)
+            status = 200
+            if self.path.startswith("/head-") and self.command == "HEAD":
+                status = int(self.path[len("/head-"):])
+            elif self.path == "/missing":
+                status = 404
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.hits = Counter()
+    server.in_flight = server.max_in_flight = 0
+    server.base_url = f"http://127.0.0.1:{server.server_port}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_duplicate_urls_are_checked_once(stub):
+    url = stub.base_url + "/page"
+    report = LinkChecker().check([(url, "link"), (url, "image"), (url + "#top", "link"), ("mailto:x@y.z", "link")])
+    assert len(report.results) == 1
+    assert report.results[0].kinds == {"link", "image"}
+    assert stub.hits == {("HEAD", "/page"): 1}
+
+
+def test_per_host_cap(stub):
+    urls = [(f"{stub.base_url}/slow/{i}", "link") for i in range(8)]
+    report = LinkChecker(max_workers=8, per_host=2).check(urls)
+    assert not report.broken, report.summary()
+    assert stub.max_in_flight == 2
+
+
+@pytest.mark.parametrize("status", [403, 405, 501])
+def test_rejected_head_falls_back_to_get(stub, status):
+    result = LinkChecker().check([(f"{stub.base_url}/head-{status}", "link")]).results[0]
+    assert (result.method, result.status, result.ok) == ("GET", 200, True)
+
+
+def test_broken_link_is_reported(stub):
+    report = LinkChecker().check([(stub.base_url + "/missing", "link")])
+    assert [(r.status, r.method) for r in report.broken] == [(404, "HEAD")]
+    assert stub.hits == {("HEAD", "/missing"): 1}
+
+
+def test_not_modified_keeps_the_cached_status(shop, tmp_path):
+    url = shop.base_url + "/static/img/product-1.svg"
+    path = str(tmp_path / "links.json")
+    cache = LinkCache(path)
+    LinkChecker(cache=cache).check([(url, "image")])
+    checked_at = cache.get(url)["checked_at"]
+    assert cache.get(url)["etag"] == '"img-1"'
+    cache.save()
+
+    # ttl=0: the entry is stale, so it is revalidated with If-None-Match
+    cache = LinkCache(path, ttl=0)
+    checker = LinkChecker(cache=cache)
+    statuses = []
+    checker.session.hooks["response"].append(lambda r, *a, **k: statuses.append(r.status_code))
+    result = checker.check([(url, "image")]).results[0]
+    assert statuses == [304]
+    assert (result.status, result.method) == (200, "HEAD")
+    assert cache.get(url)["checked_at"] > checked_at
+
+
+def test_cache_entries_expire_after_ttl(stub, tmp_path):
+    url = stub.base_url + "/page"
+    cache = LinkCache(str(tmp_path / "links.json"), ttl=60)
+    checker = LinkChecker(cache=cache)
+    checker.check([(url, "link")])
+    assert checker.check([(url, "link")]).results[0].method == "CACHED"
+    assert stub.hits[("HEAD", "/page")] == 1
+
+    cache.get(url)["checked_at"] -= 61
+    assert checker.check([(url, "link")]).results[0].method == "HEAD"
+    assert stub.hits[("HEAD", "/page")] == 2
+
+
+def test_cache_survives_a_save(tmp_path):
+    path = str(tmp_path / "links.json")
+    cache = LinkCache(path)
+    cache.put("https://example.com/", 200, {"ETag": '"abc"'})
+    cache.save()
+    entry = LinkCache(path).get("https://example.com/")
+    assert (entry["status"], entry["etag"]) == (200, '"abc"')
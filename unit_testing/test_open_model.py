@@ -0,0 +1,49 @@
+import argparse
+import time
+
+from locust.env import Environment
+
+from open_model import IntendedTimeRequestEvent, LatencyRecorder, OpenModelShopper
+
+OPTIONS = argparse.Namespace(arrival_rate=2, arrivals="constant", max_in_flight=7)
+
+
+def test_client_keeps_fast_http_user_settings():
+    class Shopper(OpenModelShopper):
+        host = "http://shop.test"
+        default_headers = {"X-Run": "open-model"}
+
+    environment = Environment(user_classes=[Shopper], parsed_options=OPTIONS)
+    client = Shopper(environment).client
+    assert client.base_url == "http://shop.test"
+    assert client.client.default_headers["X-Run"] == "open-model"
+    assert isinstance(client.request_event, IntendedTimeRequestEvent)
+    assert client.request_event.request_event is environment.events.request
+
+
+def test_response_time_counts_from_the_intended_send_time():
+    fired = []
+
+    class Event:
+        def fire(self, **meta):
+            fired.append(meta)
+
+    recorder = LatencyRecorder()
+    event = IntendedTimeRequestEvent(Event(), recorder)
+    event.fire(request_type="GET", name="/en/cart", response_time=5, context={"intended_at": time.perf_counter() - 0.2})
+    event.fire(request_type="GET", name="/en/cart", response_time=5, context={})
+    assert fired[0]["response_time"] >= 200
+    assert fired[1]["response_time"] == 5
+    assert recorder.corrected["GET /en/cart"].total_count == 1
+
+
+def test_worker_histograms_merge_on_the_master():
+    master = LatencyRecorder()
+    for service_ms in (10, 30):
+        worker = LatencyRecorder()
+        worker.record("GET /en/cart", 1000 * 1000, service_ms * 1000)
+        master.add(worker.take())
+        assert worker.corrected == {}
+    assert master.corrected["GET /en/cart"].total_count == 2
+    assert master.service["GET /en/cart"].max_value >= 30_000
+    assert master.service["GET /en/cart"].value_at_percentile(50) < 11_000
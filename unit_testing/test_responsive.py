@@ -0,0 +1,39 @@
+import pytest
+
+from support.browser_pool import BrowserPool
+from support.environment import Environment
+from support.responsive import Device, ResponsivenessChecker
+
+ENV = Environment("test", "http://shop.test")
+LAYOUT = {
+    "title": "LazyLizard - Cart", "url": "http://shop.test/en/cart", "viewport": [375, 667], "scroll_width": 375,
+    "overflowing": [], "visibility": {".cart-items": "visible", "nav": "hidden"},
+}
+
+
+def scripts(layout):
+    def answer(script, *args):
+        return "UA" if script == "return navigator.userAgent;" else layout
+    return answer
+
+
+def test_layout_problems_and_the_browser_goes_back(fake_drivers):
+    pool = BrowserPool(size=1, factory=fake_drivers(scripts(LAYOUT)))
+    checker = ResponsivenessChecker(pool, ENV, [Device("mobile", 375, 667, mobile=True)], [{"route": "cart"}], "LazyLizard")
+    report = checker.run()
+    assert [layout.problems for layout in report.layouts] == [["nav is hidden"]]
+    driver = fake_drivers.launched[0]
+    # Emulation is undone before the browser is returned for the next lease
+    assert ("Emulation.clearDeviceMetricsOverride", {}) in driver.calls
+    assert pool.acquire(timeout=1) is driver
+
+
+def test_unexpected_error_frees_the_pool_slot(fake_drivers):
+    # A page answering without the fields the layout check reads
+    pool = BrowserPool(size=1, factory=fake_drivers(scripts({"title": "LazyLizard"})))
+    checker = ResponsivenessChecker(pool, ENV, [Device("desktop", 1920, 1080)], [{"route": ""}], "LazyLizard")
+    with pytest.raises(KeyError):
+        checker.run()
+    assert fake_drivers.launched[0].quit_calls == 1
+    # The slot was given up, so a new browser can be leased straight away
+    assert pool.acquire(timeout=1) is fake_drivers.launched[1]
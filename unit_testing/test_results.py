@@ -0,0 +1,25 @@
+import pytest
+
+from results import mann_whitney
+
+
+def test_separated_samples():
+    # Ranks 1-3 against 4-6: U = 0, z = -4.5 / sqrt(5.25)
+    slower, p_value = mann_whitney({1: 1, 2: 1, 3: 1}, {4: 1, 5: 1, 6: 1})
+    assert slower == 0.0
+    assert p_value == pytest.approx(0.049535, abs=1e-6)
+    slower, p_value = mann_whitney({4: 1, 5: 1, 6: 1}, {1: 1, 2: 1, 3: 1})
+    assert slower == 1.0
+    assert p_value == pytest.approx(0.049535, abs=1e-6)
+
+
+def test_ties_use_mid_ranks_and_tie_correction():
+    # 10,10,10,20,20,30 vs 20,20,30,30,30,40,40: U = 5.5, tie-corrected variance 45.63
+    slower, p_value = mann_whitney({10: 3, 20: 2, 30: 1}, {20: 2, 30: 3, 40: 2})
+    assert slower == pytest.approx(5.5 / 42)
+    assert p_value == pytest.approx(0.021763, abs=1e-6)
+
+
+def test_degenerate_inputs():
+    assert mann_whitney({5: 4}, {5: 3}) == (0.5, 1.0)
+    assert mann_whitney({}, {5: 1}) == (None, None)
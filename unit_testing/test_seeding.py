@@ -0,0 +1,96 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from support.environment import Environment
+from support.seeding import Seeder
+from support.sessions import SessionCache
+
+CREDENTIALS = {"buyer": ["buyer_username", "buyer_password"], "seller": ["seller_username", "seller_password"]}
+
+
+def seeder_for(base_url):
+    env = Environment("test", base_url, credentials=CREDENTIALS, timeouts={"element": 5})
+    return Seeder(env, SessionCache(env))
+
+
+def test_seeds_with_form_posts_and_cleans_up(shop):
+    seed = seeder_for(shop.base_url)
+    sent = []
+    for role in ("buyer", "seller"):
+        seed.user(role).hooks["response"].append(lambda r, *a, **k: sent.append(r.request))
+
+    product_id = seed.product(name="Seeded Lamp", price="12.50")
+    seed.cart("buyer", product_id, quantity=2)
+    assert seed.cart_product_ids("buyer") == [product_id]
+    assert seed.order("buyer", product_id) > 0
+
+    posts = [r for r in sent if r.method == "POST"]
+    assert posts and all(r.headers["Content-Type"] == "application/x-www-form-urlencoded" for r in posts)
+
+    assert seed.cleanup() == []
+    assert product_id not in shop.state.products
+    assert seeder_for(shop.base_url).cart_product_ids("buyer") == []
+
+
+def test_missing_id_fails_loudly(shop):
+    seed = seeder_for(shop.base_url)
+    # A host that answers the form post with a redirect only
+    response = requests.get(shop.base_url + "/en/orders")
+    with pytest.raises(RuntimeError, match="order_id"):
+        seed._created("orders", response, "order_id")
+
+
+# Serves one canned cart page, as a host without the JSON cart would
+class CartPage(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        body = self.server.page.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def html_host():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CartPage)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    seed = seeder_for(f"http://127.0.0.1:{server.server_port}")
+    # Skip the HTTP login; the stub has no sessions
+    seed.session_cache.adopt("buyer", [{"name": "session", "value": "stub"}], landing_url=None)
+    yield server, seed
+    server.shutdown()
+    server.server_close()
+
+
+def html_cart(shop, product_ids):
+    client = requests.Session()
+    for product_id in product_ids:
+        client.post(shop.base_url + "/en/cart/add", data={"product_id": product_id})
+    return client.get(shop.base_url + "/en/cart").text
+
+
+def test_html_fallback_reads_the_cart_page(shop, html_host):
+    server, seed = html_host
+    server.page = html_cart(shop, [3, 7])
+    assert seed.cart_product_ids("buyer") == [3, 7]
+    server.page = html_cart(shop, [])
+    assert seed.cart_product_ids("buyer") == []
+
+
+def test_html_fallback_refuses_markup_it_cannot_read(shop, html_host):
+    server, seed = html_host
+    # Rows without remove forms: an empty list would wrongly mean "empty cart"
+    server.page = html_cart(shop, [3, 7]).replace("/cart/remove", "/cart/delete")
+    with pytest.raises(RuntimeError, match="2 cart row"):
+        seed.cart_product_ids("buyer")
+    server.page = "<html><body>Maintenance</body></html>"
+    with pytest.raises(RuntimeError):
+        seed.cart_product_ids("buyer")
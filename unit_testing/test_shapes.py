@@ -0,0 +1,40 @@
+from shapes import KneeTracker, arrival_rate_stages, load_profile, soak_stages, spike_stages, step_stages
+
+
+def stage(users, p95_ms, error_rate=0.0):
+    return {"users": users, "seconds": 30, "requests": 300, "rps": 10.0, "p95_ms": p95_ms, "error_rate": error_rate}
+
+
+def test_knee_marks_one_stage_when_user_counts_repeat():
+    # Spike: warm-up and recovery both run 2 users; only the recovery is over the threshold
+    tracker = KneeTracker(stats=None, thresholds={"p95_ms": 500, "error_rate": 0.01})
+    tracker.stages = [stage(2, 120), stage(50, 450), stage(2, 900)]
+    report = tracker.report()
+    assert (report["knee_stage"], report["knee_users"], report["knee_reason"]) == (2, 2, "p95_ms")
+
+
+def test_error_rate_knee_and_no_knee():
+    tracker = KneeTracker(stats=None, thresholds={"p95_ms": 500, "error_rate": 0.01})
+    tracker.stages = [stage(10, 100), stage(20, 100, error_rate=0.05)]
+    assert tracker.knee() == (1, "error_rate")
+    tracker.stages = [stage(10, 100)]
+    assert tracker.report()["knee_stage"] is None
+
+
+def test_every_profile_loads_as_stages():
+    for name in ("step", "spike", "soak", "arrival"):
+        stages, knee = load_profile(name)
+        assert stages and all(seconds > 0 and users >= 1 for seconds, users, _ in stages)
+        assert knee == {"p95_ms": 1000, "error_rate": 0.01}
+
+
+def test_stage_lists():
+    assert step_stages({"start_users": 5, "step_users": 5, "step_seconds": 30, "steps": 3}) == [
+        (30, 5, 5), (30, 10, 5), (30, 15, 5)
+    ]
+    spike = {"base_users": 2, "spike_users": 50, "warmup_seconds": 10, "spike_seconds": 5, "recovery_seconds": 20}
+    assert [users for _, users, _ in spike_stages(spike)] == [2, 50, 2]
+    assert soak_stages({"users": 10, "ramp_seconds": 20, "hold_seconds": 600}) == [(20, 10, 0.5), (600, 10, 1)]
+    # 2.5 tasks/s per user: 10 tasks/s needs 4 users, 11 needs 5
+    stages = arrival_rate_stages({"per_user_rate": 2.5, "stages": [{"rate": 10, "seconds": 60}, {"rate": 11, "seconds": 60}]})
+    assert [users for _, users, _ in stages] == [4, 5]
@@ -0,0 +1,21 @@
+import json
+import multiprocessing
+
+from support.shared_json import update_json
+
+
+def add_keys(path, worker):
+    for i in range(25):
+        update_json(path, lambda data: {**data, f"{worker}-{i}": i}, {})
+
+
+def test_parallel_writers_keep_every_entry(tmp_path):
+    path = str(tmp_path / "index.json")
+    workers = [multiprocessing.Process(target=add_keys, args=(path, w)) for w in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    with open(path) as f:
+        assert len(json.load(f)) == 100
+    assert not [p for p in tmp_path.iterdir() if p.suffix == ".tmp"]
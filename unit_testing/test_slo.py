@@ -0,0 +1,55 @@
+import gevent
+
+from slo import Sample, SloMonitor, check
+
+
+def test_minus_keeps_only_the_window():
+    earlier = Sample(5, 1, {100: 2, 200: 3}, 10.0)
+    later = Sample(15, 2, {100: 7, 200: 3, 900: 2}, 20.0)
+    window = later.minus(earlier)
+    assert (window.requests, window.failures, window.seconds) == (10, 1, 10.0)
+    # Buckets that did not grow in the window are dropped
+    assert window.response_times == {100: 5, 900: 2}
+    assert window.actual("p50_ms") == 100
+    assert window.actual("p95_ms") == 900
+    assert window.actual("max_error_rate") == 0.1
+    assert window.actual("min_rps") == 1.0
+
+
+def test_check_against_limits():
+    sample = Sample(10, 1, {100: 9}, 5.0)
+    results = {r["metric"]: r["passed"] for r in check({"p95_ms": 150, "max_error_rate": 0.05, "min_rps": 1}, sample)}
+    assert results == {"p95_ms": True, "max_error_rate": False, "min_rps": True}
+    assert not check({"p95_ms": 150}, Sample(0, 0, {}, 5.0))[0]["passed"]
+
+
+class Stats:
+    entries = {}
+
+
+class Env:
+    stats = Stats()
+
+
+def test_restart_replaces_the_window_watcher():
+    monitor = SloMonitor(Env(), {("/en/cart", "GET"): {"p95_ms": 100}}, window=0.05)
+    monitor.start()
+    first = monitor.watcher
+    monitor.start()
+    gevent.sleep(0)
+    assert first.dead and not monitor.watcher.dead
+
+    gevent.sleep(0.18)
+    # One watcher: one window per 0.05s, not two
+    assert 2 <= len(monitor.windows) <= 4
+    monitor.stop()
+    assert monitor.watcher is None
+    count = len(monitor.windows)
+    gevent.sleep(0.1)
+    assert len(monitor.windows) == count
+
+
+def test_no_watcher_without_a_window():
+    monitor = SloMonitor(Env(), {}, window=0)
+    monitor.start()
+    assert monitor.watcher is None
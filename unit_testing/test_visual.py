@@ -0,0 +1,49 @@
+import io
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+from support.visual import VisualRegression  # noqa: E402
+
+KEY = "headless/test_cart::/en/cart@1366x900"
+
+
+def page_png(price="19.99", shift=0, compress_level=6):
+    image = Image.new("RGB", (1366, 900), "white")
+    draw = ImageDraw.Draw(image)
+    for row in range(30):
+        draw.text((20 + shift, 20 + row * 28), f"Product {row} Price: {price if row == 5 else '5.00'}", fill="black")
+    out = io.BytesIO()
+    image.save(out, "PNG", compress_level=compress_level)
+    return out.getvalue()
+
+
+@pytest.fixture
+def visual(tmp_path):
+    baseline = VisualRegression(str(tmp_path / "baselines"), str(tmp_path / "output"))
+    assert baseline.compare(KEY, page_png(), "test_cart").status == "new"
+    baseline.save()
+    return VisualRegression(str(tmp_path / "baselines"), str(tmp_path / "output"))
+
+
+def test_identical_bytes_skip_the_diff(visual):
+    assert visual.compare(KEY, page_png(), "test_cart").status == "unchanged"
+
+
+def test_reencoded_screenshot_passes(visual):
+    assert visual.compare(KEY, page_png(compress_level=1), "test_cart").status == "passed"
+
+
+def test_one_pixel_shift_passes(visual):
+    assert visual.compare(KEY, page_png(shift=1), "test_cart").status == "passed"
+
+
+@pytest.mark.parametrize("price", ["18.99", "99999"])
+def test_changed_digit_fails(visual, price):
+    result = visual.compare(KEY, page_png(price), "test_cart")
+    assert result.status == "changed"
+    assert result.pixels > 0
+    assert visual.failures("test_cart") == [result]